@@ -0,0 +1,227 @@
+"""Offline backtest of the prediction engine against recorded detections
+
+Replays a detection log through PredictionEngine on a simulated clock (no
+sleeping, seeded RNG) and reports accuracy, spatial accuracy and
+per-detection processing latency per prediction timeline. By default one
+engine shadow-evaluates every timeline in a single pass; --separate runs an
+independent engine per timeline instead.
+
+    python backtest.py published_data.jsonl --timelines 5,10,30,60,120
+    python backtest.py --mongo mongodb://localhost:27017 --db radar_gateway
+
+Input records may be published_data documents (as exported with
+mongoexport; the detection is the JSON in `data`), plain detection dicts
+with a `timestamp`, as JSON lines, a JSON array, or either gzip compressed.
+"""
+import argparse
+import gzip
+import json
+import logging
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Tuple, Iterable, Optional
+import numpy as np
+import yaml
+from prediction_engine import PredictionEngine
+from radar_models import Detection
+
+logging.disable(logging.WARNING)
+
+DEFAULT_TIMELINES = (5, 10, 30, 60, 120)
+
+class SimulatedClock:
+    """Settable stand-in for datetime.utcnow"""
+
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+def parse_time(value: Any) -> Optional[datetime]:
+    """ISO string / mongoexport {'$date': ...} -> naive UTC datetime"""
+    if isinstance(value, dict):
+        value = value.get('$date')
+    if not isinstance(value, str):
+        return None
+    try:
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+def to_detection(record: Dict[str, Any]) -> Optional[Tuple[datetime, Detection]]:
+    """One log record -> (time, Detection); None for records that hold no detection"""
+    data = record
+    if isinstance(record.get('data'), str):
+        try:
+            data = json.loads(record['data'])
+        except ValueError:
+            data = record.get('formatted_data') or {}
+    elif isinstance(record.get('formatted_data'), dict):
+        data = record['formatted_data']
+    if not isinstance(data, dict) or 'detections' not in data:
+        return None
+
+    moment = parse_time(data.get('timestamp')) or parse_time(record.get('timestamp'))
+    if moment is None:
+        return None
+    detection = Detection.from_fields(data)
+    detection.timestamp = moment.isoformat()
+    detection.radar_id = data.get('radarId', '')
+    detection.source = data.get('source', 'replay')
+    detection.sensor = data.get('sensor')
+    return moment, detection
+
+def read_records(path: str) -> Iterable[Dict[str, Any]]:
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        first = f.read(1)
+        f.seek(0)
+        if first == '[':
+            yield from json.load(f)
+            return
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+def read_mongo(url: str, db_name: str, limit: int) -> Iterable[Dict[str, Any]]:
+    from pymongo import MongoClient
+    client = MongoClient(url)
+    try:
+        cursor = client[db_name].published_data.find({}, {'_id': 0}).sort('timestamp', 1)
+        yield from (cursor.limit(limit) if limit else cursor)
+    finally:
+        client.close()
+
+def load_detections(records: Iterable[Dict[str, Any]]) -> List[Tuple[datetime, Detection]]:
+    detections = [item for item in map(to_detection, records) if item]
+    detections.sort(key=lambda item: item[0])
+    return detections
+
+def run_engine(engine: PredictionEngine, clock: SimulatedClock, detections: List[Tuple[datetime, Detection]]) -> Tuple[np.ndarray, float]:
+    """Feed the whole log; predictions are validated at the moment they fall due
+
+    Returns the per-detection processing latencies and the total replay time.
+    """
+    latencies = np.empty(len(detections))
+    started = time.perf_counter()
+    for i, (moment, detection) in enumerate(detections):
+        # What the live expiry timer would have validated before this frame arrived
+        # (against the previous frame only while it is fresh and newer than the prediction)
+        due = engine.next_expiry()
+        while due is not None and due <= moment:
+            clock.now = max(clock.now, due)
+            engine.expire_predictions()
+            due = engine.next_expiry()
+        clock.now = moment
+
+        begin = time.perf_counter()
+        engine.add_detection(detection)
+        latencies[i] = time.perf_counter() - begin
+    return latencies, time.perf_counter() - started
+
+def latency_stats(latencies: np.ndarray, elapsed: float) -> Dict[str, Any]:
+    return {
+        'latency_us_mean': round(float(latencies.mean()) * 1e6, 1),
+        'latency_us_p95': round(float(np.percentile(latencies, 95)) * 1e6, 1),
+        'replay_seconds': round(elapsed, 2)
+    }
+
+def replay_shadow(detections: List[Tuple[datetime, Detection]], timelines: List[int], config: Dict[str, Any], seed: int) -> List[Dict[str, Any]]:
+    """One engine, every timeline as a shadow horizon"""
+    clock = SimulatedClock(detections[0][0])
+    engine = PredictionEngine(clock=clock, rng=random.Random(seed))
+    engine.configure({**config, 'shadow_horizons': timelines, 'shadow_window': len(detections) * 4})
+    latencies, elapsed = run_engine(engine, clock, detections)
+    timing = latency_stats(latencies, elapsed)
+    return [
+        {
+            'timeline_seconds': h['horizon_seconds'],
+            'predictions': h['validated_total'],
+            'correct': round(h['accuracy'] * h['samples'] / 100),
+            'accuracy': h['accuracy'],
+            'spatial_accuracy': h['spatial_accuracy'],
+            'pending': h['active_predictions'],
+            **timing
+        }
+        for h in engine.get_horizon_stats()['horizons']
+    ]
+
+def replay(detections: List[Tuple[datetime, Detection]], timeline: int, config: Dict[str, Any], seed: int) -> Dict[str, Any]:
+    """Run an independent engine at one timeline"""
+    clock = SimulatedClock(detections[0][0])
+    engine = PredictionEngine(clock=clock, rng=random.Random(seed))
+    engine.configure({**config, 'shadow_horizons': []})
+    engine.set_prediction_timeline(timeline)
+    results = []
+    engine.set_result_callback(results.append)
+    latencies, elapsed = run_engine(engine, clock, detections)
+
+    correct = [r for r in results if r['result']]
+    spatial = [r['spatial_accuracy'] for r in correct if r['type'] == 'drone_from_direction']
+    by_type = {}
+    for r in results:
+        counts = by_type.setdefault(r['type'], [0, 0])
+        counts[0] += r['result']
+        counts[1] += 1
+    return {
+        'timeline_seconds': engine.prediction_timeline,
+        'predictions': len(results),
+        'correct': len(correct),
+        'accuracy': round(len(correct) / len(results) * 100, 1) if results else 0.0,
+        'spatial_accuracy': round(float(np.mean(spatial)), 1) if spatial else 0.0,
+        'accuracy_by_type': {t: round(c / n * 100, 1) for t, (c, n) in by_type.items()},
+        'pending': len(engine.predictions),  # Still open when the log ended
+        **latency_stats(latencies, elapsed)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('log', nargs='?', help='JSON / JSON lines detection log (.gz allowed)')
+    parser.add_argument('--mongo', help='read published_data from this MongoDB URL instead')
+    parser.add_argument('--db', default='radar_gateway')
+    parser.add_argument('--limit', type=int, default=0, help='max records read from MongoDB')
+    parser.add_argument('--timelines', default=','.join(map(str, DEFAULT_TIMELINES)))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--separate', action='store_true', help='one engine per timeline instead of shadow horizons')
+    parser.add_argument('--config', help='gateway config.yaml whose prediction section is applied')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    if not args.log and not args.mongo:
+        parser.error('a log file or --mongo is required')
+    records = read_mongo(args.mongo, args.db, args.limit) if args.mongo else read_records(args.log)
+    detections = load_detections(records)
+    if not detections:
+        sys.exit('No detections with timestamps found')
+
+    config = {}
+    if args.config:
+        with open(args.config) as f:
+            config = (yaml.safe_load(f) or {}).get('prediction', {})
+
+    span = (detections[-1][0] - detections[0][0]).total_seconds()
+    timelines = [int(t) for t in args.timelines.split(',')]
+    if args.separate:
+        results = [replay(detections, t, config, args.seed) for t in timelines]
+    else:
+        results = replay_shadow(detections, timelines, config, args.seed)
+
+    if args.json:
+        print(json.dumps({'detections': len(detections), 'span_seconds': span, 'results': results}, indent=2))
+        return
+
+    print(f"{len(detections)} detections over {span / 3600:.1f} h")
+    print(f"{'timeline':>8} {'preds':>7} {'accuracy':>9} {'spatial':>8} {'lat mean':>9} {'lat p95':>9} {'replay':>7}")
+    for r in results:
+        print(f"{r['timeline_seconds']:>7}s {r['predictions']:>7} {r['accuracy']:>8.1f}% {r['spatial_accuracy']:>7.1f}% "
+              f"{r['latency_us_mean']:>7.0f}us {r['latency_us_p95']:>7.0f}us {r['replay_seconds']:>6.1f}s")
+
+if __name__ == "__main__":
+    main()
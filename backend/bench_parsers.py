@@ -0,0 +1,105 @@
+"""Microbenchmark for the radar line parsers
+
+Compares the single-pass custom-format scanner with the previous
+five-regex implementation, the NMEA fast path with pynmea2, and times the
+full process_raw_data path.
+
+    python bench_parsers.py [lines]
+"""
+import re
+import sys
+import time
+import random
+import logging
+from typing import Dict, Any, Optional, Callable, List
+from data_processor import RadarDataProcessor
+from nmea_parser import nmea_checksum
+from radar_models import Detection
+
+logging.disable(logging.WARNING)
+
+def legacy_parse_custom(data: str) -> Optional[Dict[str, Any]]:
+    """The five re.search parser this replaced, kept as the baseline"""
+    result = {}
+    det_match = re.search(r'DET:?(\d+)', data, re.IGNORECASE)
+    if det_match:
+        result['detections'] = int(det_match.group(1))
+    rng_match = re.search(r'RNG:?([\d.]+)(km|m)?', data, re.IGNORECASE)
+    if rng_match:
+        result['range'] = f"{rng_match.group(1)}{rng_match.group(2) or 'km'}"
+    brg_match = re.search(r'BRG:?(\d+)', data, re.IGNORECASE)
+    if brg_match:
+        result['bearing'] = f"{brg_match.group(1)}°"
+    alt_match = re.search(r'ALT:?(\d+)(m|ft)?', data, re.IGNORECASE)
+    if alt_match:
+        result['altitude'] = f"{alt_match.group(1)}{alt_match.group(2) or 'm'}"
+    spd_match = re.search(r'SPD:?(\d+)(kts|kmh)?', data, re.IGNORECASE)
+    if spd_match:
+        result['speed'] = f"{spd_match.group(1)}{spd_match.group(2) or 'kts'}"
+    if result:
+        result.setdefault('detections', 1)
+        result.setdefault('confidence', 'MEDIUM')
+        result.setdefault('signalStrength', 70)
+        return result
+    return None
+
+def make_lines(count: int) -> List[str]:
+    rng = random.Random(42)
+    return [
+        f"DET:{rng.randint(0, 5)} RNG:{rng.uniform(0.5, 20):.1f}km BRG:{rng.randint(0, 359):03d} "
+        f"ALT:{rng.randint(20, 800)}m SPD:{rng.randint(10, 120)}kts"
+        for _ in range(count)
+    ]
+
+def make_nmea_lines(count: int) -> List[str]:
+    rng = random.Random(7)
+    lines = []
+    for _ in range(count):
+        body = (f"PRDET,{rng.randint(1, 5)},{rng.uniform(0.5, 20):.2f},{rng.randint(0, 359):03d},"
+                f"{rng.randint(20, 800)},{rng.randint(10, 120)},T-{rng.randint(1, 99)}")
+        lines.append(f"${body}*{nmea_checksum(body):02X}")
+    return lines
+
+def bench(name: str, func: Callable[[str], Any], lines: List[str]) -> float:
+    for line in lines[:1000]:
+        func(line)  # Warm up
+    started = time.perf_counter()
+    for line in lines:
+        func(line)
+    elapsed = time.perf_counter() - started
+    rate = len(lines) / elapsed
+    print(f"{name:<32} {rate:>12,.0f} lines/s")
+    return rate
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    lines = make_lines(count)
+    processor = RadarDataProcessor({'format': 'custom'})
+    auto_processor = RadarDataProcessor({})
+
+    mismatches = sum(
+        1 for line in lines[:1000]
+        if Detection.from_fields(legacy_parse_custom(line)) != Detection.from_fields(processor._parse_custom(line))
+    )
+    print(f"{count} lines, {mismatches} output mismatches vs legacy parser in the first 1000")
+
+    legacy = bench('legacy 5x re.search', legacy_parse_custom, lines)
+    scanner = bench('single-pass scanner', processor._parse_custom, lines)
+    print(f"{'speedup':<32} {scanner / legacy:>12.2f}x")
+
+    gga = ['$GPGGA,123519,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*47'] * count
+    legacy = bench('pynmea2 GGA', processor._parse_nmea_fallback, gga)
+    fast = bench('fast path GGA', processor._parse_nmea, gga)
+    print(f"{'speedup':<32} {fast / legacy:>12.2f}x")
+    bench('fast path PRDET (proprietary)', processor._parse_nmea, make_nmea_lines(count))
+
+    frames = [{'raw_data': line, 'source': 'bench'} for line in lines]
+    bench('process_raw_data (format=custom)', lambda f: processor.process_raw_data(dict(f)), frames)
+    bench('process_raw_data (format=auto)', lambda f: auto_processor.process_raw_data(dict(f)), frames)
+
+    bursts = [frames[i:i + 1000] for i in range(0, len(frames), 1000)]
+    rate = bench('process_batch (1000 frames/call)', processor.process_batch, bursts)
+    print(f"{'':<32} {rate * 1000:>12,.0f} frames/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Reading recorded radar captures: compressed streams, per-line timestamps and a sidecar seek index"""
+import bisect
+import gzip
+import io
+import json
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple, BinaryIO
+
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = '.idx'
+
+# "2026-01-01T12:00:00.250Z <frame>" (tab or space separated)
+TIMESTAMP_PREFIX = re.compile(r'(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)\s+(.*)')
+
+def open_capture(path: str) -> BinaryIO:
+    """Binary stream over a plain, .gz or .zst capture (decompressed on the fly)"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    if path.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("Reading .zst captures requires the zstandard package")
+        # The raw stream reader has no readline()/iteration; buffer it like gzip does
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True), 1024 * 1024)
+    return open(path, 'rb', buffering=1024 * 1024)
+
+def seek_capture(f: BinaryIO, offset: int):
+    """Move a freshly opened capture stream to a decompressed byte offset
+
+    Plain and gzip streams seek themselves; zstd streams can only move
+    forward, by decompressing and discarding.
+    """
+    if f.seekable():
+        f.seek(offset)
+        return
+    remaining = offset
+    while remaining > 0:
+        chunk = f.read(min(remaining, 1024 * 1024))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+
+def parse_time(value: Any) -> Optional[float]:
+    """ISO-8601 string -> epoch seconds (naive = UTC); None if missing or unparseable"""
+    if not isinstance(value, str):
+        return None
+    try:
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+def parse_line(line: str) -> Tuple[Optional[float], Dict[str, Any]]:
+    """One capture line -> (recorded epoch seconds or None, frame dict)
+
+    Understood layouts: a recorded frame (JSON with `raw_data`), a JSON
+    detection with a `timestamp`, a raw frame prefixed with an ISO timestamp,
+    or a bare raw frame (no recorded time).
+    """
+    if line.startswith('{'):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        if isinstance(record, dict):
+            if 'raw_data' in record:
+                return parse_time(record.get('timestamp')), record
+            return parse_time(record.get('timestamp')), {'raw_data': line, 'timestamp': record.get('timestamp')}
+    match = TIMESTAMP_PREFIX.match(line)
+    if match:
+        recorded = parse_time(match.group(1))
+        if recorded is not None:
+            return recorded, {'raw_data': match.group(2), 'timestamp': match.group(1)}
+    return None, {'raw_data': line}
+
+def is_frame_line(line: str) -> bool:
+    return bool(line) and not line.startswith('#')
+
+class CaptureIndex:
+    """Sidecar index of (seconds from capture start, byte offset) checkpoints
+
+    Offsets are positions in the decompressed stream. The index stores the
+    size and mtime of the capture it was built from and is rebuilt when
+    they no longer match.
+    """
+
+    def __init__(self, start_time: Optional[float], entries: List[Tuple[float, int]], source: Dict[str, Any]):
+        self.start_time = start_time
+        self.times = [t for t, _ in entries]
+        self.offsets = [o for _, o in entries]
+        self.source = source
+
+    @staticmethod
+    def _source_info(path: str) -> Dict[str, Any]:
+        info = os.stat(path)
+        return {'size': info.st_size, 'mtime': info.st_mtime}
+
+    @classmethod
+    def build(cls, path: str, interval: float = 10.0) -> 'CaptureIndex':
+        """One streaming pass over the capture, a checkpoint every `interval` seconds of recording"""
+        start_time = None
+        entries: List[Tuple[float, int]] = []
+        next_checkpoint = 0.0
+        offset = 0
+        with open_capture(path) as f:
+            for raw in f:
+                line_offset = offset
+                offset += len(raw)
+                line = raw.decode('utf-8', errors='ignore').strip()
+                if not is_frame_line(line):
+                    continue
+                recorded, _ = parse_line(line)
+                if recorded is None:
+                    continue
+                if start_time is None:
+                    start_time = recorded
+                elapsed = recorded - start_time
+                if elapsed >= next_checkpoint:
+                    entries.append((elapsed, line_offset))
+                    next_checkpoint = elapsed + interval
+        index = cls(start_time, entries, cls._source_info(path))
+        logger.info(f"Indexed {path}: {len(entries)} checkpoints over {entries[-1][0] if entries else 0:.0f}s")
+        return index
+
+    @classmethod
+    def load(cls, path: str) -> Optional['CaptureIndex']:
+        """The sidecar index of a capture, or None if it is missing or stale"""
+        try:
+            with open(path + INDEX_SUFFIX) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('source') != cls._source_info(path):
+            return None
+        return cls(data.get('start_time'), [tuple(e) for e in data.get('entries', [])], data['source'])
+
+    @classmethod
+    def load_or_build(cls, path: str, interval: float = 10.0) -> 'CaptureIndex':
+        index = cls.load(path)
+        if index is None:
+            index = cls.build(path, interval)
+            try:
+                index.save(path)
+            except OSError as e:
+                logger.warning(f"Could not write capture index for {path}: {e}")
+        return index
+
+    def save(self, path: str):
+        with open(path + INDEX_SUFFIX, 'w') as f:
+            json.dump({
+                'source': self.source,
+                'start_time': self.start_time,
+                'entries': list(zip(self.times, self.offsets))
+            }, f)
+
+    def offset_for(self, seconds: float) -> int:
+        """Byte offset of the last checkpoint at or before `seconds` into the capture"""
+        position = bisect.bisect_right(self.times, seconds) - 1
+        return self.offsets[position] if position >= 0 else 0
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Optional, Callable, Awaitable
+
+logger = logging.getLogger(__name__)
+
+class CircuitBreaker:
+    """Fail-fast guard around an unreliable remote service
+    
+    closed     - requests flow normally; consecutive failures are counted
+    open       - requests are rejected immediately; after reset_timeout a
+                 background health probe checks whether the service is back
+    half_open  - the probe succeeded; one trial request is let through and
+                 closes the circuit on success or re-opens it on failure. A
+                 trial that never reports back (cancelled, hung) frees its
+                 slot after trial_timeout so another one can go out
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 15.0,
+                 max_reset_timeout: float = 300.0, trial_timeout: float = 30.0,
+                 probe: Optional[Callable[[], Awaitable[bool]]] = None):
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.trial_timeout = trial_timeout
+        self.probe = probe
+        
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.trial_started_at: Optional[float] = None
+        self.probe_task: Optional[asyncio.Task] = None
+        self.stats = {
+            'times_opened': 0,
+            'rejected': 0,
+            'probes': 0,
+            'last_state_change': None
+        }
+        
+    @classmethod
+    def from_config(cls, config: Dict[str, Any],
+                    probe: Optional[Callable[[], Awaitable[bool]]] = None) -> 'CircuitBreaker':
+        return cls(
+            failure_threshold=config.get('failure_threshold', 3),
+            reset_timeout=config.get('reset_timeout', 15.0),
+            max_reset_timeout=config.get('max_reset_timeout', 300.0),
+            trial_timeout=config.get('trial_timeout', 30.0),
+            probe=probe
+        )
+        
+    @property
+    def is_open(self) -> bool:
+        return self.state == self.OPEN
+        
+    def _set_state(self, state: str):
+        if state != self.state:
+            logger.warning(f"Circuit breaker {self.state} -> {state}")
+            self.state = state
+            self.stats['last_state_change'] = time.time()
+            
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now (never waits)"""
+        if self.state == self.CLOSED:
+            return True
+            
+        if self.state == self.OPEN:
+            self.poll()
+            self.stats['rejected'] += 1
+            return False
+            
+        # Half-open: a single trial request at a time
+        if self.trial_in_flight and time.monotonic() - self.trial_started_at < self.trial_timeout:
+            self.stats['rejected'] += 1
+            return False
+        self.trial_in_flight = True
+        self.trial_started_at = time.monotonic()
+        return True
+        
+    def release_trial(self):
+        """Free the trial slot without a verdict (the trial request was cancelled)"""
+        self.trial_in_flight = False
+        
+    def record_success(self):
+        self.consecutive_failures = 0
+        self.trial_in_flight = False
+        if self.state != self.CLOSED:
+            self.reset_timeout = self.base_reset_timeout
+            self._set_state(self.CLOSED)
+            
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self.trial_in_flight = False
+        
+        if self.state == self.HALF_OPEN:
+            # Trial failed: open again and wait longer before the next probe
+            self.reset_timeout = min(self.max_reset_timeout, self.reset_timeout * 2)
+            self._open()
+        elif self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold:
+            self._open()
+            
+    def _open(self):
+        self.opened_at = time.monotonic()
+        self.stats['times_opened'] += 1
+        self._set_state(self.OPEN)
+        
+    def poll(self):
+        """Start a background health probe once the reset timeout has passed"""
+        if self.opened_at is None or time.monotonic() - self.opened_at < self.reset_timeout:
+            return
+        if self.probe_task and not self.probe_task.done():
+            return
+            
+        if self.probe is None:
+            self._set_state(self.HALF_OPEN)
+            return
+            
+        try:
+            self.probe_task = asyncio.get_running_loop().create_task(self._run_probe())
+        except RuntimeError:
+            pass  # No running loop; try again on the next request
+            
+    async def _run_probe(self):
+        self.stats['probes'] += 1
+        try:
+            healthy = await self.probe()
+        except Exception as e:
+            logger.debug(f"Health probe failed: {e}")
+            healthy = False
+            
+        if self.state != self.OPEN:
+            return
+        if healthy:
+            self._set_state(self.HALF_OPEN)
+        else:
+            self.reset_timeout = min(self.max_reset_timeout, self.reset_timeout * 2)
+            self.opened_at = time.monotonic()
+            
+    def get_status(self) -> Dict[str, Any]:
+        retry_in = None
+        if self.state == self.OPEN and self.opened_at is not None:
+            retry_in = max(0.0, round(self.reset_timeout - (time.monotonic() - self.opened_at), 1))
+            
+        return {
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'reset_timeout': self.reset_timeout,
+            'next_probe_in_seconds': retry_in,
+            **self.stats
+        }
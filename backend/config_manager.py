@@ -103,7 +103,7 @@ class ConfigManager:
                 'gateway_token': ''
             },
             'radar': {
-                'type': 'mock',  # mock, serial, tcp, usb, file
+                'type': 'mock',  # mock, serial, tcp, usb, file, tail
                 'connection': {
                     'port': '/dev/ttyUSB0',
                     'baudrate': 9600,
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional
+from radar_connector import RadarConnector, create_connector
+from data_processor import DATA_FORMATS
+
+logger = logging.getLogger(__name__)
+
+class ConnectorGroup(RadarConnector):
+    """Runs several radar connectors concurrently and merges their frames into one tagged stream
+    
+    Each source keeps its own connector, monitoring loop, reconnect state and
+    stats; every frame is tagged with the source name before it reaches the
+    shared processing pipeline.
+    """
+    
+    def __init__(self, sources: List[Dict[str, Any]]):
+        super().__init__({'name': 'group'})
+        self.connectors: Dict[str, RadarConnector] = {}
+        self.source_configs: Dict[str, Dict[str, Any]] = {}
+        self.tasks: Dict[str, asyncio.Task] = {}
+        
+        for index, source in enumerate(sources):
+            name = source.get('name') or f"radar-{index + 1}"
+            if name in self.connectors:
+                raise ValueError(f"Duplicate radar source name: {name}")
+            data_format = source.get('format')
+            if data_format and data_format not in DATA_FORMATS:
+                raise ValueError(f"Radar source {name}: unknown format '{data_format}' (expected one of {', '.join(DATA_FORMATS)})")
+                
+            connector = create_connector(source.get('type', 'mock'), source.get('connection', {}))
+            connector.name = name
+            connector.set_data_callback(self._make_source_callback(name, source))
+            
+            self.connectors[name] = connector
+            self.source_configs[name] = source
+            
+        if not self.connectors:
+            raise ValueError("Radar connector group needs at least one source")
+            
+    @property
+    def is_connected(self) -> bool:
+        return any(c.is_connected for c in self.connectors.values())
+        
+    @is_connected.setter
+    def is_connected(self, value: bool):
+        pass  # Derived from the member connectors
+        
+    def _make_source_callback(self, name: str, source: Dict[str, Any]):
+        station_id = source.get('station_id')
+        data_format = source.get('format')
+        
+        async def on_source_data(data: Dict[str, Any]):
+            data['sensor'] = name
+            if station_id:
+                data['station_id'] = station_id
+            if data_format:
+                data['format'] = data_format
+            if self.on_data_callback:
+                await self.on_data_callback(data)
+                
+        return on_source_data
+        
+    async def connect(self) -> bool:
+        results = await asyncio.gather(
+            *(c.connect() for c in self.connectors.values()), return_exceptions=True
+        )
+        connected = sum(1 for r in results if r is True)
+        logger.info(f"Radar group connected {connected}/{len(self.connectors)} sources")
+        return connected > 0
+        
+    async def disconnect(self):
+        await asyncio.gather(
+            *(c.disconnect() for c in self.connectors.values()), return_exceptions=True
+        )
+        
+    async def read_data(self) -> Optional[Dict[str, Any]]:
+        return None  # Frames are pushed by the member connectors
+        
+    async def start_monitoring(self):
+        """Start every source and restart any monitoring loop that dies"""
+        self.is_monitoring = True
+        logger.info(f"Started monitoring {len(self.connectors)} radar sources: {', '.join(self.connectors)}")
+        
+        for name, connector in self.connectors.items():
+            self.tasks[name] = asyncio.create_task(connector.start_monitoring())
+            
+        try:
+            while self.is_monitoring:
+                done, _ = await asyncio.wait(
+                    list(self.tasks.values()), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not self.is_monitoring:
+                    break
+                    
+                for name, task in list(self.tasks.items()):
+                    if task not in done:
+                        continue
+                    error = task.exception() if not task.cancelled() else None
+                    connector = self.connectors[name]
+                    connector.stats['errors_total'] += 1
+                    connector.stats['last_error'] = str(error) if error else 'monitor exited'
+                    logger.error(f"Radar source {name} monitor exited ({error}), restarting")
+                    
+                    await asyncio.sleep(1)
+                    self.tasks[name] = asyncio.create_task(connector.start_monitoring())
+        finally:
+            self.is_monitoring = False
+            
+    async def stop_monitoring(self):
+        """Stop every source"""
+        self.is_monitoring = False
+        await asyncio.gather(
+            *(c.stop_monitoring() for c in self.connectors.values()), return_exceptions=True
+        )
+        for task in self.tasks.values():
+            task.cancel()
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+        self.tasks.clear()
+        logger.info("Stopped monitoring radar group")
+        
+    def get_status(self) -> str:
+        statuses = [c.get_status() for c in self.connectors.values()]
+        if 'monitoring' in statuses:
+            return "monitoring"
+        if 'connected' in statuses:
+            return "connected"
+        return "disconnected"
+        
+    def get_source_stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = {}
+        for name, connector in self.connectors.items():
+            stats.update(connector.get_source_stats())
+            stats[name]['type'] = self.source_configs[name].get('type', 'mock')
+        return stats
@@ -1,21 +1,24 @@
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
-import math
+from geodesy import BaseFrame, base_frame, BASE_LOCATION, SECTOR_BEARINGS
+from radar_models import Detection, Target, format_range, format_bearing, format_altitude
 
 logger = logging.getLogger(__name__)
 
 class DangerZonePredictor:
     def __init__(self, base_location: Dict[str, float]):
         self.base_location = base_location
+        self.frame = base_frame if base_location == BASE_LOCATION else BaseFrame(base_location['lat'], base_location['lon'])
         
-    def calculate_danger_zones(self, predictions: List[Dict], current_data: Dict, timeline_minutes: int = 5) -> List[Dict[str, Any]]:
+    def calculate_danger_zones(self, predictions: List[Dict], current_data: Optional[Detection], timeline_minutes: int = 5) -> List[Dict[str, Any]]:
         danger_zones = []
-        if current_data and current_data.get('targets'):
-            for target in current_data['targets']:
-                zone = self._create_zone_from_target(target, 'IMMEDIATE', 'HIGH')
-                if zone:
-                    danger_zones.append(zone)
+        if current_data and current_data.targets:
+            targets = [t for t in current_data.targets if t.range_m is not None and t.bearing_deg is not None]
+            if targets:
+                lats, lons = self.frame.destination([t.range_m for t in targets], [t.bearing_deg for t in targets])
+                for target, lat, lon in zip(targets, lats.tolist(), lons.tolist()):
+                    danger_zones.append(self._create_zone_from_target(target, lat, lon, 'IMMEDIATE', 'HIGH'))
         for pred in predictions:
             if pred.get('type') == 'drone_from_direction':
                 zone = self._create_predicted_zone(pred, timeline_minutes)
@@ -23,44 +26,32 @@ class DangerZonePredictor:
                     danger_zones.append(zone)
         return danger_zones
         
-    def _create_zone_from_target(self, target: Dict, zone_type: str, threat_level: str) -> Optional[Dict]:
-        try:
-            bearing_str = target.get('bearing', '000°')
-            range_str = target.get('range', '0km')
-            bearing = float(bearing_str.replace('°', ''))
-            range_km = float(range_str.replace('km', ''))
-            target_lat, target_lon = self._calculate_position(self.base_location['lat'], self.base_location['lon'], range_km, bearing)
-            altitude_str = target.get('altitude', '0m')
-            altitude_m = float(altitude_str.replace('m', '').replace('ft', ''))
-            danger_radius_km = max(0.5, min(3.0, altitude_m / 300))
-            return {'id': target.get('id', 'UNKNOWN'), 'type': zone_type, 'threat_level': threat_level, 'center': {'lat': target_lat, 'lon': target_lon}, 'radius_km': danger_radius_km, 'bearing_from_base': bearing, 'distance_from_base_km': range_km, 'estimated_time': 'NOW', 'details': f"{target.get('id')} at {range_str}, {bearing_str}, {target.get('altitude')}"}
-        except Exception as e:
-            return None
+    def _create_zone_from_target(self, target: Target, target_lat: float, target_lon: float, zone_type: str, threat_level: str) -> Dict:
+        bearing = target.bearing_deg
+        range_km = target.range_m / 1000
+        altitude_m = target.altitude_m or 0.0
+        danger_radius_km = max(0.5, min(3.0, altitude_m / 300))
+        return {'id': target.id, 'type': zone_type, 'threat_level': threat_level, 'center': {'lat': target_lat, 'lon': target_lon}, 'radius_km': danger_radius_km, 'bearing_from_base': bearing, 'distance_from_base_km': range_km, 'estimated_time': 'NOW', 'details': f"{target.id} at {format_range(target.range_m)}, {format_bearing(bearing)}, {format_altitude(target.altitude_m)}"}
             
     def _create_predicted_zone(self, prediction: Dict, timeline_minutes: int) -> Optional[Dict]:
         try:
-            sector = prediction.get('sector', 'N')
-            bearing = self._sector_to_bearing(sector)
-            predicted_range_km = 20.0
-            pred_lat, pred_lon = self._calculate_position(self.base_location['lat'], self.base_location['lon'], predicted_range_km, bearing)
-            danger_radius_km = 5.0
-            seconds_remaining = prediction.get('seconds_remaining', 0)
-            eta = datetime.utcnow() + timedelta(seconds=seconds_remaining)
+            predicted_range_km = prediction.get('range_km', 20.0)
+            if 'bearing_deg' in prediction:
+                bearing = prediction['bearing_deg']
+                pred_lat, pred_lon = self.frame.position(predicted_range_km * 1000, bearing)
+            else:
+                # Sector predictions sit on the sector centre; the frame keeps those in a lookup table
+                sector = prediction.get('sector', 'N')
+                bearing = self._sector_to_bearing(sector)
+                pred_lat, pred_lon = self.frame.sector_centre(sector, predicted_range_km * 1000)
+            danger_radius_km = prediction.get('radius_km', 5.0)
+            eta = prediction.get('expected_time') or datetime.utcnow() + timedelta(seconds=prediction.get('seconds_remaining', 0))
             return {'id': prediction['id'], 'type': 'PREDICTED', 'threat_level': 'MEDIUM', 'center': {'lat': pred_lat, 'lon': pred_lon}, 'radius_km': danger_radius_km, 'bearing_from_base': bearing, 'distance_from_base_km': predicted_range_km, 'estimated_time': eta.strftime('%H:%M:%S'), 'details': f"AI: {prediction['message']}", 'confidence': prediction.get('confidence', 50)}
         except:
             return None
             
-    def _calculate_position(self, base_lat: float, base_lon: float, distance_km: float, bearing: float) -> tuple:
-        R = 6371.0
-        lat1 = math.radians(base_lat)
-        lon1 = math.radians(base_lon)
-        brng = math.radians(bearing)
-        lat2 = math.asin(math.sin(lat1) * math.cos(distance_km / R) + math.cos(lat1) * math.sin(distance_km / R) * math.cos(brng))
-        lon2 = lon1 + math.atan2(math.sin(brng) * math.sin(distance_km / R) * math.cos(lat1), math.cos(distance_km / R) - math.sin(lat1) * math.sin(lat2))
-        return math.degrees(lat2), math.degrees(lon2)
-        
     def _sector_to_bearing(self, sector: str) -> float:
-        return {'N': 0, 'NE': 45, 'E': 90, 'SE': 135, 'S': 180, 'SW': 225, 'W': 270, 'NW': 315}.get(sector, 0)
+        return SECTOR_BEARINGS.get(sector, 0)
         
     def format_for_locrypt(self, danger_zones: List[Dict], sos: bool = False, group_name: str = '') -> Dict[str, Any]:
         m = []
@@ -81,4 +72,4 @@ class DangerZonePredictor:
             m.append("ℹ️ Stay alert")
         return {'message_text': '\n'.join(m), 'danger_zones': danger_zones, 'sos': sos, 'base_location': self.base_location, 'group_name': group_name, 'timestamp': datetime.utcnow().isoformat(), 'total_zones': len(danger_zones)}
 
-danger_zone_predictor = DangerZonePredictor({'lat': 46.7712, 'lon': 23.6236})
+danger_zone_predictor = DangerZonePredictor(BASE_LOCATION)
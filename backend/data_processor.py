@@ -1,12 +1,76 @@
 import logging
 import json
 import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from datetime import datetime
+import numpy as np
 import pynmea2
+from nmea_parser import NMEA_SENTENCES, NmeaChecksumError, split_sentence, sentence_id
+from radar_models import Detection, DetectionBatch, RANGE_UNITS, ALTITUDE_UNITS, SPEED_UNITS
 
 logger = logging.getLogger(__name__)
 
+DATA_FORMATS = ('auto', 'nmea', 'json', 'custom')
+
+class CustomFormatScanner:
+    """Single-pass tokenizer for KEY:VALUEunit radar lines
+
+    One precompiled pattern walks the line once; each KEY is looked up in a
+    field map (extendable per site for other vendor key sets) and its value
+    is converted to SI units as it is read (range_m, bearing_deg,
+    altitude_m, speed_ms), so it never has to be parsed again downstream.
+    """
+    
+    TOKEN = re.compile(r'([A-Za-z_]+):?\s*(-?\d+(?:\.\d+)?)([A-Za-z°/]*)')
+    
+    DEFAULT_FIELD_MAP = {
+        'DET': 'detections',
+        'RNG': 'range',
+        'BRG': 'bearing',
+        'ALT': 'altitude',
+        'SPD': 'speed'
+    }
+    
+    # field -> (result key, {unit: factor to SI}, unit assumed when none is given)
+    UNITS = {
+        'range': ('range_m', RANGE_UNITS, 'km'),
+        'altitude': ('altitude_m', ALTITUDE_UNITS, 'm'),
+        'speed': ('speed_ms', SPEED_UNITS, 'kts'),
+        'bearing': ('bearing_deg', {'°': 1.0, 'deg': 1.0}, 'deg')
+    }
+    
+    def __init__(self, field_map: Optional[Dict[str, str]] = None):
+        self.field_map = dict(self.DEFAULT_FIELD_MAP)
+        for key, field in (field_map or {}).items():
+            self.field_map[key.upper()] = field
+        # Resolve each key to its result key and unit table once, not per token
+        self.keys = {}
+        for key, field in self.field_map.items():
+            result_key, factors, default_unit = self.UNITS.get(field, (field, None, None))
+            self.keys[key] = (result_key, factors, factors[default_unit] if factors else None)
+            
+    def scan(self, data: str) -> Optional[Dict[str, Any]]:
+        result = {}
+        keys = self.keys
+        for key, value, unit in self.TOKEN.findall(data):
+            entry = keys.get(key) or keys.get(key.upper())
+            if not entry:
+                continue
+            result_key, factors, default_factor = entry
+            if result_key in result:
+                continue  # Repeated key: the first occurrence wins
+                
+            if factors:
+                factor = factors.get(unit.lower(), default_factor) if unit else default_factor
+                result[result_key] = float(value) * factor
+            elif result_key == 'detections':
+                result[result_key] = int(float(value))
+            else:
+                result[result_key] = float(value)
+                
+        return result or None
+
+
 class RadarDataProcessor:
     """Process and parse radar data from various formats"""
     
@@ -16,46 +80,197 @@ class RadarDataProcessor:
         self.station_name = config.get('station_name', 'Unknown Station')
         self.anonymize = config.get('anonymize', True)
         
-    def process_raw_data(self, raw_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Process raw radar data into standardized format"""
+        self.format = config.get('format', 'auto')
+        if self.format not in DATA_FORMATS:
+            raise ValueError(f"Unknown radar data format: {self.format}")
+        self.parsers = {
+            'nmea': self._parse_nmea,
+            'json': self._parse_json,
+            'custom': self._parse_custom
+        }
+        self.custom_scanner = CustomFormatScanner(config.get('field_map'))
+        self.radar_ids: Dict[str, str] = {}
+        self.nmea_require_checksum = config.get('nmea_require_checksum', False)
+        self.max_detections = config.get('max_detections', 100)  # Per frame; raise for swarm load tests
         
-        raw_string = raw_data.get('raw_data', '')
-        source = raw_data.get('source', 'unknown')
+        # Format remembered per source after its first successful parse
+        self.source_formats: Dict[str, str] = {}
+        self.stats = {
+            'parsed': {name: 0 for name in self.parsers},
+            'unparsed': 0,
+            'format_changes': 0,
+            'nmea_checksum_errors': 0,
+            'nmea_fallback': 0
+        }
         
-        # Try different parsers
-        parsed = None
+    @staticmethod
+    def _sniff_format(data: str) -> str:
+        """Pick a parser from the first significant character"""
+        first = data.lstrip()[:1]
+        if first in ('$', '!'):
+            return 'nmea'
+        if first == '{':
+            return 'json'
+        return 'custom'
         
-        # Try NMEA format first
-        parsed = self._parse_nmea(raw_string)
+    def _parse_frame(self, raw_string: str, source_key: str, frame_format: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Run the frame through exactly one parser (explicit, learned or sniffed format)"""
+        fmt = frame_format or self.format
+        if fmt != 'auto':
+            parsed = self.parsers[fmt](raw_string)
+            if parsed:
+                self.stats['parsed'][fmt] += 1
+            return parsed
+            
+        learned = self.source_formats.get(source_key)
+        if learned:
+            parsed = self.parsers[learned](raw_string)
+            if parsed:
+                self.stats['parsed'][learned] += 1
+                return parsed
+                
+        # Unknown source, or its output no longer matches the learned format
+        fmt = self._sniff_format(raw_string)
+        if fmt == learned:
+            return None
+        parsed = self.parsers[fmt](raw_string)
+        if parsed:
+            if learned:
+                self.stats['format_changes'] += 1
+                logger.info(f"Radar source {source_key} switched format {learned} -> {fmt}")
+            self.source_formats[source_key] = fmt
+            self.stats['parsed'][fmt] += 1
+        return parsed
+        
+    def _parse_fields(self, raw_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Parse one frame's payload into a field dict (None if unparseable)"""
+        raw_string = raw_data.get('raw_data', '')
+        parsed = self._parse_frame(raw_string, raw_data.get('sensor', raw_data.get('source', 'unknown')),
+                                   raw_data.get('format'))
         
-        # Try JSON format
         if not parsed:
-            parsed = self._parse_json(raw_string)
+            self.stats['unparsed'] += 1
+            logger.warning(f"Could not parse data: {raw_string[:100]}")
+            return None
             
-        # Try custom format
+        if 'detections' not in parsed:
+            return None
+        return parsed
+        
+    def _radar_id(self, station_id: str) -> str:
+        if not self.anonymize:
+            return station_id
+        radar_id = self.radar_ids.get(station_id)
+        if radar_id is None:
+            radar_id = self.radar_ids[station_id] = f"RADAR-{hash(station_id) % 10000:04d}"
+        return radar_id
+        
+    def _add_metadata(self, detection: Detection, raw_data: Dict[str, Any], now: Optional[str] = None) -> Detection:
+        """Add metadata (multi-radar frames carry their own station id and sensor name)"""
+        detection.radar_id = self._radar_id(raw_data.get('station_id', self.station_id))
+        detection.station_name = self.station_name
+        detection.timestamp = raw_data.get('timestamp') or now or datetime.utcnow().isoformat()
+        detection.source = raw_data.get('source', 'unknown')
+        detection.sensor = raw_data.get('sensor')
+        return detection
+        
+    def process_raw_data(self, raw_data: Dict[str, Any]) -> Optional[Detection]:
+        """Process raw radar data into a typed Detection (SI units)"""
+        
+        parsed = self._parse_fields(raw_data)
         if not parsed:
-            parsed = self._parse_custom(raw_string)
+            return None
             
-        if not parsed:
-            logger.warning(f"Could not parse data: {raw_string[:100]}")
+        # Convert units once, then validate numerically
+        try:
+            detection = Detection.from_fields(parsed)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Invalid radar data: {e}")
             return None
             
-        # Validate and enrich
-        validated = self._validate_data(parsed)
-        if not validated:
+        if not self._validate_detection(detection):
             return None
             
-        # Add metadata
-        validated['radarId'] = self.station_id if not self.anonymize else f"RADAR-{hash(self.station_id) % 10000:04d}"
-        validated['stationName'] = self.station_name
-        validated['timestamp'] = raw_data.get('timestamp', datetime.utcnow().isoformat())
-        validated['source'] = source
+        return self._add_metadata(detection, raw_data)
+        
+    def process_batch(self, frames: List[Dict[str, Any]]) -> DetectionBatch:
+        """Process a burst of frames into columnar arrays validated as vector masks
+        
+        batch.records holds the typed Detection for every valid frame, in order.
+        """
+        rows = []
+        kept = []
+        for raw_data in frames:
+            parsed = self._parse_fields(raw_data)
+            if parsed:
+                rows.append(parsed)
+                kept.append(raw_data)
+                
+        try:
+            batch = DetectionBatch(rows, kept)
+        except (TypeError, ValueError) as e:
+            # A malformed value somewhere in the burst: fall back to per-frame handling
+            logger.warning(f"Invalid radar data in batch, converting frames one by one: {e}")
+            batch = DetectionBatch([], [])
+            for parsed, raw_data in zip(rows, kept):
+                try:
+                    detection = Detection.from_fields(parsed)
+                except (TypeError, ValueError):
+                    continue
+                if self._validate_detection(detection):
+                    batch.records.append(self._add_metadata(detection, raw_data))
+            return batch
+            
+        batch.valid = self._validation_mask(batch)
+        rejected = len(batch) - int(np.count_nonzero(batch.valid))
+        if rejected:
+            logger.warning(f"Rejected {rejected} of {len(batch)} frames (detections, bearing or range out of bounds)")
+            
+        now = datetime.utcnow().isoformat()
+        valid_frames = [kept[i] for i in np.flatnonzero(batch.valid).tolist()]
+        batch.records = [
+            self._add_metadata(detection, raw_data, now)
+            for detection, raw_data in zip(batch.build_records(), valid_frames)
+        ]
+        return batch
         
-        return validated
+    def _validation_mask(self, batch: DetectionBatch) -> np.ndarray:
+        """Vector form of _validate_detection (NaN = field not present = not checked)"""
+        bearing = batch.bearing_deg
+        range_m = batch.range_m
+        return (
+            (batch.detections >= 0) & (batch.detections <= self.max_detections)
+            & (np.isnan(bearing) | ((bearing >= 0) & (bearing <= 360)))
+            & (np.isnan(range_m) | ((range_m >= 0) & (range_m <= 50000)))  # 50km max
+        )
         
     def _parse_nmea(self, data: str) -> Optional[Dict[str, Any]]:
         """Parse NMEA format sentences"""
         
+        try:
+            fields = split_sentence(data, self.nmea_require_checksum)
+        except NmeaChecksumError as e:
+            self.stats['nmea_checksum_errors'] += 1
+            logger.debug(str(e))
+            return None
+        if not fields:
+            return None
+            
+        # Known sentences are read straight from the split fields
+        extractor = NMEA_SENTENCES.get(sentence_id(fields[0]))
+        if extractor:
+            try:
+                return extractor(fields)
+            except Exception as e:
+                logger.debug(f"NMEA {fields[0]} parse failed: {e}")
+                return None
+                
+        self.stats['nmea_fallback'] += 1
+        return self._parse_nmea_fallback(data)
+        
+    def _parse_nmea_fallback(self, data: str) -> Optional[Dict[str, Any]]:
+        """Parse other NMEA sentences with pynmea2"""
+        
         if not data.startswith('$'):
             return None
             
@@ -113,33 +328,7 @@ class RadarDataProcessor:
         
         # Example custom format: "DET:2 RNG:3.5km BRG:045 ALT:150m SPD:85kts"
         try:
-            result = {}
-            
-            # Extract detections
-            det_match = re.search(r'DET:?(\d+)', data, re.IGNORECASE)
-            if det_match:
-                result['detections'] = int(det_match.group(1))
-                
-            # Extract range
-            rng_match = re.search(r'RNG:?([\d.]+)(km|m)?', data, re.IGNORECASE)
-            if rng_match:
-                result['range'] = f"{rng_match.group(1)}{rng_match.group(2) or 'km'}"
-                
-            # Extract bearing
-            brg_match = re.search(r'BRG:?(\d+)', data, re.IGNORECASE)
-            if brg_match:
-                result['bearing'] = f"{brg_match.group(1)}°"
-                
-            # Extract altitude
-            alt_match = re.search(r'ALT:?(\d+)(m|ft)?', data, re.IGNORECASE)
-            if alt_match:
-                result['altitude'] = f"{alt_match.group(1)}{alt_match.group(2) or 'm'}"
-                
-            # Extract speed
-            spd_match = re.search(r'SPD:?(\d+)(kts|kmh)?', data, re.IGNORECASE)
-            if spd_match:
-                result['speed'] = f"{spd_match.group(1)}{spd_match.group(2) or 'kts'}"
-                
+            result = self.custom_scanner.scan(data)
             if result:
                 result.setdefault('detections', 1)
                 result.setdefault('confidence', 'MEDIUM')
@@ -151,39 +340,31 @@ class RadarDataProcessor:
             
         return None
         
-    def _validate_data(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'format': self.format,
+            'source_formats': dict(self.source_formats),
+            **self.stats
+        }
+        
+    def _validate_detection(self, detection: Detection) -> bool:
         """Validate parsed data"""
         
-        # Check required fields
-        if 'detections' not in data:
-            return None
-            
         # Validate detections count
-        detections = data.get('detections', 0)
-        if detections < 0 or detections > 100:
-            logger.warning(f"Invalid detection count: {detections}")
-            return None
+        if detection.detections < 0 or detection.detections > self.max_detections:
+            logger.warning(f"Invalid detection count: {detection.detections}")
+            return False
             
         # Validate bearing if present
-        bearing_str = data.get('bearing', '')
-        if bearing_str and bearing_str != 'N/A':
-            try:
-                bearing_val = float(bearing_str.replace('°', ''))
-                if bearing_val < 0 or bearing_val > 360:
-                    logger.warning(f"Invalid bearing: {bearing_val}")
-                    return None
-            except:
-                pass
-                
+        bearing = detection.bearing_deg
+        if bearing is not None and (bearing < 0 or bearing > 360):
+            logger.warning(f"Invalid bearing: {bearing}")
+            return False
+            
         # Validate range
-        range_str = data.get('range', '')
-        if range_str and range_str != 'N/A':
-            try:
-                range_val = float(re.sub(r'[^\d.]', '', range_str))
-                if range_val < 0 or range_val > 50:  # 50km max
-                    logger.warning(f"Invalid range: {range_val}")
-                    return None
-            except:
-                pass
-                
-        return data
+        range_m = detection.range_m
+        if range_m is not None and (range_m < 0 or range_m > 50000):  # 50km max
+            logger.warning(f"Invalid range: {range_m / 1000:.2f}km")
+            return False
+            
+        return True
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+TOPICS = ('detections', 'status', 'predictions', 'zones')
+
+def without_paths(data: Any, paths: Iterable[str]) -> Any:
+    """Copy of a snapshot minus the given dotted key paths (e.g. 'darcy_stats.spool.oldest_age_seconds')
+    
+    A path through a list applies to every item ('predictions.seconds_remaining').
+    """
+    if isinstance(data, list):
+        return [without_paths(item, paths) for item in data]
+    if not isinstance(data, dict):
+        return data
+    nested: Dict[str, List[str]] = {}
+    dropped = set()
+    for path in paths:
+        key, _, rest = path.partition('.')
+        if rest:
+            nested.setdefault(key, []).append(rest)
+        else:
+            dropped.add(key)
+    return {
+        key: without_paths(value, nested[key]) if key in nested else value
+        for key, value in data.items() if key not in dropped
+    }
+
+class Subscription:
+    """One connected dashboard: a bounded mailbox of serialized events
+    
+    A slow client never holds up the others; when its mailbox is full the
+    oldest undelivered event is dropped.
+    """
+    
+    def __init__(self, topics: Iterable[str], maxsize: int = 100):
+        self.topics = set(topics)
+        self.messages: deque = deque(maxlen=maxsize)
+        self.ready = asyncio.Event()
+        self.dropped = 0
+        
+    def push(self, topic: str, message: str):
+        if len(self.messages) == self.messages.maxlen:
+            self.dropped += 1
+        self.messages.append((topic, message))
+        self.ready.set()
+        
+    async def next_messages(self, timeout: Optional[float] = None) -> List[Tuple[str, str]]:
+        """Wait for pending events and take all of them (empty list on timeout)"""
+        if not self.messages:
+            self.ready.clear()
+            try:
+                await asyncio.wait_for(self.ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        messages = list(self.messages)
+        self.messages.clear()
+        return messages
+
+
+class EventHub:
+    """Fan-out of live gateway events to push subscribers (WebSocket / SSE)
+    
+    Every event is serialized once and the same text is handed to each
+    subscriber of its topic, so the cost of an update does not grow with the
+    number of open dashboards. Snapshot topics remember their last message,
+    which new subscribers receive immediately.
+    """
+    
+    def __init__(self, client_queue_size: int = 100):
+        self.client_queue_size = client_queue_size
+        self.subscribers: List[Subscription] = []
+        self.last_bodies: Dict[str, str] = {}
+        self.last_messages: Dict[str, str] = {}
+        self.stats = {
+            'published': 0,
+            'unchanged_skipped': 0,
+            'delivered': 0
+        }
+        
+    def subscribe(self, topics: Optional[Iterable[str]] = None) -> Subscription:
+        topics = [t for t in (topics or TOPICS) if t in TOPICS]
+        subscription = Subscription(topics, self.client_queue_size)
+        for topic in subscription.topics:
+            if topic in self.last_messages:
+                subscription.push(topic, self.last_messages[topic])
+        self.subscribers.append(subscription)
+        logger.info(f"Push subscriber connected ({', '.join(sorted(subscription.topics))}), {len(self.subscribers)} total")
+        return subscription
+        
+    def unsubscribe(self, subscription: Subscription):
+        if subscription in self.subscribers:
+            self.subscribers.remove(subscription)
+            logger.info(f"Push subscriber disconnected, {len(self.subscribers)} remaining")
+            
+    def set_topics(self, subscription: Subscription, topics: Iterable[str]):
+        """Change what an existing subscriber receives"""
+        subscription.topics = {t for t in topics if t in TOPICS}
+        
+    def has_subscribers(self, topic: str) -> bool:
+        return any(topic in s.topics for s in self.subscribers)
+        
+    def publish(self, topic: str, data: Any, snapshot: bool = False, volatile: Iterable[str] = ()) -> bool:
+        """Serialize an event once and deliver it to every subscriber of the topic
+        
+        Snapshot events that are identical to the previous one are skipped;
+        `volatile` key paths (clocks, ages, countdowns) are left out of that
+        comparison. Returns True if the event was delivered to anyone.
+        """
+        targets = [s for s in self.subscribers if topic in s.topics]
+        if not targets:
+            return False
+            
+        body = json.dumps(data, default=str)
+        if snapshot:
+            compared = json.dumps(without_paths(data, volatile), default=str) if volatile else body
+            if self.last_bodies.get(topic) == compared:
+                self.stats['unchanged_skipped'] += 1
+                return False
+            self.last_bodies[topic] = compared
+            
+        message = f'{{"topic": "{topic}", "timestamp": "{datetime.utcnow().isoformat()}", "data": {body}}}'
+        if snapshot:
+            self.last_messages[topic] = message
+            
+        for subscription in targets:
+            subscription.push(topic, message)
+        self.stats['published'] += 1
+        self.stats['delivered'] += len(targets)
+        return True
+        
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'subscribers': len(self.subscribers),
+            'dropped': sum(s.dropped for s in self.subscribers),
+            **self.stats
+        }
+
+# Global event hub instance
+event_hub = EventHub()
@@ -0,0 +1,110 @@
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import sys
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+def _inotify_libc():
+    """libc with the inotify calls, or None where they are not available"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1  # Missing on very old C libraries
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+class DirectoryWatcher:
+    """Calls `on_change` whenever something in a directory changes
+
+    Uses inotify where the platform has it (the callback runs as soon as the
+    kernel reports a write, create or rename) and polls every
+    `poll_interval` seconds otherwise. With inotify a slow safety poll still
+    runs every `fallback_interval` seconds for filesystems that do not
+    deliver events (NFS, some bind mounts).
+    """
+
+    def __init__(self, directory: str, on_change: Callable[[], None], poll_interval: float = 0.05,
+                 fallback_interval: float = 1.0, use_inotify: bool = True):
+        self.directory = directory or '.'
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.fallback_interval = fallback_interval
+        self.use_inotify = use_inotify
+        self.mode = 'stopped'
+        self.inotify_fd: Optional[int] = None
+        self.poll_task: Optional[asyncio.Task] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self) -> str:
+        """Start watching; returns the mode in use ('inotify' or 'polling')"""
+        self.loop = asyncio.get_running_loop()
+        interval = self.poll_interval
+        if self.use_inotify and self._start_inotify():
+            self.mode = 'inotify'
+            interval = self.fallback_interval
+        else:
+            self.mode = 'polling'
+        self.poll_task = asyncio.create_task(self._poll(interval))
+        logger.info(f"Watching {self.directory} ({self.mode})")
+        return self.mode
+
+    def stop(self):
+        if self.poll_task:
+            self.poll_task.cancel()
+            self.poll_task = None
+        if self.inotify_fd is not None:
+            self.loop.remove_reader(self.inotify_fd)
+            os.close(self.inotify_fd)
+            self.inotify_fd = None
+        self.mode = 'stopped'
+
+    def _start_inotify(self) -> bool:
+        libc = _inotify_libc()
+        if libc is None:
+            return False
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            logger.warning(f"inotify unavailable ({os.strerror(ctypes.get_errno())}), polling instead")
+            return False
+        if libc.inotify_add_watch(fd, os.fsencode(self.directory), WATCH_MASK) < 0:
+            logger.warning(f"Cannot watch {self.directory} ({os.strerror(ctypes.get_errno())}), polling instead")
+            os.close(fd)
+            return False
+        self.inotify_fd = fd
+        self.loop.add_reader(fd, self._on_inotify)
+        return True
+
+    def _on_inotify(self):
+        # The events themselves are not needed: drain them and re-check once
+        try:
+            while os.read(self.inotify_fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        self._notify()
+
+    async def _poll(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            self._notify()
+
+    def _notify(self):
+        try:
+            self.on_change()
+        except Exception as e:
+            logger.error(f"File change handler failed for {self.directory}: {e}")
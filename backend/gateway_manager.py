@@ -1,12 +1,17 @@
 import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from radar_connector import create_connector, RadarConnector
+from connector_group import ConnectorGroup
 from data_processor import RadarDataProcessor
-from locrypt_client import DarcyClient
+from locrypt_client import DarcyClient, PublishRejected
 from config_manager import ConfigManager
 from prediction_engine import prediction_engine
+from pipeline import Pipeline
+from queue_drainer import QueueDrainer
+from event_hub import event_hub
+from radar_models import Detection
 
 logger = logging.getLogger(__name__)
 
@@ -20,11 +25,13 @@ class GatewayManager:
         self.radar_connector: Optional[RadarConnector] = None
         self.data_processor: Optional[RadarDataProcessor] = None
         self.darcy_client: Optional[DarcyClient] = None
+        self.pipeline: Optional[Pipeline] = None
+        self.queue_drainer: Optional[QueueDrainer] = None
         
         self.is_running = False
         self.last_detection_time: Optional[datetime] = None
         self.last_detection_count = 0
-        self.last_published_data: Optional[Dict[str, Any]] = None
+        self.last_published_data: Optional[Detection] = None
         
         self.stats = {
             'start_time': None,
@@ -41,24 +48,45 @@ class GatewayManager:
             radar_config = self.config.get('radar_data', {})
             self.data_processor = RadarDataProcessor(radar_config)
             
+            event_hub.client_queue_size = self.config.get('stream', {}).get('client_queue_size', 100)
+            prediction_engine.configure(self.config.get('prediction', {}))
+            
             # Initialize Darcy client
             darcy_config = self.config.get('darcy', {})
             backend_url = darcy_config.get('backend_url', '')
             gateway_token = darcy_config.get('gateway_token', '')
             
             if backend_url and gateway_token:
-                self.darcy_client = DarcyClient(backend_url, gateway_token)
+                client_config = {
+                    'retry_attempts': self.config.get('publishing', {}).get('retry_attempts', 3),
+                    **darcy_config
+                }
+                self.darcy_client = DarcyClient(backend_url, gateway_token, client_config)
+                self.darcy_client.set_batch_callback(self._on_batch_published)
+                self.queue_drainer = QueueDrainer(self.darcy_client, darcy_config.get('drainer', {}))
                 logger.info("Darcy client initialized")
             else:
                 logger.warning("Darcy credentials not configured")
                 
-            # Initialize radar connector
-            radar_type = self.config.get('radar', {}).get('type', 'mock')
-            radar_conn_config = self.config.get('radar', {}).get('connection', {})
-            
-            self.radar_connector = create_connector(radar_type, radar_conn_config)
-            self.radar_connector.set_data_callback(self._on_radar_data)
-            logger.info(f"Radar connector initialized: {radar_type}")
+            # Initialize radar connector(s)
+            radar_sources = self.config.get('radars')
+            if radar_sources:
+                # Several sensors feed one shared processing/publishing pipeline
+                self.radar_connector = ConnectorGroup(radar_sources)
+                self.radar_connector.set_data_callback(self._on_radar_data)
+                logger.info(f"Radar connector group initialized: {len(radar_sources)} sources")
+            else:
+                radar_type = self.config.get('radar', {}).get('type', 'mock')
+                radar_conn_config = self.config.get('radar', {}).get('connection', {})
+                
+                self.radar_connector = create_connector(radar_type, radar_conn_config)
+                self.radar_connector.name = radar_type
+                self.radar_connector.set_data_callback(self._on_radar_data)
+                logger.info(f"Radar connector initialized: {radar_type}")
+                
+            members = self.radar_connector.connectors.values() if radar_sources else [self.radar_connector]
+            for connector in members:
+                connector.frame_limit = self.data_processor.max_detections
             
             return True
             
@@ -78,6 +106,14 @@ class GatewayManager:
         self.is_running = True
         self.stats['start_time'] = datetime.utcnow().isoformat()
         
+        # Start processing stages before any radar data arrives
+        self.pipeline = self._build_pipeline()
+        self.pipeline.start()
+        
+        # Replay anything left in the outbound queue in the background
+        if self.queue_drainer:
+            self.queue_drainer.start()
+        
         # Start radar monitoring in background
         asyncio.create_task(self.radar_connector.start_monitoring())
         
@@ -94,20 +130,74 @@ class GatewayManager:
         if self.radar_connector:
             await self.radar_connector.stop_monitoring()
             
+        if self.pipeline:
+            await self.pipeline.stop()
+            
+        if self.queue_drainer:
+            await self.queue_drainer.stop()
+            
+        if self.darcy_client:
+            await self.darcy_client.close()
+            
         logger.info("Gateway stopped")
         return {"success": True, "message": "Gateway stopped successfully"}
         
+    def _build_pipeline(self) -> Pipeline:
+        """Build the ingest -> parse -> predict -> publish stages
+        
+        Each stage runs in its own worker behind a bounded queue, so a slow
+        uplink can never stall reading from the radar.
+        """
+        pipeline_config = self.config.get('pipeline', {})
+        queue_defaults = {
+            'ingest': {'maxsize': 5000, 'policy': 'drop_oldest'},
+            'predict': {'maxsize': 1000, 'policy': 'drop_oldest'},
+            'publish': {'maxsize': 1000, 'policy': 'drop_oldest'}
+        }
+        
+        pipeline = Pipeline()
+        queues = {}
+        for name, defaults in queue_defaults.items():
+            queue_config = {**defaults, **pipeline_config.get(name, {})}
+            queues[name] = pipeline.add_queue(name, queue_config['maxsize'], queue_config['policy'])
+            
+        # Frames are parsed in bursts: whatever is waiting, up to parse_batch_size
+        pipeline.add_stage('parse', queues['ingest'], self._parse_stage,
+                           batch_size=pipeline_config.get('parse_batch_size', 256))
+        pipeline.add_stage('predict', queues['predict'], self._predict_stage)
+        pipeline.add_stage('publish', queues['publish'], self._publish_stage,
+                           workers=pipeline_config.get('publish_workers', 1))
+        return pipeline
+        
+    @staticmethod
+    def _source_key(data: Dict[str, Any]) -> str:
+        return data.get('sensor') or data.get('source', 'unknown')
+        
     async def _on_radar_data(self, raw_data: Dict[str, Any]):
-        """Callback when radar data is received"""
+        """Callback when radar data is received: hand the frame to the ingest queue"""
+        if not self.pipeline:
+            return
+        await self.pipeline.queues['ingest'].put(raw_data, key=self._source_key(raw_data))
+        
+    async def _parse_stage(self, frames: List[Dict[str, Any]]):
+        """Parse stage: burst of raw frames -> standardized detections"""
         try:
-            # Process raw data
             if not self.data_processor:
                 return
                 
-            processed = self.data_processor.process_raw_data(raw_data)
-            if not processed:
-                return
-                
+            batch = self.data_processor.process_batch(frames)
+            predict_queue = self.pipeline.queues['predict']
+            for processed in batch.records:
+                await predict_queue.put(processed, key=processed.source_key)
+            
+        except Exception as e:
+            logger.error(f"Error processing radar data: {e}")
+            self.stats['errors_total'] += 1
+            self.stats['last_error'] = str(e)
+            
+    async def _predict_stage(self, processed: Detection):
+        """Predict stage: update state and predictions, decide whether to publish"""
+        try:
             self.stats['detections_total'] += 1
             self.last_detection_time = datetime.utcnow()
             
@@ -117,7 +207,11 @@ class GatewayManager:
             # Feed to prediction engine
             prediction_engine.add_detection(processed)
             
-            detection_count = processed.get('detections', 0)
+            # Push to live dashboards (formatted only when someone listens)
+            if event_hub.has_subscribers('detections'):
+                event_hub.publish('detections', processed.to_dict())
+            
+            detection_count = processed.detections
             
             logger.info(f"Radar detection: {detection_count} targets")
             
@@ -125,14 +219,23 @@ class GatewayManager:
             should_publish = self._should_publish(processed, detection_count)
             
             if should_publish and self.darcy_client:
-                await self._publish_data(processed)
+                await self.pipeline.queues['publish'].put(processed, key=processed.source_key)
                 
         except Exception as e:
             logger.error(f"Error processing radar data: {e}")
             self.stats['errors_total'] += 1
             self.stats['last_error'] = str(e)
             
-    def _should_publish(self, data: Dict[str, Any], detection_count: int) -> bool:
+    async def _publish_stage(self, processed: Detection):
+        """Publish stage: send to Darcy (may wait on retries without blocking ingest)"""
+        try:
+            await self._publish_data(processed)
+        except Exception as e:
+            logger.error(f"Error publishing radar data: {e}")
+            self.stats['errors_total'] += 1
+            self.stats['last_error'] = str(e)
+            
+    def _should_publish(self, data: Detection, detection_count: int) -> bool:
         """Determine if data should be published based on mode"""
         
         mode = self.config.get('publishing', {}).get('mode', 'on_detection')
@@ -159,23 +262,44 @@ class GatewayManager:
             
         return False
         
-    async def _publish_data(self, data: Dict[str, Any]):
+    async def _publish_data(self, data: Detection):
         """Publish data to Darcy"""
         if not self.darcy_client:
             logger.warning("Darcy client not configured")
             return
             
-        success = await self.darcy_client.publish_data(data)
+        # Display strings are only produced here, at the uplink edge
+        payload = data.to_dict()
         
+        if self.darcy_client.batch_enabled:
+            # Sent with the next batch; the outcome is reported to _on_batch_published
+            await self.darcy_client.submit(payload)
+            self.last_published_data = data
+            return
+            
+        try:
+            success = await self.darcy_client.publish_data(payload)
+        except PublishRejected as e:
+            logger.error(f"Darcy rejected the detection ({e}), dropping it")
+            return
+            
         if success:
             self.stats['published_total'] += 1
             self.last_published_data = data
             logger.info("Data published to Darcy")
         else:
             # Queue for retry
-            await self.darcy_client.queue_data(data)
+            await self.darcy_client.queue_data(payload)
             logger.warning("Data queued for retry")
             
+    def _on_batch_published(self, items: List[Dict[str, Any]], success: bool):
+        """Callback after the Darcy client flushed a batch"""
+        if success:
+            self.stats['published_total'] += len(items)
+            logger.info(f"Batch of {len(items)} published to Darcy")
+        else:
+            logger.warning(f"Batch of {len(items)} not published")
+            
     async def manual_publish(self):
         """Manually trigger data publish"""
         if self.last_published_data:
@@ -216,21 +340,25 @@ class GatewayManager:
             uptime = str(datetime.utcnow() - start)
             
         radar_status = "disconnected"
+        radar_sources = {}
         if self.radar_connector:
-            if self.radar_connector.is_connected:
-                radar_status = "connected"
-            if self.radar_connector.is_monitoring:
-                radar_status = "monitoring"
+            radar_status = self.radar_connector.get_status()
+            radar_sources = self.radar_connector.get_source_stats()
                 
         return {
             'is_running': self.is_running,
             'radar_status': radar_status,
+            'radar_sources': radar_sources,
             'darcy_connected': self.darcy_client is not None,
+            'darcy_circuit': self.darcy_client.circuit.get_status() if self.darcy_client else None,
             'uptime': uptime,
             'last_detection': self.last_detection_time.isoformat() if self.last_detection_time else None,
             'stats': self.stats,
             'darcy_stats': self.darcy_client.get_stats() if self.darcy_client else {},
-            'last_published_data': self.last_published_data
+            'queue_drainer': self.queue_drainer.get_stats() if self.queue_drainer else {},
+            'pipeline': self.pipeline.get_stats() if self.pipeline else {},
+            'parser': self.data_processor.get_stats() if self.data_processor else {},
+            'last_published_data': self.last_published_data.to_dict() if self.last_published_data else None
         }
         
     def update_config(self, new_config: Dict[str, Any]):
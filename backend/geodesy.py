@@ -0,0 +1,82 @@
+import math
+from typing import Dict, Tuple, Union
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+
+# Cluj-Napoca
+BASE_LOCATION = {'lat': 46.7712, 'lon': 23.6236}
+
+SECTOR_BEARINGS = {
+    'N': 0, 'NE': 45, 'E': 90, 'SE': 135,
+    'S': 180, 'SW': 225, 'W': 270, 'NW': 315
+}
+
+DEFAULT_SECTOR_RANGE_M = 20000.0  # Typical detection range
+
+ArrayLike = Union[float, np.ndarray]
+
+class BaseFrame:
+    """Spherical-earth conversions between range/bearing from a fixed base and lat/lon
+
+    The trigonometry of the base latitude is computed once, and every method
+    takes NumPy arrays (or scalars), so converting every target of a scan is
+    one vector call.
+    """
+
+    def __init__(self, lat: float, lon: float):
+        self.lat = lat
+        self.lon = lon
+        self.lat_rad = math.radians(lat)
+        self.lon_rad = math.radians(lon)
+        self.sin_lat = math.sin(self.lat_rad)
+        self.cos_lat = math.cos(self.lat_rad)
+        self.sector_centres: Dict[Tuple[str, float], Tuple[float, float]] = {}
+        for sector in SECTOR_BEARINGS:
+            self.sector_centre(sector)
+
+    def destination(self, range_m: ArrayLike, bearing_deg: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+        """Range (m) and bearing (degrees) from the base -> (lat, lon) in degrees"""
+        distance = np.asarray(range_m, dtype=np.float64) / EARTH_RADIUS_M
+        bearing = np.radians(np.asarray(bearing_deg, dtype=np.float64))
+        sin_d, cos_d = np.sin(distance), np.cos(distance)
+
+        sin_lat2 = np.clip(self.sin_lat * cos_d + self.cos_lat * sin_d * np.cos(bearing), -1.0, 1.0)
+        lat2 = np.arcsin(sin_lat2)
+        lon2 = self.lon_rad + np.arctan2(np.sin(bearing) * sin_d * self.cos_lat, cos_d - self.sin_lat * sin_lat2)
+        return np.degrees(lat2), np.degrees(lon2)
+
+    def range_bearing(self, lat: ArrayLike, lon: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+        """(lat, lon) in degrees -> range (m) and bearing (degrees) from the base"""
+        lat2 = np.radians(np.asarray(lat, dtype=np.float64))
+        dlon = np.radians(np.asarray(lon, dtype=np.float64)) - self.lon_rad
+        sin_lat2, cos_lat2 = np.sin(lat2), np.cos(lat2)
+
+        haversine = np.sin((lat2 - self.lat_rad) / 2) ** 2 + self.cos_lat * cos_lat2 * np.sin(dlon / 2) ** 2
+        range_m = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(haversine, 0.0, 1.0)))
+        bearing = np.degrees(np.arctan2(
+            np.sin(dlon) * cos_lat2,
+            self.cos_lat * sin_lat2 - self.sin_lat * cos_lat2 * np.cos(dlon)
+        )) % 360
+        return range_m, bearing
+
+    def position(self, range_m: float, bearing_deg: float) -> Tuple[float, float]:
+        """Single point version of destination(), as plain floats (math is faster than NumPy for one point)"""
+        distance = range_m / EARTH_RADIUS_M
+        bearing = math.radians(bearing_deg)
+        sin_d, cos_d = math.sin(distance), math.cos(distance)
+
+        sin_lat2 = max(-1.0, min(1.0, self.sin_lat * cos_d + self.cos_lat * sin_d * math.cos(bearing)))
+        lon2 = self.lon_rad + math.atan2(math.sin(bearing) * sin_d * self.cos_lat, cos_d - self.sin_lat * sin_lat2)
+        return math.degrees(math.asin(sin_lat2)), math.degrees(lon2)
+
+    def sector_centre(self, sector: str, range_m: float = DEFAULT_SECTOR_RANGE_M) -> Tuple[float, float]:
+        """(lat, lon) of a sector's centre bearing at range_m, from a lookup table"""
+        key = (sector, range_m)
+        centre = self.sector_centres.get(key)
+        if centre is None:
+            centre = self.position(range_m, SECTOR_BEARINGS.get(sector, 0))
+            self.sector_centres[key] = centre
+        return centre
+
+base_frame = BaseFrame(BASE_LOCATION['lat'], BASE_LOCATION['lon'])
@@ -1,130 +1,439 @@
 import asyncio
 import logging
 import json
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, Optional, List, Callable
 from datetime import datetime
 from collections import deque
 import aiohttp
+from outbound_spool import OutboundSpool
+from circuit_breaker import CircuitBreaker
 
 logger = logging.getLogger(__name__)
 
+# Client errors that are worth retrying; any other 4xx means the payload itself was refused
+RETRYABLE_CLIENT_STATUSES = {408, 429}
+
+# Upper bound on items accepted by one batch publish request (enforced by the server)
+MAX_BATCH_ITEMS = 500
+
+class PublishRejected(Exception):
+    """Darcy refused the payload (non-retryable 4xx); sending it again would fail the same way"""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+
 class DarcyClient:
     """Client for publishing data to Darcy gateway"""
     
-    def __init__(self, backend_url: str, gateway_token: str):
+    def __init__(self, backend_url: str, gateway_token: str, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
         self.backend_url = backend_url.rstrip('/')
         self.gateway_token = gateway_token
-        self.publish_queue = deque(maxlen=100)  # Max 100 queued messages
-        self.retry_attempts = 3
+        # Durable on-disk queue for detections that could not be published
+        self.spool = OutboundSpool.from_config(config.get('spool', {}))
+        self.replay_batch_size = self._batch_size(config.get('spool', {}), 'replay_batch_size', 100)
+        self.retry_attempts = config.get('retry_attempts', 3)
         self.is_publishing = False
+        self.live_inflight = 0  # Live publishes in progress; the queue drainer yields to them
         self.stats = {
             'published_today': 0,
             'failed_today': 0,
             'last_published': None,
-            'last_error': None
+            'last_error': None,
+            'batches_published': 0,
+            'short_circuited': 0,
+            'rejected': 0
         }
         
-    async def publish_data(self, radar_data: Dict[str, Any]) -> bool:
-        """Publish radar data to Darcy gateway"""
+        # Batch mode: accumulate detections and send them in one request
+        batch_config = config.get('batch', {})
+        self.batch_enabled = batch_config.get('enabled', False)
+        self.batch_max_size = self._batch_size(batch_config, 'max_size', 50)
+        self.batch_linger_ms = batch_config.get('linger_ms', 200)
+        self.pending_batch: List[Dict[str, Any]] = []
+        self.linger_task: Optional[asyncio.Task] = None
+        self.on_batch_result: Optional[Callable] = None
         
-        endpoint = f"{self.backend_url}/api/gateway/publish-data"
+        # Fail fast while the backend is down; health probes decide when to try again
+        self.circuit = CircuitBreaker.from_config(config.get('circuit_breaker', {}), probe=self._probe_health)
         
-        payload = {
-            'gateway_token': self.gateway_token,
-            'encrypted_data': json.dumps(radar_data),
-            'data_type': 'radar'
+        # Long-lived HTTP session (created lazily inside the running event loop)
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.request_timeout = config.get('request_timeout', 10)
+        self.pool_size = config.get('pool_size', 10)
+        self.keepalive_timeout = config.get('keepalive_timeout', 30)
+        self.dns_cache_ttl = config.get('dns_cache_ttl', 300)
+        
+        self.recent_latencies = deque(maxlen=200)
+        self.timing = {
+            'requests': 0,
+            'request_errors': 0,
+            'sessions_created': 0,
+            'total_ms': 0.0,
+            'min_ms': None,
+            'max_ms': None,
+            'last_ms': None
         }
         
-        for attempt in range(self.retry_attempts):
+    @staticmethod
+    def _batch_size(config: Dict[str, Any], key: str, default: int) -> int:
+        """Configured items per batch request, capped at what the server accepts"""
+        size = config.get(key, default)
+        if size > MAX_BATCH_ITEMS:
+            logger.warning(f"{key} {size} exceeds the server's limit of {MAX_BATCH_ITEMS} items per batch; using {MAX_BATCH_ITEMS}")
+            return MAX_BATCH_ITEMS
+        return size
+        
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it with a keep-alive connection pool if needed"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_size,
+                keepalive_timeout=self.keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+            )
+            self.timing['sessions_created'] += 1
+        return self.session
+        
+    async def close(self):
+        """Flush any pending batch, then close the shared session and its pooled connections"""
+        if self.pending_batch:
+            await self.flush_batch()
+        if self.session and not self.session.closed:
+            await self.session.close()
+            logger.info("Darcy client session closed")
+        self.session = None
+        
+    def close_spool(self):
+        """Close the on-disk queue (only on final shutdown; it is reopened on restart)"""
+        self.spool.close()
+        
+    def _record_timing(self, started: float, ok: bool = True):
+        """Record the duration of one HTTP request"""
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        timing = self.timing
+        timing['requests'] += 1
+        if not ok:
+            timing['request_errors'] += 1
+        timing['total_ms'] += elapsed_ms
+        timing['last_ms'] = round(elapsed_ms, 2)
+        timing['min_ms'] = elapsed_ms if timing['min_ms'] is None else min(timing['min_ms'], elapsed_ms)
+        timing['max_ms'] = elapsed_ms if timing['max_ms'] is None else max(timing['max_ms'], elapsed_ms)
+        self.recent_latencies.append(elapsed_ms)
+        
+    def get_timing_stats(self) -> Dict[str, Any]:
+        """Per-request latency statistics"""
+        timing = self.timing
+        recent = sorted(self.recent_latencies)
+        
+        def percentile(p: float) -> Optional[float]:
+            if not recent:
+                return None
+            return round(recent[min(len(recent) - 1, int(p * len(recent)))], 2)
+            
+        return {
+            'requests': timing['requests'],
+            'request_errors': timing['request_errors'],
+            'sessions_created': timing['sessions_created'],
+            'avg_ms': round(timing['total_ms'] / timing['requests'], 2) if timing['requests'] else None,
+            'min_ms': round(timing['min_ms'], 2) if timing['min_ms'] is not None else None,
+            'max_ms': round(timing['max_ms'], 2) if timing['max_ms'] is not None else None,
+            'last_ms': timing['last_ms'],
+            'p50_ms': percentile(0.5),
+            'p95_ms': percentile(0.95)
+        }
+        
+    async def _post_with_retries(self, endpoint: str, payload: Dict[str, Any],
+                                 attempts: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """POST a payload with retries and exponential backoff; returns the response body on success
+        
+        Raises PublishRejected as soon as Darcy refuses the payload with a
+        non-retryable client error.
+        """
+        
+        attempts = attempts or self.retry_attempts
+        for attempt in range(attempts):
+            if attempt and self.circuit.is_open:
+                break  # Backend declared down mid-retry; stop waiting and let the caller queue
+                
+            started = time.perf_counter()
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        endpoint,
-                        json=payload,
-                        timeout=aiohttp.ClientTimeout(total=10)
-                    ) as response:
-                        
-                        if response.status == 200:
-                            result = await response.json()
-                            logger.info(f"Data published successfully: {result.get('message')}")
-                            self.stats['published_today'] += 1
-                            self.stats['last_published'] = datetime.utcnow().isoformat()
-                            return True
+                session = await self._get_session()
+                async with session.post(endpoint, json=payload) as response:
+                    
+                    if response.status == 200:
+                        result = await response.json()
+                        self._record_timing(started)
+                        self.circuit.record_success()
+                        return result
+                    else:
+                        error_text = await response.text()
+                        self._record_timing(started, ok=False)
+                        logger.error(f"Publish failed (HTTP {response.status}): {error_text}")
+                        self.stats['last_error'] = f"HTTP {response.status}"
+                        # Client errors mean the backend is up; only server errors trip the circuit
+                        if response.status >= 500:
+                            self.circuit.record_failure()
                         else:
-                            error_text = await response.text()
-                            logger.error(f"Publish failed (HTTP {response.status}): {error_text}")
-                            self.stats['last_error'] = f"HTTP {response.status}"
-                            
+                            self.circuit.record_success()
+                            if response.status not in RETRYABLE_CLIENT_STATUSES:
+                                raise PublishRejected(response.status, error_text)
+                        
+            except PublishRejected:
+                raise
+            except asyncio.CancelledError:
+                # No verdict on the backend; a half-open trial must not hold its slot forever
+                self.circuit.release_trial()
+                raise
             except asyncio.TimeoutError:
-                logger.warning(f"Publish timeout (attempt {attempt + 1}/{self.retry_attempts})")
+                self._record_timing(started, ok=False)
+                logger.warning(f"Publish timeout (attempt {attempt + 1}/{attempts})")
                 self.stats['last_error'] = "Timeout"
+                self.circuit.record_failure()
             except Exception as e:
-                logger.error(f"Publish error (attempt {attempt + 1}/{self.retry_attempts}): {e}")
+                self._record_timing(started, ok=False)
+                logger.error(f"Publish error (attempt {attempt + 1}/{attempts}): {e}")
                 self.stats['last_error'] = str(e)
+                self.circuit.record_failure()
                 
             # Exponential backoff
-            if attempt < self.retry_attempts - 1:
+            if attempt < attempts - 1 and not self.circuit.is_open:
                 await asyncio.sleep(2 ** attempt)
                 
-        self.stats['failed_today'] += 1
-        return False
+        return None
         
-    async def queue_data(self, radar_data: Dict[str, Any]):
-        """Add data to publish queue"""
-        self.publish_queue.append({
-            'data': radar_data,
-            'timestamp': datetime.utcnow().isoformat()
-        })
-        logger.info(f"Data queued. Queue size: {len(self.publish_queue)}")
+    async def _probe_health(self) -> bool:
+        """Health probe used by the circuit breaker"""
+        try:
+            session = await self._get_session()
+            async with session.get(
+                f"{self.backend_url}/api/gateway/health",
+                timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                return response.status == 200
+        except Exception:
+            return False
+            
+    def _short_circuit(self, count: int = 1) -> bool:
+        """True if the circuit rejects this publish (caller should queue it)"""
+        if self.circuit.allow_request():
+            return False
+        self.stats['short_circuited'] += count
+        return True
         
-    async def process_queue(self):
-        """Process queued messages"""
+    async def publish_data(self, radar_data: Dict[str, Any]) -> bool:
+        """Publish radar data to Darcy gateway
         
-        if self.is_publishing:
-            return  # Already processing
+        False means it could not be delivered now (worth queueing); raises
+        PublishRejected if Darcy refused the payload itself.
+        """
+        
+        endpoint = f"{self.backend_url}/api/gateway/publish-data"
+        
+        payload = {
+            'gateway_token': self.gateway_token,
+            'encrypted_data': json.dumps(radar_data),
+            'data_type': 'radar'
+        }
+        
+        if self._short_circuit():
+            return False
+            
+        self.live_inflight += 1
+        try:
+            result = await self._post_with_retries(endpoint, payload)
+        except PublishRejected:
+            self._count_rejected(1)
+            raise
+        finally:
+            self.live_inflight -= 1
+            
+        if result is None:
+            self.stats['failed_today'] += 1
+            return False
             
-        self.is_publishing = True
+        logger.info(f"Data published successfully: {result.get('message')}")
+        self.stats['published_today'] += 1
+        self.stats['last_published'] = datetime.utcnow().isoformat()
+        return True
         
+    async def publish_batch(self, items: List[Dict[str, Any]]) -> bool:
+        """Publish several detections in one request to the batch endpoint (same outcomes as publish_data)"""
+        
+        if not items:
+            return True
+            
+        if self._short_circuit(len(items)):
+            return False
+            
+        self.live_inflight += 1
         try:
-            while self.publish_queue:
-                item = self.publish_queue.popleft()
-                success = await self.publish_data(item['data'])
-                
-                if not success:
-                    # Re-queue if failed
-                    self.publish_queue.appendleft(item)
-                    break  # Stop processing on failure
-                    
-                await asyncio.sleep(1)  # Rate limit
+            result = await self._post_batch(items)
+        except PublishRejected:
+            self._count_rejected(len(items))
+            raise
         finally:
-            self.is_publishing = False
+            self.live_inflight -= 1
+            
+        if result is None:
+            self.stats['failed_today'] += len(items)
+            return False
+            
+        self._record_batch_result(items, result)
+        return True
+        
+    def _count_rejected(self, count: int):
+        self.stats['failed_today'] += count
+        self.stats['rejected'] += count
+        
+    async def _post_batch(self, items: List[Dict[str, Any]], attempts: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        endpoint = f"{self.backend_url}/api/gateway/publish-batch"
+        
+        payload = {
+            'gateway_token': self.gateway_token,
+            'items': [
+                {'encrypted_data': json.dumps(item), 'data_type': 'radar'}
+                for item in items
+            ]
+        }
+        
+        return await self._post_with_retries(endpoint, payload, attempts)
+        
+    def _record_batch_result(self, items: List[Dict[str, Any]], result: Dict[str, Any]):
+        rejected = result.get('rejected', [])
+        if rejected:
+            # Rejected items are malformed, retrying them would fail again
+            logger.warning(f"Darcy rejected {len(rejected)} of {len(items)} batched items")
+            
+        accepted = result.get('accepted', len(items) - len(rejected))
+        self.stats['published_today'] += accepted
+        self.stats['batches_published'] += 1
+        self.stats['last_published'] = datetime.utcnow().isoformat()
+        logger.info(f"Batch published: {accepted} items")
+        
+    async def send_queued(self, items: List[Dict[str, Any]]) -> bool:
+        """Single-attempt publish of queued items for the background drainer
+        
+        No retries or backoff here: the drainer keeps failed items queued and
+        adapts its own rate instead. Raises PublishRejected when Darcy refuses
+        the items outright.
+        """
+        if not self.circuit.allow_request():
+            return False
+            
+        if self.batch_enabled:
+            result = await self._post_batch(items, attempts=1)
+            if result is None:
+                return False
+            self._record_batch_result(items, result)
+            return True
             
+        payload = {
+            'gateway_token': self.gateway_token,
+            'encrypted_data': json.dumps(items[0]),
+            'data_type': 'radar'
+        }
+        result = await self._post_with_retries(f"{self.backend_url}/api/gateway/publish-data", payload, attempts=1)
+        if result is None:
+            return False
+        self.stats['published_today'] += 1
+        self.stats['last_published'] = datetime.utcnow().isoformat()
+        return True
+        
+    def set_batch_callback(self, callback: Callable):
+        """Set callback(items, success) invoked after each batch flush"""
+        self.on_batch_result = callback
+        
+    async def submit(self, radar_data: Dict[str, Any]):
+        """Add a detection to the current batch, flushing when it is full or has lingered"""
+        self.pending_batch.append(radar_data)
+        
+        if len(self.pending_batch) >= self.batch_max_size:
+            await self.flush_batch()
+        elif self.linger_task is None:
+            self.linger_task = asyncio.create_task(self._linger_flush())
+            
+    async def _linger_flush(self):
+        await asyncio.sleep(self.batch_linger_ms / 1000)
+        self.linger_task = None
+        await self.flush_batch()
+        
+    async def flush_batch(self) -> bool:
+        """Send everything accumulated so far; failed batches go to the retry queue, rejected ones are dropped"""
+        if self.linger_task and self.linger_task is not asyncio.current_task():
+            self.linger_task.cancel()
+            self.linger_task = None
+            
+        items, self.pending_batch = self.pending_batch, []
+        if not items:
+            return True
+            
+        try:
+            success = await self.publish_batch(items)
+        except PublishRejected as e:
+            # Retrying a refused payload would fail the same way; do not spool it
+            logger.error(f"Darcy rejected a batch of {len(items)} ({e}), dropping it")
+            success = False
+        else:
+            if not success:
+                self.queue_many(items)
+                logger.warning(f"Batch of {len(items)} queued for retry")
+                
+        if self.on_batch_result:
+            self.on_batch_result(items, success)
+        return success
+        
+    async def queue_data(self, radar_data: Dict[str, Any]):
+        """Add data to the durable publish queue"""
+        self.spool.append(radar_data)
+        logger.info(f"Data queued. Queue size: {len(self.spool)}")
+        
+    def queue_many(self, items: List[Dict[str, Any]]):
+        """Add several items to the durable publish queue in one transaction"""
+        self.spool.append_many(items)
+        logger.info(f"{len(items)} items queued. Queue size: {len(self.spool)}")
+        
     async def test_connection(self) -> Dict[str, Any]:
         """Test connection to Darcy backend"""
         
         endpoint = f"{self.backend_url}/api/gateway/health"
         
+        started = time.perf_counter()
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    endpoint,
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as response:
+            session = await self._get_session()
+            async with session.get(
+                endpoint,
+                timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                self._record_timing(started, ok=response.status == 200)
+                
+                if response.status == 200:
+                    return {'success': True, 'message': 'Connection successful'}
+                else:
+                    return {'success': False, 'message': f'HTTP {response.status}'}
                     
-                    if response.status == 200:
-                        return {'success': True, 'message': 'Connection successful'}
-                    else:
-                        return {'success': False, 'message': f'HTTP {response.status}'}
-                        
         except Exception as e:
+            self._record_timing(started, ok=False)
             return {'success': False, 'message': str(e)}
             
     def get_stats(self) -> Dict[str, Any]:
         """Get publishing statistics"""
         return {
             **self.stats,
-            'queue_size': len(self.publish_queue),
-            'is_publishing': self.is_publishing
+            'queue_size': len(self.spool),
+            'queue_oldest_age_seconds': self.spool.oldest_age(),
+            'spool': self.spool.get_stats(),
+            'is_publishing': self.is_publishing,
+            'request_timing': self.get_timing_stats(),
+            'circuit': self.circuit.get_status()
         }
         
     def reset_daily_stats(self):
@@ -0,0 +1,166 @@
+import logging
+from typing import Dict, Any, List, Optional, Callable
+from radar_models import KM, NM, KNOT, KMH
+
+logger = logging.getLogger(__name__)
+
+# Sentence id -> extractor(fields) returning the detection dict in SI fields (or None)
+NmeaExtractor = Callable[[List[str]], Optional[Dict[str, Any]]]
+NMEA_SENTENCES: Dict[str, NmeaExtractor] = {}
+
+class NmeaChecksumError(ValueError):
+    pass
+
+# Conversion factors to metres for TTM distance units and to m/s for speed units
+TTM_DISTANCE_M = {'K': KM, 'N': NM, 'S': 1609.344}
+TTM_SPEED_MS = {'K': KMH, 'N': KNOT, 'S': 0.44704}
+
+def register_nmea_sentence(sentence_id: str):
+    """Register a field extractor for a sentence type (e.g. 'GGA') or proprietary address (e.g. 'PRDET')"""
+    def decorator(extractor: NmeaExtractor) -> NmeaExtractor:
+        NMEA_SENTENCES[sentence_id] = extractor
+        return extractor
+    return decorator
+
+def nmea_checksum(body: str) -> int:
+    """XOR of every character between '$' and '*'"""
+    checksum = 0
+    for char in body.encode('ascii', 'replace'):
+        checksum ^= char
+    return checksum
+
+def split_sentence(data: str, require_checksum: bool = False) -> Optional[List[str]]:
+    """Validate the checksum and split a sentence into fields (fields[0] is the address)
+    
+    Returns None for malformed sentences; raises NmeaChecksumError on a bad checksum.
+    """
+    data = data.strip()
+    if len(data) < 6 or data[0] not in '$!':
+        return None
+        
+    star = data.rfind('*')
+    if star == -1:
+        if require_checksum:
+            return None
+        body = data[1:]
+    else:
+        body = data[1:star]
+        try:
+            expected = int(data[star + 1:star + 3], 16)
+        except ValueError:
+            return None
+        if nmea_checksum(body) != expected:
+            raise NmeaChecksumError(f"NMEA checksum mismatch: {data[:40]}")
+            
+    return body.split(',')
+
+def sentence_id(address: str) -> str:
+    """'GPGGA' -> 'GGA'; proprietary addresses ('P...') are kept whole"""
+    return address if address.startswith('P') else address[2:]
+
+def _float(value: str) -> Optional[float]:
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+def _degrees(value: str, hemisphere: str) -> float:
+    """ddmm.mmmm (or dddmm.mmmm) plus N/S/E/W -> signed decimal degrees"""
+    raw = _float(value)
+    if raw is None:
+        return 0.0
+    degrees = int(raw // 100)
+    decimal = degrees + (raw - degrees * 100) / 60
+    return -decimal if hemisphere in ('S', 'W') else decimal
+
+@register_nmea_sentence('GGA')
+def _extract_gga(fields: List[str]) -> Optional[Dict[str, Any]]:
+    if len(fields) < 10:
+        return None
+    result = {
+        'detections': 1,
+        'confidence': 'HIGH',
+        'signalStrength': 85,
+        'bearing_deg': _degrees(fields[2], fields[3]),
+        'range_m': _degrees(fields[4], fields[5]) * KM
+    }
+    altitude = _float(fields[9])
+    if altitude is not None:
+        result['altitude_m'] = altitude
+    return result
+
+@register_nmea_sentence('RMC')
+def _extract_rmc(fields: List[str]) -> Optional[Dict[str, Any]]:
+    if len(fields) < 8:
+        return None
+    result = {
+        'detections': 1,
+        'confidence': 'HIGH',
+        'signalStrength': 85,
+        'bearing_deg': _degrees(fields[3], fields[4]),
+        'range_m': _degrees(fields[5], fields[6]) * KM
+    }
+    speed = _float(fields[7])
+    if speed is not None:
+        result['speed_ms'] = speed * KNOT
+    return result
+
+@register_nmea_sentence('TTM')
+def _extract_ttm(fields: List[str]) -> Optional[Dict[str, Any]]:
+    """Tracked Target Message: number, distance, bearing, T/R, speed, course, T/R, CPA, TCPA, units, name, status, ..."""
+    if len(fields) < 13:
+        return None
+    distance = _float(fields[2])
+    bearing = _float(fields[3])
+    if distance is None or bearing is None:
+        return None
+        
+    units = fields[10] or 'N'
+    speed = _float(fields[5])
+    
+    target = {
+        'id': fields[11] or f"TTM-{fields[1]}",
+        'range_m': distance * TTM_DISTANCE_M.get(units, NM),
+        'bearing_deg': bearing,
+        'speed_ms': speed * TTM_SPEED_MS.get(units, KNOT) if speed is not None else 0.0
+    }
+    lost = fields[12] == 'L'
+    return {
+        'detections': 0 if lost else 1,
+        'confidence': 'MEDIUM' if fields[12] == 'Q' else 'HIGH',
+        'signalStrength': 85,
+        'range_m': target['range_m'],
+        'bearing_deg': target['bearing_deg'],
+        'speed_ms': target['speed_ms'],
+        'targets': [] if lost else [target]
+    }
+
+@register_nmea_sentence('PRDET')
+def _extract_prdet(fields: List[str]) -> Optional[Dict[str, Any]]:
+    """Proprietary detection: $PRDET,<count>,<range km>,<bearing deg>,<altitude m>,<speed kts>[,<target id>]*hh"""
+    if len(fields) < 6:
+        return None
+    count = _float(fields[1])
+    if count is None:
+        return None
+        
+    result = {
+        'detections': int(count),
+        'confidence': 'HIGH',
+        'signalStrength': 85
+    }
+    range_km, bearing, altitude, speed = (_float(v) for v in fields[2:6])
+    if range_km is not None:
+        result['range_m'] = range_km * KM
+    if bearing is not None:
+        result['bearing_deg'] = bearing
+    if altitude is not None:
+        result['altitude_m'] = altitude
+    if speed is not None:
+        result['speed_ms'] = speed * KNOT
+    if len(fields) > 6 and fields[6] and result['detections'] > 0:
+        result['targets'] = [{
+            'id': fields[6],
+            **{k: result[k] for k in ('range_m', 'bearing_deg', 'altitude_m', 'speed_ms') if k in result}
+        }]
+    return result
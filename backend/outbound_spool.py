@@ -0,0 +1,190 @@
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class OutboundSpool:
+    """Durable FIFO of detections waiting to be published to Darcy
+    
+    Backed by an embedded SQLite database in WAL mode, so queued detections
+    survive restarts and uplink outages. The spool is bounded by item count,
+    total payload size and age; the oldest entries are evicted first.
+    """
+    
+    def __init__(self, path: str = 'spool/outbound.db', max_items: int = 100000,
+                 max_bytes: int = 256 * 1024 * 1024, max_age_seconds: float = 24 * 3600):
+        self.path = path
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.stats = {
+            'appended': 0,
+            'acked': 0,
+            'evicted': 0,
+            'expired': 0
+        }
+        
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')  # Durable across process crashes, fast commits
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS spool ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'enqueued_at REAL NOT NULL, '
+            'size INTEGER NOT NULL, '
+            'payload TEXT NOT NULL)'
+        )
+        self.db.commit()
+        
+        # Keep depth and size in memory so bounds checks do not scan the table
+        self.count, self.bytes = self.db.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM spool'
+        ).fetchone()
+        if self.count:
+            logger.info(f"Outbound spool recovered {self.count} queued items from {path}")
+            
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'OutboundSpool':
+        return cls(
+            path=config.get('path', 'spool/outbound.db'),
+            max_items=config.get('max_items', 100000),
+            max_bytes=config.get('max_mb', 256) * 1024 * 1024,
+            max_age_seconds=config.get('max_age_hours', 24) * 3600
+        )
+        
+    def __len__(self) -> int:
+        return self.count
+        
+    def append(self, data: Dict[str, Any]) -> int:
+        """Append one item; returns its sequence id"""
+        payload = json.dumps(data)
+        size = len(payload.encode('utf-8'))
+        cursor = self.db.execute(
+            'INSERT INTO spool (enqueued_at, size, payload) VALUES (?, ?, ?)',
+            (time.time(), size, payload)
+        )
+        self.count += 1
+        self.bytes += size
+        self.stats['appended'] += 1
+        
+        if self.count > self.max_items or self.bytes > self.max_bytes:
+            self._evict_oldest()
+        self.db.commit()
+        return cursor.lastrowid
+        
+    def append_many(self, items: List[Dict[str, Any]]) -> int:
+        """Append several items in one transaction (one commit instead of one per item); returns how many"""
+        now = time.time()
+        rows = []
+        for data in items:
+            payload = json.dumps(data)
+            rows.append((now, len(payload.encode('utf-8')), payload))
+        if not rows:
+            return 0
+        self.db.executemany('INSERT INTO spool (enqueued_at, size, payload) VALUES (?, ?, ?)', rows)
+        self.count += len(rows)
+        self.bytes += sum(size for _, size, _ in rows)
+        self.stats['appended'] += len(rows)
+        
+        if self.count > self.max_items or self.bytes > self.max_bytes:
+            self._evict_oldest()
+        self.db.commit()
+        return len(rows)
+        
+    def _evict_oldest(self):
+        """Drop the oldest items until the spool is back within its bounds"""
+        excess_items = max(0, self.count - self.max_items)
+        if self.bytes > self.max_bytes:
+            # Walk forward from the head until enough bytes are covered
+            needed = self.bytes - self.max_bytes
+            covered = 0
+            rows = 0
+            for (size,) in self.db.execute('SELECT size FROM spool ORDER BY id'):
+                covered += size
+                rows += 1
+                if covered >= needed:
+                    break
+            excess_items = max(excess_items, rows)
+            
+        if excess_items:
+            removed = self._delete_head(excess_items)
+            self.stats['evicted'] += removed
+            logger.warning(f"Outbound spool full, evicted {removed} oldest items")
+            
+    def _delete_head(self, limit: int) -> int:
+        row = self.db.execute(
+            'SELECT MAX(id), COUNT(*), COALESCE(SUM(size), 0) FROM '
+            '(SELECT id, size FROM spool ORDER BY id LIMIT ?)', (limit,)
+        ).fetchone()
+        last_id, removed, removed_bytes = row
+        if not removed:
+            return 0
+        self.db.execute('DELETE FROM spool WHERE id <= ?', (last_id,))
+        self.count -= removed
+        self.bytes -= removed_bytes
+        return removed
+        
+    def expire(self) -> int:
+        """Drop items older than max_age_seconds"""
+        if not self.count or not self.max_age_seconds:
+            return 0
+        cutoff = time.time() - self.max_age_seconds
+        row = self.db.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM spool WHERE enqueued_at < ?', (cutoff,)
+        ).fetchone()
+        removed, removed_bytes = row
+        if removed:
+            self.db.execute('DELETE FROM spool WHERE enqueued_at < ?', (cutoff,))
+            self.db.commit()
+            self.count -= removed
+            self.bytes -= removed_bytes
+            self.stats['expired'] += removed
+            logger.warning(f"Outbound spool expired {removed} items older than {self.max_age_seconds:.0f}s")
+        return removed
+        
+    def peek(self, limit: int, after_id: int = 0) -> List[Tuple[int, Dict[str, Any]]]:
+        """Return up to limit (id, data) pairs in enqueue order without removing them"""
+        self.expire()
+        rows = self.db.execute(
+            'SELECT id, payload FROM spool WHERE id > ? ORDER BY id LIMIT ?', (after_id, limit)
+        ).fetchall()
+        return [(item_id, json.loads(payload)) for item_id, payload in rows]
+        
+    def ack(self, ids: List[int]):
+        """Remove items that were published"""
+        if not ids:
+            return
+        placeholders = ','.join('?' * len(ids))
+        removed, removed_bytes = self.db.execute(
+            f'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM spool WHERE id IN ({placeholders})', ids
+        ).fetchone()
+        self.db.execute(f'DELETE FROM spool WHERE id IN ({placeholders})', ids)
+        self.db.commit()
+        self.count -= removed
+        self.bytes -= removed_bytes
+        self.stats['acked'] += removed
+        
+    def oldest_age(self) -> Optional[float]:
+        """Age in seconds of the oldest queued item"""
+        if not self.count:
+            return None
+        row = self.db.execute('SELECT enqueued_at FROM spool ORDER BY id LIMIT 1').fetchone()
+        return round(time.time() - row[0], 1) if row else None
+        
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'depth': self.count,
+            'bytes': self.bytes,
+            'oldest_age_seconds': self.oldest_age(),
+            **self.stats
+        }
+        
+    def close(self):
+        self.db.close()
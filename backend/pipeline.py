@@ -0,0 +1,196 @@
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+from collections import deque, OrderedDict
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ('drop_oldest', 'latest_per_source', 'block')
+
+class StageQueue:
+    """Bounded queue between two pipeline stages
+    
+    Overflow policies:
+      - drop_oldest: a full queue evicts its oldest item
+      - latest_per_source: a newer item from the same source replaces the pending
+        one in place; a full queue evicts its oldest item
+      - block: put() waits until the consumer makes room (back-pressure)
+    """
+    
+    def __init__(self, name: str, maxsize: int = 1000, policy: str = 'drop_oldest'):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        if maxsize < 1:
+            raise ValueError("Queue size must be at least 1")
+            
+        self.name = name
+        self.maxsize = maxsize
+        self.policy = policy
+        self.items = OrderedDict() if policy == 'latest_per_source' else deque()
+        self.not_empty = asyncio.Event()
+        self.not_full = asyncio.Event()
+        self.not_full.set()
+        self.sequence = 0  # Unique keys for items without a source
+        self.stats = {
+            'enqueued': 0,
+            'dequeued': 0,
+            'dropped': 0,
+            'max_depth': 0
+        }
+        
+    def __len__(self) -> int:
+        return len(self.items)
+        
+    async def put(self, item: Any, key: Optional[str] = None):
+        """Add an item, applying the overflow policy when the queue is full"""
+        if self.policy == 'block':
+            while len(self.items) >= self.maxsize:
+                self.not_full.clear()
+                await self.not_full.wait()
+            self.items.append(item)
+            
+        elif self.policy == 'latest_per_source':
+            if key is None:
+                self.sequence += 1
+                key = f"#{self.sequence}"
+            if key in self.items:
+                self.items[key] = item  # Superseded before it was consumed
+                self.stats['dropped'] += 1
+            else:
+                if len(self.items) >= self.maxsize:
+                    self.items.popitem(last=False)
+                    self.stats['dropped'] += 1
+                self.items[key] = item
+                
+        else:
+            if len(self.items) >= self.maxsize:
+                self.items.popleft()
+                self.stats['dropped'] += 1
+            self.items.append(item)
+            
+        self.stats['enqueued'] += 1
+        if len(self.items) > self.stats['max_depth']:
+            self.stats['max_depth'] = len(self.items)
+        self.not_empty.set()
+        
+    def _pop(self) -> Any:
+        if self.policy == 'latest_per_source':
+            _, item = self.items.popitem(last=False)
+        else:
+            item = self.items.popleft()
+        self.stats['dequeued'] += 1
+        if not self.items:
+            self.not_empty.clear()
+        self.not_full.set()
+        return item
+        
+    async def get(self) -> Any:
+        """Wait for and remove the oldest item"""
+        while not self.items:
+            self.not_empty.clear()
+            await self.not_empty.wait()
+        return self._pop()
+        
+    async def get_batch(self, max_items: int) -> List[Any]:
+        """Wait for at least one item, then take up to max_items that are ready"""
+        first = await self.get()
+        batch = [first]
+        while self.items and len(batch) < max_items:
+            batch.append(self._pop())
+        return batch
+        
+    def clear(self) -> int:
+        """Discard pending items, returning how many were dropped"""
+        count = len(self.items)
+        self.items.clear()
+        self.not_empty.clear()
+        self.not_full.set()
+        return count
+        
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'depth': len(self.items),
+            'maxsize': self.maxsize,
+            'policy': self.policy,
+            **self.stats
+        }
+
+
+class Pipeline:
+    """Chain of stage workers connected by bounded queues"""
+    
+    def __init__(self):
+        self.queues: Dict[str, StageQueue] = {}
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.tasks: List[asyncio.Task] = []
+        
+    def add_queue(self, name: str, maxsize: int = 1000, policy: str = 'drop_oldest') -> StageQueue:
+        queue = StageQueue(name, maxsize, policy)
+        self.queues[name] = queue
+        return queue
+        
+    def add_stage(self, name: str, queue: StageQueue, handler: Callable[[Any], Awaitable[None]],
+                  workers: int = 1, batch_size: Optional[int] = None):
+        """Register a stage that consumes queue items with an async handler
+        
+        With batch_size the handler receives a list of up to batch_size items
+        that were ready at once, instead of one item per call.
+        """
+        self.stages[name] = {
+            'queue': queue,
+            'handler': handler,
+            'workers': max(1, workers),
+            'batch_size': batch_size,
+            'stats': {'processed': 0, 'errors': 0, 'last_error': None}
+        }
+        
+    def start(self):
+        for name, stage in self.stages.items():
+            for index in range(stage['workers']):
+                task = asyncio.create_task(self._run_stage(name, stage), name=f"pipeline-{name}-{index}")
+                self.tasks.append(task)
+        logger.info(f"Pipeline started: {' -> '.join(self.stages)}")
+        
+    async def _run_stage(self, name: str, stage: Dict[str, Any]):
+        queue: StageQueue = stage['queue']
+        handler = stage['handler']
+        stats = stage['stats']
+        batch_size = stage['batch_size']
+        
+        while True:
+            if batch_size:
+                item = await queue.get_batch(batch_size)
+                count = len(item)
+            else:
+                item = await queue.get()
+                count = 1
+            try:
+                await handler(item)
+                stats['processed'] += count
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Pipeline stage {name} failed: {e}")
+                stats['errors'] += 1
+                stats['last_error'] = str(e)
+            # get() does not suspend while items are queued; yield so the other stages keep pace
+            await asyncio.sleep(0)
+            
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks.clear()
+        
+        discarded = sum(queue.clear() for queue in self.queues.values())
+        if discarded:
+            logger.warning(f"Pipeline stopped with {discarded} unprocessed items")
+            
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'queues': {name: queue.get_stats() for name, queue in self.queues.items()},
+            'stages': {
+                name: dict(stage['stats'], workers=stage['workers'], batch_size=stage['batch_size'])
+                for name, stage in self.stages.items()
+            }
+        }
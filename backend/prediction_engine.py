@@ -1,91 +1,328 @@
 import logging
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from datetime import datetime, timedelta
 from collections import deque, Counter
+import heapq
+from itertools import islice
+import math
+import random
 import uuid
+from geodesy import base_frame, SECTOR_BEARINGS
+from radar_models import Detection, format_range, format_bearing
+from tracker import MultiTargetTracker
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SHADOW_HORIZONS = (5, 10, 30, 60, 120)
+
+EPOCH = datetime(1970, 1, 1)
+
+def epoch_seconds(moment: datetime) -> float:
+    """Naive UTC datetime -> epoch seconds (the tracker's time base)"""
+    return (moment - EPOCH).total_seconds()
+
+class ShadowLane:
+    """Predictions for one extra horizon, made from the engine's shared
+    patterns and validated like active ones, but never shown; only their
+    rolling accuracy is kept."""
+    
+    def __init__(self, horizon: int, window: int, rng: random.Random):
+        self.horizon = horizon
+        self.rng = rng  # Own stream, so shadow scoring never shifts the main lane's draws
+        self.predictions = {}  # Key -> standing prediction
+        self.expiry_heap = []  # (expected_time, sequence, key), soonest first
+        self.sequence = 0
+        self.results = deque(maxlen=window)  # (correct, spatial accuracy or None)
+        self.correct = 0
+        self.spatial_total = 0.0
+        self.spatial_count = 0
+        self.validated_total = 0
+        
+    def add(self, prediction: Dict[str, Any]):
+        self.sequence += 1
+        prediction['id'] = f"S{self.horizon}-{self.sequence}"
+        self.predictions[prediction['key']] = prediction
+        heapq.heappush(self.expiry_heap, (prediction['expected_time'], self.sequence, prediction['key']))
+        
+    def record(self, correct: bool, spatial: Optional[float]):
+        """Append a result, keeping the running sums in step with evictions"""
+        if len(self.results) == self.results.maxlen:
+            old_correct, old_spatial = self.results[0]
+            self.correct -= old_correct
+            if old_spatial is not None:
+                self.spatial_total -= old_spatial
+                self.spatial_count -= 1
+        self.results.append((correct, spatial))
+        self.correct += correct
+        if spatial is not None:
+            self.spatial_total += spatial
+            self.spatial_count += 1
+        self.validated_total += 1
+        
+    def get_stats(self) -> Dict[str, Any]:
+        samples = len(self.results)
+        return {
+            'horizon_seconds': self.horizon,
+            'accuracy': round(self.correct / samples * 100, 1) if samples else 0.0,
+            'spatial_accuracy': round(self.spatial_total / self.spatial_count, 1) if self.spatial_count else 0.0,
+            'samples': samples,
+            'validated_total': self.validated_total,
+            'active_predictions': len(self.predictions)
+        }
+
 class PredictionEngine:
-    """AI-powered prediction engine for drone detection patterns"""
+    """AI-powered prediction engine for drone detection patterns
     
-    def __init__(self):
-        self.detection_history = deque(maxlen=100)  # Last 100 detections
+    `clock` (returning naive UTC datetimes) and `rng` are injectable so the
+    engine can be replayed against recorded data faster than real time.
+    """
+    
+    def __init__(self, clock: Callable[[], datetime] = datetime.utcnow, rng: Optional[random.Random] = None):
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.result_callback: Optional[Callable[[Dict[str, Any]], None]] = None
         self.predictions = {}  # Active predictions
-        self.prediction_history = deque(maxlen=50)  # Last 50 predictions with results
+        self.prediction_keys = {}  # (type, sector or track id) -> active prediction
+        self.evaluation_interval = 1.0  # Min seconds between pattern evaluations
+        self.last_evaluation: Optional[datetime] = None
+        self.refreshed_total = 0
+        self.expiry_heap = []  # (expected_time, prediction id), soonest first
+        self.prediction_counter = 0
+        self.expiry_interval = 0.5  # Upper bound on validation lateness (seconds)
+        self.last_detection: Optional[Detection] = None
+        self.last_detection_at: Optional[datetime] = None
+        self.evidence_max_age = 5.0  # Seconds the latest frame still counts as evidence on the timer path
         self.prediction_timeline = 30  # Default 30 seconds
         self.accuracy_score = 0.0
         self.patterns_detected = []
+        self._reset_history(history_size=100, direction_window=10, wave_window=5, results_size=50)
+        
+        # Track-based predictions (sector histograms remain the fallback)
+        self.tracker = MultiTargetTracker()
+        self.max_track_predictions = 3
+        self.validation_radius_m = 2000.0
+        
+        # Shadow evaluation of several horizons from the same patterns
+        self.target_accuracy = 80.0
+        self.shadow_min_samples = 20
+        self.shadow_lanes = [ShadowLane(h, 500, self._lane_rng(h)) for h in DEFAULT_SHADOW_HORIZONS]
         
-    def add_detection(self, detection_data: Dict[str, Any]):
+    def _lane_rng(self, horizon: int) -> random.Random:
+        """RNG for a shadow lane, seeded from the main one without advancing it"""
+        fork = random.Random()
+        fork.setstate(self.rng.getstate())
+        return random.Random(fork.getrandbits(64) + horizon)
+        
+    def set_result_callback(self, callback: Callable[[Dict[str, Any]], None]):
+        """Called with every validated prediction (e.g. to keep results beyond the history window)"""
+        self.result_callback = callback
+        
+    def configure(self, config: Dict[str, Any]):
+        """Apply the `prediction` config section"""
+        self.tracker = MultiTargetTracker.from_config(config.get('tracker', {}))
+        self.max_track_predictions = config.get('max_track_predictions', 3)
+        self.validation_radius_m = config.get('validation_radius_m', 2000.0)
+        self.expiry_interval = config.get('expiry_interval', 0.5)
+        self.evidence_max_age = config.get('evidence_max_age', 5.0)
+        self.evaluation_interval = config.get('evaluation_interval', 1.0)
+        self.target_accuracy = config.get('target_accuracy', 80.0)
+        self.shadow_min_samples = config.get('shadow_min_samples', 20)
+        window = config.get('shadow_window', 500)
+        self.shadow_lanes = [
+            ShadowLane(int(h), window, self._lane_rng(int(h))) for h in sorted(set(config.get('shadow_horizons', DEFAULT_SHADOW_HORIZONS)))
+        ]
+        self._reset_history(
+            history_size=config.get('history_size', 100),
+            direction_window=config.get('direction_window', 10),
+            wave_window=max(3, config.get('wave_window', 5)),
+            results_size=config.get('results_size', 50)
+        )
+        
+    def _reset_history(self, history_size: int, direction_window: int, wave_window: int, results_size: int):
+        """(Re)create the rolling windows and the aggregates kept up to date on append/evict"""
+        self.detection_history = deque(maxlen=history_size)  # Last N detections
+        self.hour_counts = [0] * 24  # Detections per hour of day within detection_history
+        self.recent_sectors = deque(maxlen=direction_window)  # Sector per recent frame (None without detections)
+        self.sector_counts = Counter()  # Sector histogram over recent_sectors
+        self.recent_active = 0  # Frames with detections within recent_sectors
+        self.recent_counts = deque(maxlen=wave_window)  # Detection counts of the last frames
+        self.prediction_history = deque(maxlen=results_size)  # Last N predictions with results
+        self.correct_predictions = 0  # Correct results within prediction_history
+        
+    def add_detection(self, detection_data: Detection):
         """Add new detection to history for pattern analysis"""
-        self.detection_history.append({
-            'timestamp': datetime.utcnow(),
-            'detections': detection_data.get('detections', 0),
-            'bearing': detection_data.get('bearing', '000°'),
-            'range': detection_data.get('range', '0km'),
-            'altitude': detection_data.get('altitude', '0m'),
-            'targets': detection_data.get('targets', [])
+        # The engine clock is the one time base: tracks, candidates and validation all use it
+        self.tracker.update(detection_data, epoch_seconds(self.clock()))
+        self.last_detection = detection_data
+        self.last_detection_at = self.clock()
+        
+        self._record_detection({
+            'timestamp': self.clock(),
+            'detections': detection_data.detections,
+            'bearing': detection_data.bearing_deg,
+            'range': detection_data.range_m,
+            'altitude': detection_data.altitude_m,
+            'targets': detection_data.targets
         })
         
         # Validate existing predictions
-        self._validate_predictions(detection_data)
+        self._validate_predictions(detection_data, self.last_detection_at)
         
-        # Generate new predictions based on patterns
-        self._generate_predictions()
+        # Generate or refresh predictions, at most once per evaluation interval
+        now = self.clock()
+        if self.last_evaluation is None or (now - self.last_evaluation).total_seconds() >= self.evaluation_interval:
+            self.last_evaluation = now
+            self._generate_predictions()
         
-    def _validate_predictions(self, current_data: Dict[str, Any]):
-        """Check if any predictions came true or false"""
-        now = datetime.utcnow()
+    def _record_detection(self, entry: Dict[str, Any]):
+        """Append to the history windows, updating every aggregate for the entries added and evicted"""
+        history = self.detection_history
+        if len(history) == history.maxlen:
+            self.hour_counts[history[0]['timestamp'].hour] -= 1
+        history.append(entry)
+        self.hour_counts[entry['timestamp'].hour] += 1
         
-        for pred_id, prediction in list(self.predictions.items()):
-            # Check if prediction time has passed
-            if now >= prediction['expected_time']:
-                # Validate prediction
-                was_correct = self._check_prediction_accuracy(prediction, current_data)
-                
-                # Calculate spatial accuracy if prediction was TRUE
-                spatial_accuracy = 0
-                if was_correct and prediction['type'] == 'drone_from_direction':
-                    spatial_accuracy = self._calculate_spatial_accuracy(prediction, current_data)
-                
-                # Move to history with result
-                prediction['result'] = was_correct
-                prediction['validated_at'] = now
-                prediction['spatial_accuracy'] = spatial_accuracy
-                self.prediction_history.append(prediction)
-                
-                # Remove from active predictions
-                del self.predictions[pred_id]
-                
-                logger.info(f"Prediction {pred_id} validated: {'TRUE' if was_correct else 'FALSE'}")
+        if len(self.recent_sectors) == self.recent_sectors.maxlen:
+            evicted = self.recent_sectors[0]
+            if evicted is not None:
+                self.sector_counts[evicted] -= 1
+                self.recent_active -= 1
+                if not self.sector_counts[evicted]:
+                    del self.sector_counts[evicted]
+        sector = self._get_sector_from_bearing(entry['bearing']) if entry['detections'] > 0 else None
+        self.recent_sectors.append(sector)
+        if sector is not None:
+            self.sector_counts[sector] += 1
+            self.recent_active += 1
+            
+        self.recent_counts.append(entry['detections'])
+        
+    def _record_result(self, prediction: Dict[str, Any]):
+        """Append a validated prediction, keeping the correct count in step with evictions"""
+        if len(self.prediction_history) == self.prediction_history.maxlen and self.prediction_history[0].get('result', False):
+            self.correct_predictions -= 1
+        self.prediction_history.append(prediction)
+        if prediction.get('result', False):
+            self.correct_predictions += 1
+        if self.result_callback:
+            self.result_callback(prediction)
+        
+    def expire_predictions(self) -> Optional[float]:
+        """Validate every prediction that is due against the latest detection
+        
+        Called on a timer so predictions are validated on time even when no
+        frames arrive. The latest frame only counts as evidence if it is at
+        most evidence_max_age old and arrived after the prediction was made;
+        otherwise the prediction is scored against an empty sky. Returns the
+        seconds until the next prediction is due (None when nothing is pending).
+        """
+        now = self.clock()
+        evidence, observed_at = Detection(detections=0), None
+        if self.last_detection_at is not None and (now - self.last_detection_at).total_seconds() <= self.evidence_max_age:
+            evidence, observed_at = self.last_detection, self.last_detection_at
+        now = self._validate_predictions(evidence, observed_at)
+        due = self.next_expiry()
+        if due is None:
+            return None
+        return max(0.0, (due - now).total_seconds())
+        
+    def next_expiry(self) -> Optional[datetime]:
+        """Earliest expected_time over the active and shadow predictions"""
+        heads = [heap[0][0] for heap in [self.expiry_heap] + [lane.expiry_heap for lane in self.shadow_lanes] if heap]
+        return min(heads) if heads else None
+        
+    def _validate_predictions(self, current_data: Detection, observed_at: Optional[datetime]) -> datetime:
+        """Check if any predictions came true or false (pops only the due entries off the expiry heap)
+        
+        `current_data` is only evidence for predictions made before `observed_at`
+        (None = no frame: every due prediction is scored against an empty frame).
+        """
+        now = self.clock()
+        validated = 0
+        
+        while self.expiry_heap and self.expiry_heap[0][0] <= now:
+            expected_time, pred_id = heapq.heappop(self.expiry_heap)
+            prediction = self.predictions.get(pred_id)
+            if prediction is None or prediction['expected_time'] != expected_time:
+                continue  # Entry of a prediction that was already removed or rescheduled
                 
+            # Validate prediction
+            was_correct, spatial_accuracy = self._score_prediction(prediction, self._evidence_for(prediction, current_data, observed_at), self.rng)
+            
+            # Move to history with result
+            prediction['result'] = was_correct
+            prediction['validated_at'] = now
+            prediction['spatial_accuracy'] = spatial_accuracy
+            self._record_result(prediction)
+            
+            # Remove from active predictions
+            del self.predictions[pred_id]
+            self.prediction_keys.pop(prediction['key'], None)
+            validated += 1
+            
+            logger.info(f"Prediction {pred_id} validated: {'TRUE' if was_correct else 'FALSE'}")
+            
         # Update accuracy score
-        self._update_accuracy()
+        if validated:
+            self._update_accuracy()
+            
+        self._validate_shadows(current_data, observed_at, now)
+        return now
+        
+    @staticmethod
+    def _evidence_for(prediction: Dict[str, Any], current_data: Detection, observed_at: Optional[datetime]) -> Detection:
+        """The frame a prediction is scored against; never the frame it was made from or an older one"""
+        if observed_at is None or observed_at <= prediction['created_at']:
+            return Detection(detections=0)
+        return current_data
+        
+    def _validate_shadows(self, current_data: Detection, observed_at: Optional[datetime], now: datetime):
+        for lane in self.shadow_lanes:
+            heap = lane.expiry_heap
+            while heap and heap[0][0] <= now:
+                expected_time, _, key = heapq.heappop(heap)
+                prediction = lane.predictions.get(key)
+                if prediction is None or prediction['expected_time'] != expected_time:
+                    continue
+                del lane.predictions[key]
+                was_correct, spatial_accuracy = self._score_prediction(prediction, self._evidence_for(prediction, current_data, observed_at), lane.rng)
+                lane.record(was_correct, spatial_accuracy if prediction['type'] == 'drone_from_direction' and was_correct else None)
+                
+    def _score_prediction(self, prediction: Dict, current_data: Detection, rng: random.Random) -> tuple:
+        """(was correct, spatial accuracy 0-100 - only scored for correct direction predictions)"""
+        was_correct = self._check_prediction_accuracy(prediction, current_data, rng)
+        
+        # Calculate spatial accuracy if prediction was TRUE
+        spatial_accuracy = 0
+        if was_correct and prediction.get('track_id'):
+            spatial_accuracy = round(max(0, 100 - prediction['spatial_error_m'] / self.validation_radius_m * 100), 1)
+        elif was_correct and prediction['type'] == 'drone_from_direction':
+            spatial_accuracy = self._calculate_spatial_accuracy(prediction, current_data)
+        return was_correct, spatial_accuracy
                 
-    def _check_prediction_accuracy(self, prediction: Dict, actual_data: Dict) -> bool:
+    def _check_prediction_accuracy(self, prediction: Dict, actual_data: Detection, rng: random.Random) -> bool:
         """Check if prediction matches actual data"""
         pred_type = prediction['type']
         
+        if prediction.get('track_id'):
+            return self._check_track_prediction(prediction)
+        
         # Calculate difficulty factor based on how far ahead we predicted
         timeline_used = prediction.get('timeline_seconds', 30)
         
         # Add randomness based on difficulty (longer timeline = slightly more chance to be wrong)
         # At 5s: 2.5% failure, at 30s: 12.5% failure, at 60s: 27.5% failure, at 120s: 57.5% failure
-        import random
         random_failure_chance = (timeline_used - 5) / 200
-        if random.random() < random_failure_chance:
+        if rng.random() < random_failure_chance:
             logger.info(f"Prediction {prediction['id']} failed due to timeline difficulty ({timeline_used}s)")
             return False
         
         if pred_type == 'drone_from_direction':
-            predicted_bearing = prediction['bearing']
-            predicted_sector = self._get_sector_from_bearing(predicted_bearing)
+            predicted_sector = prediction['sector']
             
-            for target in actual_data.get('targets', []):
-                target_bearing = target.get('bearing', '000°')
-                target_sector = self._get_sector_from_bearing(target_bearing)
+            for target in actual_data.targets:
+                target_sector = self._get_sector_from_bearing(target.bearing_deg)
                 
                 if target_sector == predicted_sector:
                     return True
@@ -93,38 +330,53 @@ class PredictionEngine:
             
         elif pred_type == 'wave_incoming':
             expected_count = prediction.get('min_detections', 2)
-            actual_count = actual_data.get('detections', 0)
+            actual_count = actual_data.detections
             if actual_count >= expected_count:
                 return True
             return False
             
         elif pred_type == 'sector_activity':
             # Time-based predictions are less reliable, especially at long timelines
-            if random.random() < 0.3:  # 30% base failure rate
+            if rng.random() < 0.3:  # 30% base failure rate
                 return False
-            if actual_data.get('detections', 0) > 0:
+            if actual_data.detections > 0:
                 return True
             return False
             
         return False
         
-    def _calculate_spatial_accuracy(self, prediction: Dict, actual_data: Dict) -> float:
+    def _check_track_prediction(self, prediction: Dict) -> bool:
+        """A track prediction is correct when the track, updated since, is within the validation radius of the predicted point"""
+        expected = epoch_seconds(prediction['expected_time'])
+        state = self.tracker.track_state(prediction['track_id'], expected)
+        if state is None:
+            return False  # Track lost
+        position, updated_at = state
+        if updated_at <= epoch_seconds(prediction['created_at']):
+            return False  # Only coasted since the prediction was made
+            
+        theta = math.radians(prediction['predicted_bearing_deg'])
+        predicted_range = prediction['predicted_range_m']
+        error = math.hypot(position[0] - predicted_range * math.sin(theta), position[1] - predicted_range * math.cos(theta))
+        prediction['spatial_error_m'] = round(error, 1)
+        return error <= self.validation_radius_m
+        
+    def _calculate_spatial_accuracy(self, prediction: Dict, actual_data: Detection) -> float:
         """Calculate how close prediction was to actual location (0-100%)"""
         try:
             if prediction['type'] != 'drone_from_direction':
                 return 0
                 
-            predicted_bearing = float(prediction.get('bearing', '0').replace('°', ''))
-            predicted_sector = self._get_sector_from_bearing(str(int(predicted_bearing)) + '°')
+            predicted_sector = prediction.get('sector', 'N')
+            predicted_bearing = self._sector_to_bearing(predicted_sector)
             
             # Find actual drone in predicted sector
-            for target in actual_data.get('targets', []):
-                target_bearing_str = target.get('bearing', '000°')
-                target_sector = self._get_sector_from_bearing(target_bearing_str)
+            for target in actual_data.targets:
+                target_sector = self._get_sector_from_bearing(target.bearing_deg)
                 
                 if target_sector == predicted_sector:
                     # Calculate bearing accuracy
-                    actual_bearing = float(target_bearing_str.replace('°', ''))
+                    actual_bearing = target.bearing_deg
                     bearing_diff = abs(predicted_bearing - actual_bearing)
                     if bearing_diff > 180:
                         bearing_diff = 360 - bearing_diff
@@ -132,12 +384,10 @@ class PredictionEngine:
                     
                     # Calculate range accuracy (predicted 20km)
                     predicted_range = 20.0
-                    actual_range_str = target.get('range', '0km').replace('km', '')
-                    try:
-                        actual_range = float(actual_range_str)
-                        range_diff = abs(predicted_range - actual_range)
+                    if target.range_m is not None:
+                        range_diff = abs(predicted_range - target.range_m / 1000)
                         range_accuracy = max(0, 100 - (range_diff / 10 * 100))  # Within 10km = 100%
-                    except:
+                    else:
                         range_accuracy = 50
                     
                     # Combined accuracy (weighted: 70% bearing, 30% range)
@@ -150,50 +400,169 @@ class PredictionEngine:
             return 0
         
     def _generate_predictions(self):
-        """Generate predictions based on detected patterns"""
-        if len(self.detection_history) < 10:
-            return  # Need more data
-            
-        # Analyze patterns
-        patterns = self._analyze_patterns()
+        """Generate predictions based on detected patterns
         
-        for pattern in patterns:
-            # Create prediction
-            pred_id = f"D-{len(self.predictions) + len(self.prediction_history) + 1:03d}"
-            
-            prediction = {
-                'id': pred_id,
-                'type': pattern['type'],
-                'message': pattern['message'],
-                'confidence': pattern['confidence'],
-                'created_at': datetime.utcnow(),
-                'expected_time': datetime.utcnow() + timedelta(seconds=self.prediction_timeline),
-                'pattern_data': pattern,
-                'timeline_seconds': self.prediction_timeline  # Store timeline for difficulty calculation
-            }
+        A pattern that already has an active prediction under the same key
+        refreshes it in place, so the active set stays bounded by the number
+        of distinct keys instead of growing with every detection. Patterns are
+        computed once and reused by every shadow horizon.
+        """
+        candidates = self._track_candidates(epoch_seconds(self.clock()))
+        
+        shared = []
+        if len(self.detection_history) >= 10:
+            # Sector histograms only predict direction while no confirmed track is inbound
+            shared = self._analyze_patterns(directional=not candidates)
+        
+        patterns = self._track_patterns(candidates, self.prediction_timeline) + shared
+        self.refreshed_total += self._apply_patterns(patterns, self.prediction_keys, self.prediction_timeline, self._add_prediction)
+        
+        # Only track extrapolation depends on the horizon
+        for lane in self.shadow_lanes:
+            lane_patterns = self._track_patterns(candidates, lane.horizon) + shared
+            self._apply_patterns(lane_patterns, lane.predictions, lane.horizon, lane.add)
             
-            # Add pattern-specific data
-            if pattern['type'] == 'drone_from_direction':
-                prediction['bearing'] = pattern['bearing']
-                prediction['sector'] = pattern['sector']
-            elif pattern['type'] == 'wave_incoming':
+    def _apply_patterns(self, patterns: List[Dict[str, Any]], standing: Dict[tuple, Dict[str, Any]],
+                        timeline: int, add: Callable[[Dict[str, Any]], None]) -> int:
+        """Refresh the standing prediction of each pattern's key, create the missing ones; returns the refresh count"""
+        refreshed = 0
+        track_predictions = sum(1 for key in standing if key[0] == 'track')
+        for pattern in patterns:
+            key = self._prediction_key(pattern)
+            existing = standing.get(key)
+            if existing is not None:
+                self._refresh_prediction(existing, pattern)
+                refreshed += 1
+                continue
+            if pattern.get('track_id'):
+                if track_predictions >= self.max_track_predictions:
+                    continue
+                track_predictions += 1
+            add(self._new_prediction(pattern, key, timeline))
+        return refreshed
+        
+    def _new_prediction(self, pattern: Dict[str, Any], key: tuple, timeline: int) -> Dict[str, Any]:
+        created_at = self.clock()
+        prediction = {
+            'type': pattern['type'],
+            'message': pattern['message'],
+            'confidence': pattern['confidence'],
+            'created_at': created_at,
+            'expected_time': created_at + timedelta(seconds=timeline),
+            'pattern_data': pattern,
+            'timeline_seconds': timeline,  # Store timeline for difficulty calculation
+            'key': key,
+            'refresh_count': 0
+        }
+        
+        # Add pattern-specific data
+        if pattern['type'] == 'drone_from_direction':
+            prediction['bearing'] = pattern['bearing']
+            prediction['sector'] = pattern['sector']
+        elif pattern['type'] == 'wave_incoming':
+            prediction['min_detections'] = pattern['min_detections']
+        elif pattern['type'] == 'sector_activity':
+            prediction['sector'] = pattern['sector']
+        if pattern.get('track_id'):
+            for field in ('track_id', 'predicted_range_m', 'predicted_bearing_deg', 'eta_seconds', 'cpa_m'):
+                prediction[field] = pattern[field]
+        return prediction
+        
+    def _add_prediction(self, prediction: Dict[str, Any]):
+        """Register a new active prediction"""
+        self.prediction_counter += 1
+        pred_id = f"D-{self.prediction_counter:03d}"
+        prediction = {'id': pred_id, **prediction}
+        
+        # Coordinates never change once predicted
+        prediction['predicted_lat'], prediction['predicted_lon'] = self._get_prediction_coordinates(prediction)
+        
+        self.predictions[pred_id] = prediction
+        self.prediction_keys[prediction['key']] = prediction
+        heapq.heappush(self.expiry_heap, (prediction['expected_time'], pred_id))
+        logger.info(f"Generated prediction {pred_id}: {prediction['message']}")
+        
+    def _prediction_key(self, pattern: Dict[str, Any]) -> tuple:
+        """Identity of a prediction: one per track, otherwise one per (type, sector)"""
+        if pattern.get('track_id'):
+            return ('track', pattern['track_id'])
+        return (pattern['type'], pattern.get('sector'))
+        
+    def _refresh_prediction(self, prediction: Dict[str, Any], pattern: Dict[str, Any]):
+        """Update a standing prediction from the pattern seen again
+        
+        The expiry (and, for tracks, the predicted point) is kept so the
+        prediction is still validated against what it originally claimed.
+        """
+        prediction['confidence'] = pattern['confidence']
+        prediction['refreshed_at'] = self.clock()
+        prediction['refresh_count'] += 1
+        if pattern.get('track_id'):
+            prediction['eta_seconds'] = pattern['eta_seconds']
+            prediction['cpa_m'] = pattern['cpa_m']
+        else:
+            prediction['message'] = pattern['message']
+            prediction['pattern_data'] = pattern
+            if 'min_detections' in pattern:
                 prediction['min_detections'] = pattern['min_detections']
-            elif pattern['type'] == 'sector_activity':
-                prediction['sector'] = pattern['sector']
-            
-            self.predictions[pred_id] = prediction
-            logger.info(f"Generated prediction {pred_id}: {pattern['message']}")
+                
+    def _track_candidates(self, now: float) -> List[Dict[str, Any]]:
+        """Confirmed inbound tracks with the soonest ETA, with everything that does not depend on the horizon"""
+        if not len(self.tracker):
+            return []
+        geometry = self.tracker.threat_geometry(now)
+        inbound = self.tracker.confirmed() & (geometry['closing_ms'] > 0)
+        rows = sorted(inbound.nonzero()[0].tolist(), key=lambda i: geometry['eta_s'][i])[:self.max_track_predictions]
+        if not rows:
+            return []
             
-    def _analyze_patterns(self) -> List[Dict[str, Any]]:
+        position = self.tracker.extrapolate(0.0, now)[rows].tolist()
+        velocity = self.tracker.state[rows, 2:].tolist()
+        candidates = []
+        for row, (x, y), (vx, vy) in zip(rows, position, velocity):
+            track_id = self.tracker.ids[row]
+            candidates.append({
+                'track_id': track_id,
+                'name': self.tracker.labels[row] or track_id,
+                'position': (x, y),
+                'velocity': (vx, vy),
+                'eta_seconds': round(float(geometry['eta_s'][row])),
+                'cpa_m': round(float(geometry['cpa_m'][row])),
+                'confidence': min(95, 60 + 5 * int(self.tracker.hits[row]))
+            })
+        return candidates
+        
+    def _track_patterns(self, candidates: List[Dict[str, Any]], horizon: int) -> List[Dict[str, Any]]:
+        """Extrapolate the candidate tracks over one horizon"""
+        patterns = []
+        for candidate in candidates:
+            (x, y), (vx, vy) = candidate['position'], candidate['velocity']
+            x += vx * horizon
+            y += vy * horizon
+            predicted_range = math.hypot(x, y)
+            predicted_bearing = math.degrees(math.atan2(x, y)) % 360
+            sector = self._get_sector_from_bearing(predicted_bearing)
+            patterns.append({
+                'type': 'drone_from_direction',
+                'track_id': candidate['track_id'],
+                'sector': sector,
+                'bearing': format_bearing(predicted_bearing),
+                'predicted_range_m': predicted_range,
+                'predicted_bearing_deg': predicted_bearing,
+                'eta_seconds': candidate['eta_seconds'],
+                'cpa_m': candidate['cpa_m'],
+                'message': f"{candidate['name']} expected at {format_range(predicted_range)} {sector}, ETA {candidate['eta_seconds']}s",
+                'confidence': candidate['confidence']
+            })
+        return patterns
+        
+    def _analyze_patterns(self, directional: bool = True) -> List[Dict[str, Any]]:
         """Analyze detection history for patterns"""
         patterns = []
         
         # Pattern 1: Directional tendency
-        recent_bearings = [d.get('bearing', '000°') for d in list(self.detection_history)[-10:] if d.get('detections', 0) > 0]
-        if len(recent_bearings) >= 5:
-            sectors = [self._get_sector_from_bearing(b) for b in recent_bearings]
-            sector_counts = Counter(sectors)
-            most_common_sector, count = sector_counts.most_common(1)[0]
+        if directional and self.recent_active >= 5:
+            most_common_sector, count = self.sector_counts.most_common(1)[0]
             
             if count >= 3:  # 3+ detections from same sector
                 patterns.append({
@@ -201,11 +570,11 @@ class PredictionEngine:
                     'sector': most_common_sector,
                     'bearing': self._get_bearing_from_sector(most_common_sector),
                     'message': f'Incoming drone expected from {most_common_sector}',
-                    'confidence': min(95, (count / len(sectors)) * 150)  # More generous for testing
+                    'confidence': min(95, (count / self.recent_active) * 150)  # More generous for testing
                 })
         
         # Pattern 2: Wave pattern (multiple detections)
-        recent_counts = [d.get('detections', 0) for d in list(self.detection_history)[-5:]]
+        recent_counts = self.recent_counts
         if len(recent_counts) >= 3:
             # Check if counts are increasing
             if recent_counts[-1] > recent_counts[-2] and recent_counts[-2] > recent_counts[-3]:
@@ -217,12 +586,11 @@ class PredictionEngine:
                 })
         
         # Pattern 3: Time-based pattern
-        now = datetime.utcnow()
+        now = self.clock()
         hour = now.hour
         
         # Check if current hour has high activity historically
-        hour_detections = [d for d in self.detection_history if d['timestamp'].hour == hour]
-        if len(hour_detections) > len(self.detection_history) * 0.3:  # 30% of detections in this hour
+        if self.hour_counts[hour] > len(self.detection_history) * 0.3:  # 30% of detections in this hour
             patterns.append({
                 'type': 'sector_activity',
                 'sector': 'MULTIPLE',
@@ -233,15 +601,13 @@ class PredictionEngine:
         # Limit to 3 predictions at a time
         return patterns[:3]
         
-    def _get_sector_from_bearing(self, bearing_str: str) -> str:
-        """Convert bearing to sector name"""
-        try:
-            bearing = int(bearing_str.replace('°', ''))
-            sectors = ['N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW']
-            index = int((bearing + 22.5) / 45) % 8
-            return sectors[index]
-        except:
+    def _get_sector_from_bearing(self, bearing: Optional[float]) -> str:
+        """Convert bearing (degrees) to sector name"""
+        if bearing is None:
             return 'UNKNOWN'
+        sectors = ['N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW']
+        index = int((bearing + 22.5) / 45) % 8
+        return sectors[index]
             
     def _get_bearing_from_sector(self, sector: str) -> str:
         """Convert sector to approximate bearing"""
@@ -257,8 +623,7 @@ class PredictionEngine:
             self.accuracy_score = 0.0
             return
             
-        correct = sum(1 for p in self.prediction_history if p.get('result', False))
-        self.accuracy_score = (correct / len(self.prediction_history)) * 100
+        self.accuracy_score = (self.correct_predictions / len(self.prediction_history)) * 100
         
         logger.info(f"Prediction accuracy: {self.accuracy_score:.1f}%")
         
@@ -269,16 +634,13 @@ class PredictionEngine:
         
     def get_active_predictions(self) -> List[Dict[str, Any]]:
         """Get all active predictions with spatial coordinates"""
-        now = datetime.utcnow()
+        now = self.clock()
         predictions_with_coords = []
         
         for pred_id, pred in self.predictions.items():
             seconds_remaining = int((pred['expected_time'] - now).total_seconds())
             
-            # Calculate predicted coordinates
-            predicted_lat, predicted_lon = self._get_prediction_coordinates(pred)
-            
-            predictions_with_coords.append({
+            summary = {
                 'id': pred_id,
                 'message': pred['message'],
                 'confidence': pred['confidence'],
@@ -286,55 +648,37 @@ class PredictionEngine:
                 'type': pred['type'],
                 'sector': pred.get('sector', 'N'),
                 'bearing': pred.get('bearing', '000°'),
-                'predicted_lat': predicted_lat,
-                'predicted_lon': predicted_lon,
-                'predicted_range_km': 20.0,  # Default prediction range
+                'predicted_lat': pred['predicted_lat'],
+                'predicted_lon': pred['predicted_lon'],
+                'predicted_range_km': round(pred['predicted_range_m'] / 1000, 2) if 'predicted_range_m' in pred else 20.0,  # Default prediction range
                 'show_on_radar': pred['confidence'] >= 80,  # Only show if confidence > 80%
                 'show_countdown': seconds_remaining <= 10 and pred['confidence'] >= 80  # Countdown only if ≤10s and >80%
-            })
+            }
+            if pred.get('track_id'):
+                summary['track_id'] = pred['track_id']
+                summary['eta_seconds'] = pred['eta_seconds']
+                summary['cpa_km'] = round(pred['cpa_m'] / 1000, 2)
+            predictions_with_coords.append(summary)
         
         return predictions_with_coords
         
     def _get_prediction_coordinates(self, prediction: Dict) -> tuple:
         """Calculate predicted GPS coordinates"""
-        # Base location (Cluj-Napoca)
-        base_lat = 46.7712
-        base_lon = 23.6236
-        
         if prediction['type'] == 'drone_from_direction':
-            sector = prediction.get('sector', 'N')
-            bearing = self._sector_to_bearing(sector)
-            predicted_range_km = 20.0  # Typical detection range
+            if 'predicted_range_m' in prediction:
+                return base_frame.position(prediction['predicted_range_m'], prediction['predicted_bearing_deg'])
+            return base_frame.sector_centre(prediction.get('sector', 'N'))
             
-            # Calculate position using bearing and range
-            import math
-            R = 6371.0  # Earth radius in km
-            lat1 = math.radians(base_lat)
-            lon1 = math.radians(base_lon)
-            brng = math.radians(bearing)
-            
-            lat2 = math.asin(
-                math.sin(lat1) * math.cos(predicted_range_km / R) +
-                math.cos(lat1) * math.sin(predicted_range_km / R) * math.cos(brng)
-            )
-            
-            lon2 = lon1 + math.atan2(
-                math.sin(brng) * math.sin(predicted_range_km / R) * math.cos(lat1),
-                math.cos(predicted_range_km / R) - math.sin(lat1) * math.sin(lat2)
-            )
-            
-            return math.degrees(lat2), math.degrees(lon2)
-        
         # Default return base location
-        return base_lat, base_lon
+        return base_frame.lat, base_frame.lon
         
     def _sector_to_bearing(self, sector: str) -> float:
         """Convert sector to bearing degrees"""
-        sector_map = {
-            'N': 0, 'NE': 45, 'E': 90, 'SE': 135,
-            'S': 180, 'SW': 225, 'W': 270, 'NW': 315
-        }
-        return sector_map.get(sector, 0)
+        return SECTOR_BEARINGS.get(sector, 0)
+        
+    def get_tracks(self) -> List[Dict[str, Any]]:
+        """Confirmed tracks with ETA and closest point of approach to the base"""
+        return self.tracker.get_tracks(epoch_seconds(self.clock()))
         
     def get_recent_results(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent prediction results with accuracy details"""
@@ -348,7 +692,7 @@ class PredictionEngine:
                 'spatial_accuracy': pred.get('spatial_accuracy', 0),  # 0-100% match
                 'show_validation': pred['result'] == True  # Show green checkmark
             }
-            for pred in list(self.prediction_history)[:limit]
+            for pred in islice(self.prediction_history, limit)
         ]
         
     def get_stats(self) -> Dict[str, Any]:
@@ -361,10 +705,13 @@ class PredictionEngine:
                 'correct_predictions': 0,
                 'false_predictions': 0,
                 'active_predictions': len(self.predictions),
-                'timeline_seconds': self.prediction_timeline
+                'refreshed_predictions': self.refreshed_total,
+                'timeline_seconds': self.prediction_timeline,
+                'tracking': self.tracker.get_stats(),
+                **self.get_horizon_stats()
             }
             
-        correct = sum(1 for p in self.prediction_history if p.get('result', False))
+        correct = self.correct_predictions
         
         return {
             'accuracy': self.accuracy_score,
@@ -372,12 +719,31 @@ class PredictionEngine:
             'correct_predictions': correct,
             'false_predictions': total - correct,
             'active_predictions': len(self.predictions),
+            'refreshed_predictions': self.refreshed_total,
             'timeline_seconds': self.prediction_timeline,
-            'recommended_timeline': self._recommend_timeline()
+            'recommended_timeline': self._recommend_timeline(),
+            'tracking': self.tracker.get_stats(),
+            **self.get_horizon_stats()
+        }
+        
+    def get_horizon_stats(self) -> Dict[str, Any]:
+        """Accuracy per shadow horizon and the longest one meeting the target accuracy"""
+        horizons = [lane.get_stats() for lane in self.shadow_lanes]
+        qualified = [
+            h['horizon_seconds'] for h in horizons
+            if h['samples'] >= self.shadow_min_samples and h['accuracy'] >= self.target_accuracy
+        ]
+        return {
+            'horizons': horizons,
+            'target_accuracy': self.target_accuracy,
+            'best_horizon': max(qualified) if qualified else None
         }
         
     def _recommend_timeline(self) -> int:
         """Recommend optimal timeline based on accuracy"""
+        best_horizon = self.get_horizon_stats()['best_horizon']
+        if best_horizon is not None:
+            return max(5, min(120, best_horizon))  # Measured by the shadow horizons
         if self.accuracy_score >= 85:
             return min(120, self.prediction_timeline + 10)  # Increase by 10s
         elif self.accuracy_score < 60:
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Optional
+from locrypt_client import DarcyClient, PublishRejected
+
+logger = logging.getLogger(__name__)
+
+class QueueDrainer:
+    """Background task that replays the outbound spool to Darcy
+    
+    Sends several requests in parallel and adapts how many are in flight to
+    the observed latency and error rate (additive increase, multiplicative
+    decrease). Live publishes go first: the drainer only uses concurrency
+    slots that live traffic is not using. Items Darcy refuses outright
+    (non-retryable 4xx) are dropped from the spool so they cannot block the
+    backlog, and do not count as failures for the rate adaptation.
+    """
+    
+    def __init__(self, client: DarcyClient, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.client = client
+        self.min_concurrency = config.get('min_concurrency', 1)
+        self.max_concurrency = config.get('max_concurrency', 8)
+        self.target_latency_ms = config.get('target_latency_ms', 500)
+        self.idle_interval = config.get('idle_interval', 1.0)
+        self.max_backoff = config.get('max_backoff', 30.0)
+        self.items_per_request = client.replay_batch_size if client.batch_enabled else 1
+        
+        self.concurrency = self.min_concurrency
+        self.backoff = 0.0
+        self.task: Optional[asyncio.Task] = None
+        self.stats = {
+            'rounds': 0,
+            'sent': 0,
+            'failed_requests': 0,
+            'rejected': 0,
+            'restarts': 0,
+            'last_round_ms': None
+        }
+        
+    def start(self):
+        if self.task and not self.task.done():
+            return
+        self.task = asyncio.create_task(self._supervise())
+        logger.info("Queue drainer started")
+        
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+            logger.info("Queue drainer stopped")
+            
+    async def _supervise(self):
+        """Restart the drain loop if it fails"""
+        while True:
+            try:
+                await self._drain_loop()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats['restarts'] += 1
+                logger.error(f"Queue drainer failed, restarting: {e}")
+                self.client.is_publishing = False
+                await asyncio.sleep(5)
+                
+    async def _drain_loop(self):
+        spool = self.client.spool
+        circuit = self.client.circuit
+        while True:
+            if not len(spool) or self.client.is_publishing:
+                await asyncio.sleep(self.idle_interval)
+                continue
+                
+            if circuit.is_open:
+                circuit.poll()  # Keep health probes going while there is no live traffic
+                await asyncio.sleep(self.idle_interval)
+                continue
+                
+            if self.backoff:
+                await asyncio.sleep(self.backoff)
+                
+            # Live traffic first: only use slots it leaves free
+            slots = self.concurrency - self.client.live_inflight
+            if slots <= 0:
+                await asyncio.sleep(0.05)
+                continue
+                
+            self.client.is_publishing = True
+            try:
+                await self._drain_round(slots)
+            finally:
+                self.client.is_publishing = False
+                
+    async def _drain_round(self, slots: int):
+        spool = self.client.spool
+        entries = spool.peek(slots * self.items_per_request)
+        if not entries:
+            return
+            
+        chunks = [
+            entries[i:i + self.items_per_request]
+            for i in range(0, len(entries), self.items_per_request)
+        ]
+        
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(self.client.send_queued([data for _, data in chunk]) for chunk in chunks),
+            return_exceptions=True
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        acked = []
+        rejected = []
+        failures = 0
+        for chunk, result in zip(chunks, results):
+            if result is True:
+                acked.extend(item_id for item_id, _ in chunk)
+            elif isinstance(result, PublishRejected):
+                # The backend answered: it is up, the payload is bad. Retrying would block the backlog forever
+                rejected.extend(item_id for item_id, _ in chunk)
+                logger.error(f"Darcy rejected queued items {chunk[0][0]}..{chunk[-1][0]} ({result}), dropping them")
+            else:
+                failures += 1
+        spool.ack(acked + rejected)
+        
+        self.stats['rounds'] += 1
+        self.stats['sent'] += len(acked)
+        self.stats['rejected'] += len(rejected)
+        self.stats['failed_requests'] += failures
+        self.stats['last_round_ms'] = round(elapsed_ms, 1)
+        self._adapt(failures, len(chunks), elapsed_ms)
+        
+    def _adapt(self, failures: int, requests: int, elapsed_ms: float):
+        """AIMD: grow by one slot on a clean fast round, halve on errors or slow rounds
+        
+        `failures` are transport errors and 5xx only; rejected payloads do not count.
+        """
+        if failures == requests:
+            # Nothing got through, the uplink is probably down: back off exponentially
+            self.concurrency = self.min_concurrency
+            self.backoff = min(self.max_backoff, max(1.0, self.backoff * 2))
+        elif failures or elapsed_ms > self.target_latency_ms:
+            self.concurrency = max(self.min_concurrency, self.concurrency // 2)
+            self.backoff = 0.0
+        else:
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+            self.backoff = 0.0
+            
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'running': bool(self.task and not self.task.done()),
+            'concurrency': self.concurrency,
+            'backoff_seconds': self.backoff,
+            **self.stats
+        }
@@ -1,23 +1,43 @@
 import asyncio
 import serial
-import socket
+import glob
 import json
 import logging
-from typing import Optional, Dict, Any, Callable
+import os
+import threading
+from typing import Optional, Dict, Any, Callable, List
 from abc import ABC, abstractmethod
+from collections import deque
 from datetime import datetime
 import pynmea2
+from capture_file import CaptureIndex, open_capture, seek_capture, parse_line, is_frame_line
+from file_watch import DirectoryWatcher
+from geodesy import base_frame
+from swarm_simulator import SwarmSimulator
 
 logger = logging.getLogger(__name__)
 
 class RadarConnector(ABC):
     """Base class for all radar connectors"""
     
+    # Delay between reads; connectors whose read_data awaits incoming data set this to 0
+    poll_interval = 0.1
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
+        self.name = config.get('name', self.__class__.__name__)
         self.is_connected = False
         self.is_monitoring = False
         self.on_data_callback: Optional[Callable] = None
+        self.frame_limit: Optional[int] = None  # Detections per frame the processor accepts (set by the gateway)
+        self.stats = {
+            'frames_total': 0,
+            'errors_total': 0,
+            'connect_attempts': 0,
+            'reconnects': 0,
+            'last_frame': None,
+            'last_error': None
+        }
         
     @abstractmethod
     async def connect(self) -> bool:
@@ -34,6 +54,11 @@ class RadarConnector(ABC):
         """Read data from radar"""
         pass
         
+    async def read_batch(self) -> List[Dict[str, Any]]:
+        """Read every frame that is ready (default: a single read_data call)"""
+        data = await self.read_data()
+        return [data] if data else []
+        
     def set_data_callback(self, callback: Callable):
         """Set callback function for data reception"""
         self.on_data_callback = callback
@@ -46,18 +71,28 @@ class RadarConnector(ABC):
         while self.is_monitoring:
             try:
                 if not self.is_connected:
-                    await self.connect()
-                    await asyncio.sleep(5)
-                    continue
+                    self.stats['connect_attempts'] += 1
+                    if not await self.connect():
+                        await asyncio.sleep(5)
+                        continue
+                    if self.stats['connect_attempts'] > 1:
+                        self.stats['reconnects'] += 1
                     
-                data = await self.read_data()
-                if data and self.on_data_callback:
-                    await self.on_data_callback(data)
+                batch = await self.read_batch()
+                if batch:
+                    self.stats['frames_total'] += len(batch)
+                    self.stats['last_frame'] = datetime.utcnow().isoformat()
+                if self.on_data_callback:
+                    for data in batch:
+                        await self.on_data_callback(data)
                     
-                await asyncio.sleep(0.1)  # Small delay to prevent CPU overload
+                if self.poll_interval:
+                    await asyncio.sleep(self.poll_interval)  # Small delay to prevent CPU overload
                 
             except Exception as e:
-                logger.error(f"Error in monitoring loop: {e}")
+                logger.error(f"Error in monitoring loop ({self.name}): {e}")
+                self.stats['errors_total'] += 1
+                self.stats['last_error'] = str(e)
                 self.is_connected = False
                 await asyncio.sleep(10)  # Wait before retry
                 
@@ -66,62 +101,360 @@ class RadarConnector(ABC):
         self.is_monitoring = False
         await self.disconnect()
         logger.info(f"Stopped monitoring {self.__class__.__name__}")
+        
+    def get_status(self) -> str:
+        """Connection state as shown in the gateway status"""
+        if self.is_monitoring:
+            return "monitoring"
+        if self.is_connected:
+            return "connected"
+        return "disconnected"
+        
+    def get_source_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-source statistics keyed by source name"""
+        return {self.name: {'status': self.get_status(), **self.stats}}
 
 
-class SerialRadarConnector(RadarConnector):
-    """Serial port radar connector (RS-232/485)"""
+class FrameDecoder:
+    """Split a byte stream into whole frames (newline, delimiter or length-prefix)"""
+    
+    def __init__(self, framing: str = 'newline', delimiter: bytes = b'\n',
+                 length_bytes: int = 2, byteorder: str = 'big', max_frame_size: int = 65536):
+        if framing not in ('newline', 'delimiter', 'length_prefix'):
+            raise ValueError(f"Unknown framing: {framing}")
+        if framing == 'length_prefix' and length_bytes not in (1, 2, 4):
+            raise ValueError(f"Unsupported length prefix size: {length_bytes}")
+            
+        self.framing = framing
+        self.delimiter = b'\n' if framing == 'newline' else delimiter
+        if not self.delimiter:
+            raise ValueError("Delimiter framing needs a non-empty delimiter")
+        self.length_bytes = length_bytes
+        self.byteorder = byteorder
+        self.max_frame_size = max_frame_size
+        self.buffer = bytearray()
+        self.dropped_bytes = 0
+        
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'FrameDecoder':
+        """Build a decoder from a connector config section"""
+        delimiter = config.get('delimiter', '\n')
+        if isinstance(delimiter, str):
+            delimiter = delimiter.encode('utf-8').decode('unicode_escape').encode('latin-1')
+        return cls(
+            framing=config.get('framing', 'newline'),
+            delimiter=delimiter,
+            length_bytes=config.get('length_bytes', 2),
+            byteorder=config.get('byteorder', 'big'),
+            max_frame_size=config.get('max_frame_size', 65536)
+        )
+        
+    def feed(self, data) -> List[bytes]:
+        """Append received bytes and return every complete frame"""
+        self.buffer += data
+        if self.framing == 'length_prefix':
+            return self._split_length_prefixed()
+        return self._split_delimited()
+        
+    def _split_delimited(self) -> List[bytes]:
+        frames = []
+        buf = self.buffer
+        delim = self.delimiter
+        start = 0
+        
+        while True:
+            end = buf.find(delim, start)
+            if end < 0:
+                break
+            frame = bytes(buf[start:end])
+            start = end + len(delim)
+            if self.framing == 'newline':
+                frame = frame.rstrip(b'\r')
+            if frame:
+                frames.append(frame)
+                
+        if start:
+            del buf[:start]
+            
+        # A peer that never sends the delimiter must not grow the buffer forever
+        if len(buf) > self.max_frame_size:
+            logger.warning(f"Discarding {len(buf)} bytes without a frame delimiter")
+            self.dropped_bytes += len(buf)
+            buf.clear()
+            
+        return frames
+        
+    def _split_length_prefixed(self) -> List[bytes]:
+        frames = []
+        buf = self.buffer
+        header = self.length_bytes
+        start = 0
+        
+        while len(buf) - start >= header:
+            size = int.from_bytes(buf[start:start + header], self.byteorder)
+            if size > self.max_frame_size:
+                # Stream is out of sync; there is no way to find the next header
+                logger.warning(f"Length prefix {size} exceeds max frame size, resetting stream buffer")
+                self.dropped_bytes += len(buf) - start
+                buf.clear()
+                return frames
+            if len(buf) - start - header < size:
+                break
+            frame = bytes(buf[start + header:start + header + size])
+            start += header + size
+            if frame:
+                frames.append(frame)
+                
+        if start:
+            del buf[:start]
+            
+        return frames
+        
+    def reset(self):
+        """Drop any partial frame"""
+        self.buffer.clear()
+
+
+class StreamRadarConnector(RadarConnector):
+    """Base for connectors that decode a byte stream into frames as data arrives"""
+    
+    poll_interval = 0  # read_data waits for frames, no polling delay needed
+    source_name = 'stream'
+    
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.decoder = FrameDecoder.from_config(config)
+        self.max_pending_frames = config.get('max_pending_frames', 10000)
+        self.max_batch_size = config.get('max_batch_size', 500)
+        self.pending_frames: deque = deque()
+        self.frames_available = asyncio.Event()
+        self.dropped_frames = 0
+        
+    def _reset_frames(self):
+        # Drop a partial frame from the previous connection but keep whole frames
+        # that were received before it closed
+        self.decoder.reset()
+        self.frames_available = asyncio.Event()
+        if self.pending_frames:
+            self.frames_available.set()
+        
+    def _push_frames(self, frames: List[bytes]):
+        """Queue frames decoded from one receive (always runs on the event loop)"""
+        self.pending_frames.extend(frames)
+        self.frames_available.set()
+        if len(self.pending_frames) >= self.max_pending_frames:
+            self._pause_input()
+            
+    def _pause_input(self):
+        """Called when the pending queue is full; default is to drop the oldest frames"""
+        overflow = len(self.pending_frames) - self.max_pending_frames
+        for _ in range(overflow):
+            self.pending_frames.popleft()
+        if overflow > 0:
+            self.dropped_frames += overflow
+            logger.warning(f"{self.source_name} frame queue full, dropped {overflow} frames")
+            
+    def _resume_input(self):
+        """Called once the pending queue has drained below half"""
+        pass
+        
+    def _make_frame(self, frame: bytes) -> Dict[str, Any]:
+        return {
+            'raw_data': frame.decode('utf-8', errors='ignore').strip(),
+            'source': self.source_name,
+            'timestamp': datetime.utcnow().isoformat()
+        }
+        
+    async def _wait_for_frames(self) -> bool:
+        if self.pending_frames:
+            return True
+        if not self.is_connected:
+            return False
+        self.frames_available.clear()
+        timeout = self.config.get('timeout', 5)
+        try:
+            await asyncio.wait_for(self.frames_available.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False  # Normal timeout, no data available
+        return bool(self.pending_frames)
+        
+    def _pop_frame(self) -> Dict[str, Any]:
+        frame = self.pending_frames.popleft()
+        if len(self.pending_frames) < self.max_pending_frames // 2:
+            self._resume_input()
+        return self._make_frame(frame)
+        
+    async def read_data(self) -> Optional[Dict[str, Any]]:
+        if not await self._wait_for_frames():
+            return None
+        return self._pop_frame()
+        
+    async def read_batch(self) -> List[Dict[str, Any]]:
+        """Wait for data, then drain the whole burst that has arrived"""
+        if not await self._wait_for_frames():
+            return []
+        count = min(len(self.pending_frames), self.max_batch_size)
+        return [self._pop_frame() for _ in range(count)]
+
+
+class SerialRadarConnector(StreamRadarConnector):
+    """Serial port radar connector (RS-232/485)
+    
+    A dedicated reader thread blocks on the port and pushes complete lines
+    into the event loop as they arrive, so there is no polling delay.
+    """
+    
+    source_name = 'serial'
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.serial_connection: Optional[serial.Serial] = None
+        self.reader_thread: Optional[threading.Thread] = None
+        self.reader_stop = threading.Event()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
         
     async def connect(self) -> bool:
+        # A reconnect must not open the device again over the previous handle
+        await self._stop_reader()
+        self._close_port()
         try:
             port = self.config.get('port', '/dev/ttyUSB0')
             baudrate = self.config.get('baudrate', 9600)
-            timeout = self.config.get('timeout', 1)
             
             self.serial_connection = serial.Serial(
                 port=port,
                 baudrate=baudrate,
-                timeout=timeout
+                bytesize=self.config.get('bytesize', serial.EIGHTBITS),
+                parity=self.config.get('parity', serial.PARITY_NONE),
+                stopbits=self.config.get('stopbits', serial.STOPBITS_ONE),
+                # Short read timeout only bounds how quickly the reader thread notices a stop
+                timeout=self.config.get('read_timeout', 0.2)
+            )
+            if self.config.get('rs485', False):
+                from serial.rs485 import RS485Settings
+                self.serial_connection.rs485_mode = RS485Settings(
+                    rts_level_for_tx=self.config.get('rts_level_for_tx', True),
+                    rts_level_for_rx=self.config.get('rts_level_for_rx', False)
+                )
+                
+            self._reset_frames()
+            self.loop = asyncio.get_running_loop()
+            self.reader_stop.clear()
+            self.reader_thread = threading.Thread(
+                target=self._reader_loop, name=f"serial-reader-{port}", daemon=True
             )
+            self.reader_thread.start()
+            
             self.is_connected = True
-            logger.info(f"Connected to serial port {port} at {baudrate} baud")
+            mode = 'RS-485' if self.config.get('rs485', False) else 'RS-232'
+            logger.info(f"Connected to serial port {port} at {baudrate} baud ({mode})")
             return True
         except Exception as e:
             logger.error(f"Failed to connect to serial port: {e}")
+            self._close_port()
             self.is_connected = False
             return False
             
+    def _reader_loop(self):
+        """Reader thread: block on the port and hand whole frames to the loop"""
+        ser = self.serial_connection
+        while not self.reader_stop.is_set():
+            try:
+                # Wait for the first byte, then take everything already buffered
+                chunk = ser.read(max(1, ser.in_waiting))
+            except Exception as e:
+                if not self.reader_stop.is_set():
+                    self.loop.call_soon_threadsafe(self._on_reader_error, e)
+                return
+            if chunk:
+                frames = self.decoder.feed(chunk)
+                if frames:
+                    self.loop.call_soon_threadsafe(self._push_frames, frames)
+                    
+    def _on_reader_error(self, error: Exception):
+        logger.error(f"Error reading serial data: {error}")
+        self._close_port()  # The reader thread has exited; free the device for the reconnect
+        self.is_connected = False
+        self.frames_available.set()
+        
+    async def _stop_reader(self):
+        self.reader_stop.set()
+        if self.reader_thread and self.reader_thread.is_alive():
+            await asyncio.get_running_loop().run_in_executor(None, self.reader_thread.join, 2)
+        self.reader_thread = None
+        
+    def _close_port(self) -> bool:
+        """Close the port if it is open; True if it was"""
+        port, self.serial_connection = self.serial_connection, None
+        if port is None or not port.is_open:
+            return False
+        try:
+            port.close()
+        except Exception as e:
+            logger.warning(f"Error closing serial port: {e}")
+        return True
+            
     async def disconnect(self):
-        if self.serial_connection and self.serial_connection.is_open:
-            self.serial_connection.close()
-            self.is_connected = False
+        await self._stop_reader()
+        if self._close_port():
             logger.info("Serial port disconnected")
+        self.is_connected = False
+        self.frames_available.set()  # Wake up a pending read_data
+
+
+class _TCPFrameProtocol(asyncio.BufferedProtocol):
+    """Receives into a preallocated buffer and hands complete frames to the connector"""
+    
+    def __init__(self, connector: 'TCPRadarConnector'):
+        self.connector = connector
+        self.recv_buffer = bytearray(connector.read_size)
+        self.recv_view = memoryview(self.recv_buffer)
+        self.transport: Optional[asyncio.Transport] = None
+        self.paused = False
+        
+    def connection_made(self, transport):
+        self.transport = transport
+        
+    def get_buffer(self, sizehint: int):
+        return self.recv_view
+        
+    def buffer_updated(self, nbytes: int):
+        frames = self.connector.decoder.feed(self.recv_view[:nbytes])
+        if frames:
+            self.connector._push_frames(frames)
             
-    async def read_data(self) -> Optional[Dict[str, Any]]:
-        if not self.serial_connection or not self.serial_connection.is_open:
-            return None
-            
-        try:
-            if self.serial_connection.in_waiting > 0:
-                line = self.serial_connection.readline().decode('utf-8', errors='ignore').strip()
-                if line:
-                    return {'raw_data': line, 'source': 'serial', 'timestamp': datetime.utcnow().isoformat()}
-        except Exception as e:
-            logger.error(f"Error reading serial data: {e}")
-            self.is_connected = False
+    def eof_received(self):
+        return False  # Let the transport close itself
+        
+    def connection_lost(self, exc: Optional[Exception]):
+        if exc:
+            logger.error(f"TCP radar connection lost: {exc}")
+        else:
+            logger.info("TCP radar closed the connection")
+        self.transport = None
+        self.connector._on_connection_lost()
+        
+    def pause(self):
+        if self.transport and not self.paused:
+            self.transport.pause_reading()
+            self.paused = True
             
-        return None
+    def resume(self):
+        if self.transport and self.paused:
+            self.transport.resume_reading()
+            self.paused = False
 
 
-class TCPRadarConnector(RadarConnector):
-    """TCP/IP socket radar connector"""
+class TCPRadarConnector(StreamRadarConnector):
+    """TCP/IP socket radar connector (asyncio transport with message framing)"""
+    
+    source_name = 'tcp'
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.socket: Optional[socket.socket] = None
+        self.read_size = config.get('read_size', 65536)
+        self.protocol: Optional[_TCPFrameProtocol] = None
+        self.transport: Optional[asyncio.Transport] = None
         
     async def connect(self) -> bool:
         try:
@@ -129,13 +462,14 @@ class TCPRadarConnector(RadarConnector):
             port = self.config.get('port', 5000)
             timeout = self.config.get('timeout', 5)
             
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.settimeout(timeout)
-            await asyncio.get_event_loop().run_in_executor(
-                None, self.socket.connect, (host, port)
+            self._reset_frames()
+            loop = asyncio.get_running_loop()
+            self.transport, self.protocol = await asyncio.wait_for(
+                loop.create_connection(lambda: _TCPFrameProtocol(self), host, port),
+                timeout=timeout
             )
             self.is_connected = True
-            logger.info(f"Connected to TCP radar at {host}:{port}")
+            logger.info(f"Connected to TCP radar at {host}:{port} ({self.decoder.framing} framing)")
             return True
         except Exception as e:
             logger.error(f"Failed to connect to TCP radar: {e}")
@@ -143,76 +477,460 @@ class TCPRadarConnector(RadarConnector):
             return False
             
     async def disconnect(self):
-        if self.socket:
+        if self.transport:
             try:
-                self.socket.close()
-            except:
+                self.transport.close()
+            except Exception:
                 pass
+            self.transport = None
+            self.protocol = None
             self.is_connected = False
+            self.frames_available.set()  # Wake up a pending read_data
             logger.info("TCP connection closed")
             
-    async def read_data(self) -> Optional[Dict[str, Any]]:
-        if not self.socket:
-            return None
+    def _pause_input(self):
+        if self.protocol:
+            self.protocol.pause()  # Back-pressure the radar until we catch up
             
-        try:
-            data = await asyncio.get_event_loop().run_in_executor(
-                None, self.socket.recv, 1024
-            )
-            if data:
-                decoded = data.decode('utf-8', errors='ignore').strip()
-                return {'raw_data': decoded, 'source': 'tcp', 'timestamp': datetime.utcnow().isoformat()}
-        except socket.timeout:
-            pass  # Normal timeout, no data available
-        except Exception as e:
-            logger.error(f"Error reading TCP data: {e}")
-            self.is_connected = False
+    def _resume_input(self):
+        if self.protocol:
+            self.protocol.resume()
             
-        return None
+    def _on_connection_lost(self):
+        self.is_connected = False
+        self.transport = None
+        self.protocol = None
+        self.frames_available.set()
 
 
 class FileRadarConnector(RadarConnector):
-    """File-based radar connector for testing"""
+    """File-based radar connector for testing and replaying captures
+    
+    The capture (plain, .gz or .zst) is streamed line by line, so memory
+    stays constant whatever its size. Frames are paced by their recorded
+    timestamps divided by `speed` ('max' = no pacing); lines without one are
+    spaced `interval` seconds apart. `start_offset` seeks that many recorded
+    seconds in, through a sidecar index built on first use.
+    """
+    
+    poll_interval = 0  # read_batch waits until the next frame is due
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.file_path = config.get('path', 'radar_data.txt')
-        self.current_line = 0
-        self.lines = []
+        speed = config.get('speed', 1.0)
+        self.speed = 0.0 if speed == 'max' else float(speed)  # 0 = as fast as possible
+        self.interval = config.get('interval', 1.0)
+        self.loop = config.get('loop', True)
+        self.start_offset = config.get('start_offset', 0.0)
+        self.index_interval = config.get('index_interval', 10.0)
+        self.restamp = config.get('restamp', False)
+        self.max_batch_size = config.get('max_batch_size', 500)
+        
+        self.file = None
+        self.index: Optional[CaptureIndex] = None
+        self.pending: Optional[tuple] = None  # (recorded time, frame) read but not yet due
+        self.recorded_clock = 0.0  # Recorded time of the previous line, for lines without one
+        self.record_start: Optional[float] = None  # Replay anchor: recorded time...
+        self.wall_start: Optional[float] = None  # ...and the loop time it was sent at
+        self.frames_this_pass = 0
+        self.passes = 0
+        self.last_recorded_timestamp: Optional[str] = None
         
     async def connect(self) -> bool:
         try:
-            with open(self.file_path, 'r') as f:
-                self.lines = f.readlines()
+            await self._open()
             self.is_connected = True
-            logger.info(f"Loaded {len(self.lines)} lines from {self.file_path}")
+            logger.info(f"Replaying {self.file_path} at {'max' if not self.speed else f'{self.speed:g}x'} speed")
             return True
         except Exception as e:
-            logger.error(f"Failed to load file: {e}")
+            logger.error(f"Failed to open file: {e}")
+            self._close()
             self.is_connected = False
             return False
             
     async def disconnect(self):
         self.is_connected = False
-        self.current_line = 0
+        self._close()
+        
+    def _close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+        self.pending = None
+        
+    async def _open(self):
+        """(Re)start the replay at start_offset"""
+        self._close()
+        self.file = open_capture(self.file_path)
+        self.recorded_clock = 0.0
+        self.record_start = self.wall_start = None
+        self.frames_this_pass = 0
+        self.passes += 1
+        if self.start_offset:
+            await self.seek(self.start_offset)
+            
+    async def seek(self, seconds: float):
+        """Continue the replay `seconds` of recorded time after the start of the capture"""
+        if self.index is None:
+            self.index = await asyncio.to_thread(CaptureIndex.load_or_build, self.file_path, self.index_interval)
+        self.file.close()
+        self.file = open_capture(self.file_path)
+        self.recorded_clock = 0.0
+        target = seconds
+        if self.index.start_time is not None:
+            target = self.index.start_time + seconds
+            seek_capture(self.file, self.index.offset_for(seconds))
+            
+        # Skip from the checkpoint up to the requested moment
+        self.pending = None
+        while True:
+            record = self._read_record()
+            if record is None or record[0] >= target:
+                break
+        self.pending = record
+        self.record_start = self.wall_start = None
+        
+    def _read_record(self) -> Optional[tuple]:
+        """Next (recorded time, frame) of the capture; None at the end"""
+        while True:
+            raw = self.file.readline()
+            if not raw:
+                return None
+            line = raw.decode('utf-8', errors='ignore').strip()
+            if not is_frame_line(line):
+                continue
+            recorded, frame = parse_line(line)
+            if recorded is None:
+                recorded = self.recorded_clock + self.interval
+            self.recorded_clock = recorded
+            return recorded, frame
+            
+    def _make_frame(self, frame: Dict[str, Any]) -> Dict[str, Any]:
+        self.frames_this_pass += 1
+        frame = {**frame, 'source': frame.get('source', 'file')}
+        if frame.get('timestamp'):
+            self.last_recorded_timestamp = frame['timestamp']
+        if self.restamp or not frame.get('timestamp'):
+            frame['timestamp'] = datetime.utcnow().isoformat()
+        return frame
+        
+    def _due_at(self, recorded: float) -> float:
+        return self.wall_start + (recorded - self.record_start) / self.speed
+        
+    async def _next_record(self) -> Optional[tuple]:
+        record = self.pending or self._read_record()
+        self.pending = None
+        if record is None and self.loop and self.frames_this_pass:
+            await self._open()
+            record = self.pending or self._read_record()
+            self.pending = None
+        return record
+        
+    async def _read_due(self, limit: int) -> List[Dict[str, Any]]:
+        """Wait for the next frame to fall due, then take every frame due by then (up to limit)"""
+        record = await self._next_record()
+        if record is None:
+            await asyncio.sleep(1)  # End of the capture
+            return []
+            
+        loop = asyncio.get_running_loop()
+        if self.wall_start is None:
+            self.record_start, self.wall_start = record[0], loop.time()
+        if self.speed > 0:
+            delay = self._due_at(record[0]) - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        else:
+            await asyncio.sleep(0)  # Still let the pipeline run between batches
+            
+        batch = [self._make_frame(record[1])]
+        now = loop.time()
+        while len(batch) < limit:
+            record = self._read_record()
+            if record is None:
+                break
+            if self.speed > 0 and self._due_at(record[0]) > now:
+                self.pending = record
+                break
+            batch.append(self._make_frame(record[1]))
+        return batch
         
     async def read_data(self) -> Optional[Dict[str, Any]]:
-        if not self.lines:
+        batch = await self._read_due(1)
+        return batch[0] if batch else None
+        
+    async def read_batch(self) -> List[Dict[str, Any]]:
+        return await self._read_due(self.max_batch_size)
+        
+    def get_source_stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = super().get_source_stats()
+        stats[self.name]['replay'] = {
+            'speed': self.speed or 'max',
+            'passes': self.passes,
+            'recorded_time': self.last_recorded_timestamp
+        }
+        return stats
+
+
+class TailRadarConnector(StreamRadarConnector):
+    """Follows a log file that radar software keeps appending to (like tail -F)
+    
+    New bytes are read as soon as the directory watcher reports a change
+    (inotify, or polling where that is unavailable), split into frames and
+    delivered in batches. Rotation by rename or truncation is followed; with
+    a glob `path` (e.g. detections-*.log) the connector moves on to the next
+    file of the set once the current one is finished. The byte offset is
+    saved to `offset_file`, so a restart resumes where it stopped.
+    """
+    
+    source_name = 'tail'
+    
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.path = config.get('path', 'radar.log')
+        self.is_glob = glob.has_magic(self.path)
+        self.directory = os.path.dirname(self.path) or '.'
+        default_offset_file = os.path.join(self.directory, '.tail.offset') if self.is_glob else f"{self.path}.offset"
+        self.offset_file = config.get('offset_file', default_offset_file)
+        self.from_beginning = config.get('from_beginning', False)
+        self.read_size = config.get('read_size', 65536)
+        self.max_read_per_check = config.get('max_read_per_check', 4 * 1024 * 1024)
+        self.checkpoint_interval = config.get('checkpoint_interval', 1.0)
+        
+        self.file = None
+        self.file_path: Optional[str] = None
+        self.inode: Optional[int] = None
+        self.position = 0  # Bytes of the current file read so far
+        self.paused = False
+        self.check_scheduled = False
+        self.last_checkpoint = 0.0
+        self.watcher = DirectoryWatcher(
+            self.directory, self._check,
+            poll_interval=config.get('poll_interval', 0.05),
+            fallback_interval=config.get('fallback_interval', 1.0),
+            use_inotify=config.get('inotify', True)
+        )
+        self.tail_stats = {'bytes_read': 0, 'rotations': 0, 'truncations': 0}
+        
+    async def connect(self) -> bool:
+        try:
+            self.watcher.stop()  # Still running if the monitoring loop dropped the connection
+            self._reset_frames()
+            self.paused = False
+            self._open_initial(self._load_offset())
+            self.watcher.start()
+            self.is_connected = True
+            logger.info(f"Following {self.file_path or self.path} from byte {self.position}")
+            self._check()  # Whatever was written while we were not running
+            return True
+        except Exception as e:
+            logger.error(f"Failed to follow {self.path}: {e}")
+            self.watcher.stop()
+            self._close_file()
+            self.is_connected = False
+            return False
+            
+    async def disconnect(self):
+        self.watcher.stop()
+        if self.file:
+            self._save_offset()
+        self._close_file()
+        self.is_connected = False
+        self.frames_available.set()  # Wake up a pending read_data
+        
+    @property
+    def offset(self) -> int:
+        """Bytes of the current file turned into frames (a partial last line is read again after a restart)"""
+        return self.position - len(self.decoder.buffer)
+        
+    def _candidates(self) -> List[str]:
+        """Files of the set, oldest first"""
+        if not self.is_glob:
+            return [self.path]
+        files = []
+        for path in glob.glob(self.path):
+            try:
+                files.append((os.stat(path).st_mtime, path))
+            except OSError:
+                continue
+        return [path for _, path in sorted(files)]
+        
+    def _find_inode(self, inode: int) -> Optional[str]:
+        """Where a file we were reading went (renamed by rotation while we were stopped)"""
+        pattern = self.path if self.is_glob else self.path + '*'
+        for path in glob.glob(pattern):
+            try:
+                if os.stat(path).st_ino == inode:
+                    return path
+            except OSError:
+                continue
+        return None
+        
+    def _open_initial(self, state: Optional[Dict[str, Any]]):
+        if state:
+            path = self._find_inode(state.get('inode'))
+            if path:
+                self._open(path, state.get('offset', 0))
+                return
+            logger.warning(f"{state.get('path')} is gone, starting from the current file")
+        files = self._candidates()
+        path = files[-1] if files and os.path.exists(files[-1]) else None
+        if path:
+            self._open(path, 0 if self.from_beginning else os.path.getsize(path))
+            
+    def _open(self, path: str, offset: int = 0):
+        self._close_file()
+        self.file = open(path, 'rb', buffering=0)
+        info = os.fstat(self.file.fileno())
+        if offset > info.st_size:
+            offset = 0  # Truncated while we were stopped
+        self.file.seek(offset)
+        self.file_path = path
+        self.inode = info.st_ino
+        self.position = offset
+        self.decoder.reset()
+        
+    def _close_file(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+            
+    def _check(self):
+        """Read everything new (up to max_read_per_check, then yield and continue)"""
+        self.check_scheduled = False
+        if self.paused:
+            return
+        if self.file is None:
+            files = self._candidates()
+            if not files or not os.path.exists(files[0]):
+                return  # Nothing written yet
+            self._open(files[0] if self.is_glob else self.path)
+            
+        budget = self.max_read_per_check
+        while budget > 0 and not self.paused:
+            data = self.file.read(min(self.read_size, budget))
+            if data:
+                budget -= len(data)
+                self._consume(data)
+            elif not self._advance():
+                break
+        if budget <= 0 and not self.paused:
+            self._schedule_check()
+            
+        now = asyncio.get_running_loop().time()
+        if now - self.last_checkpoint >= self.checkpoint_interval:
+            self._save_offset()
+            self.last_checkpoint = now
+            
+    def _schedule_check(self):
+        if not self.check_scheduled:
+            self.check_scheduled = True
+            asyncio.get_running_loop().call_soon(self._check)
+            
+    def _consume(self, data: bytes):
+        self.position += len(data)
+        self.tail_stats['bytes_read'] += len(data)
+        frames = self.decoder.feed(data)
+        if frames:
+            self._push_frames(frames)
+            
+    def _advance(self) -> bool:
+        """At the end of the current file: follow a rotation, truncation or the next file; False to wait"""
+        if self.is_glob:
+            files = self._candidates()
+            if self.file_path in files and files[-1] != self.file_path:
+                self._switch(files[files.index(self.file_path) + 1])
+                return True
+            if self.file_path in files:
+                return self._check_truncated()
+            if files:
+                self._switch(files[-1])  # Current file was removed
+                return True
+            return False
+            
+        try:
+            info = os.stat(self.path)
+        except FileNotFoundError:
+            return False  # Rotated away, new file not created yet
+        if info.st_ino != self.inode:
+            self._switch(self.path)
+            return True
+        return self._check_truncated()
+        
+    def _check_truncated(self) -> bool:
+        if os.fstat(self.file.fileno()).st_size >= self.position:
+            return False
+        logger.info(f"{self.file_path} was truncated, reading from the start")
+        self.tail_stats['truncations'] += 1
+        self.file.seek(0)
+        self.position = 0
+        self.decoder.reset()
+        return True
+        
+    def _switch(self, path: str):
+        # The writer is done with the old file: its unterminated last line is a whole frame
+        if self.decoder.buffer and self.decoder.framing != 'length_prefix':
+            self._push_frames([bytes(self.decoder.buffer)])
+        logger.info(f"{self.file_path} rotated, following {path}")
+        self.tail_stats['rotations'] += 1
+        self._open(path)
+        self._save_offset()
+        
+    def _load_offset(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.offset_file) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable offset file {self.offset_file}: {e}")
             return None
             
-        if self.current_line >= len(self.lines):
-            self.current_line = 0  # Loop back to start
+    def _save_offset(self):
+        if not self.file_path:
+            return
+        temp_path = f"{self.offset_file}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump({'path': self.file_path, 'inode': self.inode, 'offset': self.offset}, f)
+            os.replace(temp_path, self.offset_file)
+        except OSError as e:
+            logger.warning(f"Could not save tail offset to {self.offset_file}: {e}")
             
-        line = self.lines[self.current_line].strip()
-        self.current_line += 1
+    def _pause_input(self):
+        self.paused = True  # Stop reading; the file keeps the rest until we catch up
         
-        await asyncio.sleep(1)  # Simulate realistic data rate
+    def _resume_input(self):
+        if self.paused:
+            self.paused = False
+            self._schedule_check()
+            
+    def _make_frame(self, frame: bytes) -> Dict[str, Any]:
+        _, record = parse_line(frame.decode('utf-8', errors='ignore').strip())
+        record = {**record, 'source': record.get('source', self.source_name)}
+        if not record.get('timestamp'):
+            record['timestamp'] = datetime.utcnow().isoformat()
+        return record
         
-        return {'raw_data': line, 'source': 'file', 'timestamp': datetime.utcnow().isoformat()}
+    def get_source_stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = super().get_source_stats()
+        stats[self.name]['tail'] = {
+            'file': self.file_path,
+            'offset': self.offset if self.file else None,
+            'watch_mode': self.watcher.mode,
+            **self.tail_stats
+        }
+        return stats
 
 
 class MockRadarConnector(RadarConnector):
-    """Mock radar connector with REALISTIC drone movement"""
+    """Mock radar connector with REALISTIC drone movement
+    
+    With `swarm.enabled` it runs the NumPy swarm simulator instead: thousands
+    of targets, one frame per scan at `swarm.scan_rate` (0 = as fast as the
+    gateway consumes them), reproducible from `swarm.seed`.
+    """
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
@@ -221,17 +939,59 @@ class MockRadarConnector(RadarConnector):
         self.active_drones = {}  # Track drones over time
         self.drone_id_counter = 0
         
+        swarm_config = config.get('swarm', {})
+        self.swarm = SwarmSimulator.from_config(swarm_config) if swarm_config.get('enabled', False) else None
+        self.next_scan: Optional[float] = None
+        self.late_scans = 0
+        if self.swarm is not None:
+            self.poll_interval = 0  # read_data paces itself to the scan rate
+        
     async def connect(self) -> bool:
         self.is_connected = True
         self.start_time = datetime.utcnow()
-        logger.info("Mock radar connected - REALISTIC MOVEMENT MODE")
+        self.next_scan = None
+        if self.swarm is not None:
+            logger.info(f"Mock radar connected - SWARM MODE ({self.swarm.scan_rate} Hz, seed {self.swarm.seed})")
+            if self.frame_limit is not None and self.swarm.max_targets > self.frame_limit:
+                logger.warning(
+                    f"Swarm frames can carry up to {self.swarm.max_targets} targets but radar_data.max_detections "
+                    f"is {self.frame_limit}; larger frames will be rejected"
+                )
+        else:
+            logger.info("Mock radar connected - REALISTIC MOVEMENT MODE")
         return True
         
     async def disconnect(self):
         self.is_connected = False
         logger.info("Mock radar disconnected")
         
+    def get_source_stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = super().get_source_stats()
+        if self.swarm is not None:
+            stats[self.name]['swarm'] = {**self.swarm.get_stats(), 'late_scans': self.late_scans}
+        return stats
+        
+    async def _read_swarm_frame(self) -> Dict[str, Any]:
+        """Next simulated scan, on a drift-free schedule (late scans are sent at once, not skipped)"""
+        loop = asyncio.get_running_loop()
+        if self.swarm.scan_rate > 0:
+            now = loop.time()
+            if self.next_scan is None:
+                self.next_scan = now
+            delay = self.next_scan - now
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif delay < -self.swarm.period:
+                self.late_scans += 1
+            self.next_scan += self.swarm.period
+        else:
+            await asyncio.sleep(0)  # Still let the pipeline run between frames
+        return self.swarm.next_frame(self.start_time)
+        
     async def read_data(self) -> Optional[Dict[str, Any]]:
+        if self.swarm is not None:
+            return await self._read_swarm_frame()
+            
         import random
         
         await asyncio.sleep(random.uniform(2, 4))
@@ -328,26 +1088,7 @@ class MockRadarConnector(RadarConnector):
         altitude_m = random.randint(100, 600)
         
         # Calculate GPS position (Cluj-Napoca base)
-        base_lat = 46.7712
-        base_lon = 23.6236
-        
-        import math
-        R = 6371.0
-        lat1 = math.radians(base_lat)
-        lon1 = math.radians(base_lon)
-        brng = math.radians(bearing)
-        
-        lat2 = math.asin(
-            math.sin(lat1) * math.cos(range_km / R) +
-            math.cos(lat1) * math.sin(range_km / R) * math.cos(brng)
-        )
-        lon2 = lon1 + math.atan2(
-            math.sin(brng) * math.sin(range_km / R) * math.cos(lat1),
-            math.cos(range_km / R) - math.sin(lat1) * math.sin(lat2)
-        )
-        
-        drone_lat = math.degrees(lat2)
-        drone_lon = math.degrees(lon2)
+        drone_lat, drone_lon = base_frame.position(range_km * 1000, bearing)
         
         self.active_drones[drone_id] = {
             'id': drone_id,
@@ -373,33 +1114,22 @@ class MockRadarConnector(RadarConnector):
             
             drone['range'] -= distance_moved
             
-            # Update GPS position
-            import math
-            base_lat = 46.7712
-            base_lon = 23.6236
-            
-            R = 6371.0
-            lat1 = math.radians(base_lat)
-            lon1 = math.radians(base_lon)
-            brng = math.radians(drone['bearing'])
-            
-            lat2 = math.asin(
-                math.sin(lat1) * math.cos(drone['range'] / R) +
-                math.cos(lat1) * math.sin(drone['range'] / R) * math.cos(brng)
-            )
-            lon2 = lon1 + math.atan2(
-                math.sin(brng) * math.sin(drone['range'] / R) * math.cos(lat1),
-                math.cos(drone['range'] / R) - math.sin(lat1) * math.sin(lat2)
-            )
-            
-            drone['latitude'] = math.degrees(lat2)
-            drone['longitude'] = math.degrees(lon2)
-            
             # Slight bearing variation (±1-2 degrees for realism)
             if random.random() < 0.3:
                 drone['bearing'] += random.uniform(-2, 2)
                 drone['bearing'] = drone['bearing'] % 360
                 
+        # Update GPS positions of every drone in one call
+        if self.active_drones:
+            drones = list(self.active_drones.values())
+            lats, lons = base_frame.destination(
+                [drone['range'] * 1000 for drone in drones],
+                [drone['bearing'] for drone in drones]
+            )
+            for drone, lat, lon in zip(drones, lats.tolist(), lons.tolist()):
+                drone['latitude'] = lat
+                drone['longitude'] = lon
+                
     def _cleanup_drones(self):
         """Remove drones that are too close or too old"""
         for drone_id, drone in list(self.active_drones.items()):
@@ -423,6 +1153,7 @@ def create_connector(radar_type: str, config: Dict[str, Any]) -> RadarConnector:
         'serial': SerialRadarConnector,
         'tcp': TCPRadarConnector,
         'file': FileRadarConnector,
+        'tail': TailRadarConnector,
         'mock': MockRadarConnector
     }
     
@@ -0,0 +1,288 @@
+import re
+import warnings
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+
+# SI conversion factors
+KM = 1000.0
+FT = 0.3048
+NM = 1852.0
+KNOT = 1852.0 / 3600.0
+KMH = 1000.0 / 3600.0
+
+RANGE_UNITS = {'km': KM, 'm': 1.0, 'nm': NM, 'mi': 1609.344}
+ALTITUDE_UNITS = {'m': 1.0, 'ft': FT, 'km': KM}
+SPEED_UNITS = {'kts': KNOT, 'kt': KNOT, 'kn': KNOT, 'kmh': KMH, 'km/h': KMH, 'ms': 1.0, 'm/s': 1.0, 'mph': 0.44704}
+
+QUANTITY = re.compile(r'\s*(-?\d+(?:\.\d+)?)\s*([A-Za-z°/]*)')
+
+def parse_quantity(value: Any, units: Dict[str, float], default_unit: str) -> Optional[float]:
+    """'3.5km' / '150ft' / 85 -> SI float (numbers are taken in default_unit); None if missing"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) * units[default_unit]
+    match = QUANTITY.match(str(value))
+    if not match:
+        return None
+    unit = match.group(2).lower() or default_unit
+    return float(match.group(1)) * units.get(unit, units[default_unit])
+
+def parse_bearing(value: Any) -> Optional[float]:
+    """'045°' / 45 -> degrees"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = QUANTITY.match(str(value))
+    return float(match.group(1)) if match else None
+
+def si_field(data: Dict[str, Any], si_key: str, key: str, units: Optional[Dict[str, float]], default_unit: str) -> Optional[float]:
+    """Take an SI value a parser already produced (e.g. range_m), else parse the display field"""
+    value = data.get(si_key)
+    if value is not None:
+        return float(value)
+    if units is None:
+        return parse_bearing(data.get(key))
+    return parse_quantity(data.get(key), units, default_unit)
+
+def format_range(range_m: Optional[float]) -> str:
+    return f"{range_m / KM:.2f}km" if range_m is not None else 'N/A'
+
+def format_bearing(bearing_deg: Optional[float]) -> str:
+    return f"{int(bearing_deg) % 360:03d}°" if bearing_deg is not None else 'N/A'
+
+def format_altitude(altitude_m: Optional[float]) -> str:
+    return f"{round(altitude_m)}m" if altitude_m is not None else 'N/A'
+
+def format_speed(speed_ms: Optional[float]) -> str:
+    return f"{round(speed_ms / KNOT)}kts" if speed_ms is not None else 'N/A'
+
+@dataclass(slots=True)
+class Target:
+    """One tracked object, in SI units (m, degrees, m/s)"""
+    id: str
+    range_m: Optional[float] = None
+    bearing_deg: Optional[float] = None
+    altitude_m: Optional[float] = None
+    speed_ms: Optional[float] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    kind: Optional[str] = None
+    
+    @classmethod
+    def from_fields(cls, data: Dict[str, Any], index: int = 0) -> 'Target':
+        return cls(
+            id=str(data.get('id') or f"T-{index + 1}"),
+            range_m=si_field(data, 'range_m', 'range', RANGE_UNITS, 'km'),
+            bearing_deg=si_field(data, 'bearing_deg', 'bearing', None, ''),
+            altitude_m=si_field(data, 'altitude_m', 'altitude', ALTITUDE_UNITS, 'm'),
+            speed_ms=si_field(data, 'speed_ms', 'speed', SPEED_UNITS, 'kts'),
+            latitude=data.get('latitude'),
+            longitude=data.get('longitude'),
+            kind=data.get('type')
+        )
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """Display form (unit-suffixed strings) used by the API and LoCrypt payloads"""
+        result = {'id': self.id}
+        if self.kind:
+            result['type'] = self.kind
+        result.update({
+            'range': format_range(self.range_m),
+            'bearing': format_bearing(self.bearing_deg),
+            'altitude': format_altitude(self.altitude_m),
+            'speed': format_speed(self.speed_ms)
+        })
+        if self.latitude is not None:
+            result['latitude'] = self.latitude
+            result['longitude'] = self.longitude
+        return result
+
+@dataclass(slots=True)
+class Detection:
+    """One processed radar frame, in SI units, parsed once at ingest"""
+    detections: int
+    range_m: Optional[float] = None
+    bearing_deg: Optional[float] = None
+    altitude_m: Optional[float] = None
+    speed_ms: Optional[float] = None
+    confidence: str = 'MEDIUM'
+    signal_strength: float = 0
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    targets: List[Target] = field(default_factory=list)
+    radar_id: str = ''
+    station_name: str = ''
+    timestamp: str = ''
+    source: str = 'unknown'
+    sensor: Optional[str] = None
+    
+    @classmethod
+    def from_fields(cls, data: Dict[str, Any]) -> 'Detection':
+        """Build from a parser result (SI fields, or unit-suffixed strings / plain numbers)"""
+        return cls(
+            detections=int(data.get('detections', 0)),
+            range_m=si_field(data, 'range_m', 'range', RANGE_UNITS, 'km'),
+            bearing_deg=si_field(data, 'bearing_deg', 'bearing', None, ''),
+            altitude_m=si_field(data, 'altitude_m', 'altitude', ALTITUDE_UNITS, 'm'),
+            speed_ms=si_field(data, 'speed_ms', 'speed', SPEED_UNITS, 'kts'),
+            confidence=data.get('confidence', 'MEDIUM'),
+            signal_strength=data.get('signalStrength', 0),
+            latitude=data.get('latitude'),
+            longitude=data.get('longitude'),
+            targets=[
+                Target.from_fields(t, i) for i, t in enumerate(data.get('targets') or [])
+                if isinstance(t, dict)
+            ]
+        )
+        
+    @property
+    def source_key(self) -> str:
+        return self.sensor or self.source
+        
+    def closest_target(self) -> Optional[Target]:
+        ranged = [t for t in self.targets if t.range_m is not None]
+        return min(ranged, key=lambda t: t.range_m) if ranged else None
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """Display form (unit-suffixed strings) used by the API and LoCrypt payloads"""
+        result = {
+            'detections': self.detections,
+            'range': format_range(self.range_m),
+            'bearing': format_bearing(self.bearing_deg),
+            'altitude': format_altitude(self.altitude_m),
+            'speed': format_speed(self.speed_ms),
+            'confidence': self.confidence,
+            'signalStrength': self.signal_strength
+        }
+        if self.latitude is not None:
+            result['latitude'] = self.latitude
+            result['longitude'] = self.longitude
+        result['targets'] = [t.to_dict() for t in self.targets]
+        result.update({
+            'radarId': self.radar_id,
+            'stationName': self.station_name,
+            'timestamp': self.timestamp,
+            'source': self.source
+        })
+        if self.sensor:
+            result['sensor'] = self.sensor
+        return result
+
+
+def _optional_list(column: np.ndarray) -> List[Optional[float]]:
+    """Float column -> Python list with None for NaN, in one vector step"""
+    values = column.astype(object)
+    values[np.isnan(column)] = None
+    return values.tolist()
+
+def _si_column(rows: List[Dict[str, Any]], si_key: str, key: str,
+               units: Optional[Dict[str, float]], default_unit: str) -> np.ndarray:
+    """One column in SI units (NaN = missing), the vector form of si_field
+    
+    SI values the parsers produced are gathered in one pass (None -> NaN).
+    Only the rows without one fall back to their display field, which is
+    split into number and unit factor and converted with one multiply.
+    """
+    column = np.array([row.get(si_key) for row in rows], dtype=np.float64)
+    missing = np.flatnonzero(np.isnan(column))
+    if len(missing):
+        numbers, factors = _display_values([rows[i].get(key) for i in missing.tolist()], units, default_unit)
+        column[missing] = numbers * factors
+    return column
+
+def _display_values(values: List[Any], units: Optional[Dict[str, float]], default_unit: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Display values ('3.5km', 85, 'N/A') -> (numbers, SI factors); NaN where there is no number"""
+    default = units[default_unit] if units else 1.0
+    numbers = []
+    factors = []
+    for value in values:
+        if value is None or isinstance(value, bool):
+            numbers.append(np.nan)
+            factors.append(default)
+        elif isinstance(value, (int, float)):
+            numbers.append(value)
+            factors.append(default)
+        else:
+            match = QUANTITY.match(str(value))
+            unit = match.group(2).lower() if match else ''
+            numbers.append(float(match.group(1)) if match else np.nan)
+            factors.append(units.get(unit, default) if units and unit else default)
+    return np.array(numbers, dtype=np.float64), np.array(factors, dtype=np.float64)
+
+def parse_timestamps(values: List[Optional[str]]) -> np.ndarray:
+    """ISO-8601 strings -> epoch seconds (float64); missing or unparseable -> now"""
+    now = datetime.utcnow().timestamp()
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')  # numpy warns about (and ignores) 'Z' / offsets
+            parsed = np.array(values, dtype='datetime64[us]')
+    except (ValueError, TypeError):
+        parsed = np.empty(len(values), dtype='datetime64[us]')
+        for i, value in enumerate(values):
+            try:
+                parsed[i] = np.datetime64(value, 'us') if value else np.datetime64('NaT')
+            except (ValueError, TypeError):
+                parsed[i] = np.datetime64('NaT')
+    seconds = parsed.astype('int64') / 1e6
+    seconds[np.isnat(parsed)] = now
+    return seconds
+
+class DetectionBatch:
+    """Columnar view of a burst of parsed frames
+    
+    One NumPy array per numeric field (SI units, NaN where a frame did not
+    carry the value), so validation and analytics run as vector operations
+    instead of per-frame dict handling.
+    """
+    
+    __slots__ = ('rows', 'frames', 'timestamps', 'detections', 'range_m', 'bearing_deg',
+                 'altitude_m', 'speed_ms', 'valid', 'records')
+                 
+    def __init__(self, rows: List[Dict[str, Any]], frames: List[Dict[str, Any]]):
+        count = len(rows)
+        self.rows = rows
+        self.frames = frames
+        self.timestamps = parse_timestamps([frame.get('timestamp') for frame in frames])
+        self.detections = np.array([row.get('detections', 0) for row in rows], dtype=np.int64).reshape(count)
+        self.range_m = _si_column(rows, 'range_m', 'range', RANGE_UNITS, 'km')
+        self.bearing_deg = _si_column(rows, 'bearing_deg', 'bearing', None, '')
+        self.altitude_m = _si_column(rows, 'altitude_m', 'altitude', ALTITUDE_UNITS, 'm')
+        self.speed_ms = _si_column(rows, 'speed_ms', 'speed', SPEED_UNITS, 'kts')
+        self.valid = np.ones(count, dtype=bool)
+        self.records: List[Detection] = []
+        
+    def __len__(self) -> int:
+        return len(self.rows)
+        
+    def build_records(self) -> List[Detection]:
+        """Typed records for the valid rows, built from the already converted columns"""
+        indices = np.flatnonzero(self.valid)
+        columns = zip(
+            self.detections[indices].tolist(), _optional_list(self.range_m[indices]),
+            _optional_list(self.bearing_deg[indices]), _optional_list(self.altitude_m[indices]),
+            _optional_list(self.speed_ms[indices])
+        )
+        records = []
+        rows = self.rows
+        for index, (detections, range_m, bearing, altitude, speed) in zip(indices.tolist(), columns):
+            row = rows[index]
+            records.append(Detection(
+                detections=detections,
+                range_m=range_m,
+                bearing_deg=bearing,
+                altitude_m=altitude,
+                speed_ms=speed,
+                confidence=row.get('confidence', 'MEDIUM'),
+                signal_strength=row.get('signalStrength', 0),
+                latitude=row.get('latitude'),
+                longitude=row.get('longitude'),
+                targets=[
+                    Target.from_fields(t, i) for i, t in enumerate(row.get('targets') or [])
+                    if isinstance(t, dict)
+                ]
+            ))
+        return records
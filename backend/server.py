@@ -1,9 +1,10 @@
-from fastapi import FastAPI, APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, APIRouter, HTTPException, WebSocket, WebSocketDisconnect, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import json
 import logging
 import asyncio
 from pathlib import Path
@@ -16,6 +17,8 @@ from datetime import datetime, timezone
 from gateway_manager import gateway_manager
 from prediction_engine import prediction_engine
 from danger_zone_predictor import danger_zone_predictor
+from event_hub import event_hub, TOPICS
+from locrypt_client import MAX_BATCH_ITEMS
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -51,6 +54,61 @@ class GatewayPublishRequest(BaseModel):
     encrypted_data: str
     data_type: str = "radar"
 
+class GatewayBatchItem(BaseModel):
+    encrypted_data: str
+    data_type: str = "radar"
+
+class GatewayBatchPublishRequest(BaseModel):
+    gateway_token: str
+    items: List[GatewayBatchItem]
+
+def format_locrypt_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Format published radar data for LoCrypt display (matching their UI expectations)"""
+    return {
+        'radarId': data.get('radarId', 'UNKNOWN'),
+        'detections': data.get('detections', 0),
+        'range': data.get('range', 'N/A'),
+        'bearing': data.get('bearing', 'N/A'),
+        'altitude': data.get('altitude', 'N/A'),
+        'speed': data.get('speed', 'N/A'),
+        'signalStrength': data.get('signalStrength', 0),
+        'confidence': data.get('confidence', 'UNKNOWN'),
+        'threatLevel': 'HIGH' if data.get('detections', 0) > 2 else 'MEDIUM' if data.get('detections', 0) > 0 else 'LOW',
+        'timestamp': data.get('timestamp', datetime.utcnow().isoformat())
+    }
+
+def published_data_doc(gateway_token: str, raw_data: str, formatted_data: Dict[str, Any], data_type: str) -> Dict[str, Any]:
+    """Build the MongoDB document stored for one published reading"""
+    return {
+        'id': str(uuid.uuid4()),
+        'gateway_token': gateway_token[:10] + "...",  # Masked
+        'data': raw_data,
+        'formatted_data': formatted_data,
+        'data_type': data_type,
+        'timestamp': datetime.utcnow().isoformat()
+    }
+
+def prediction_summaries() -> List[Dict[str, Any]]:
+    """Active predictions in the shape the danger zone predictor expects"""
+    pred_list = []
+    for pred_id, pred in prediction_engine.predictions.items():
+        summary = {
+            'id': pred_id,
+            'type': pred['type'],
+            'message': pred['message'],
+            'confidence': pred['confidence'],
+            'seconds_remaining': int((pred['expected_time'] - datetime.utcnow()).total_seconds()),
+            'expected_time': pred['expected_time'],
+            'sector': pred.get('sector', 'N')
+        }
+        if pred.get('track_id'):
+            # Extrapolated track position instead of the sector centre
+            summary['bearing_deg'] = pred['predicted_bearing_deg']
+            summary['range_km'] = pred['predicted_range_m'] / 1000
+            summary['radius_km'] = prediction_engine.validation_radius_m / 1000
+        pred_list.append(summary)
+    return pred_list
+
 # ============= Radar Gateway Endpoints =============
 
 @api_router.get("/")
@@ -62,6 +120,7 @@ async def get_gateway_status():
     """Get current gateway status"""
     try:
         status = gateway_manager.get_status()
+        status['push'] = event_hub.get_stats()
         return status
     except Exception as e:
         logging.error(f"Error getting status: {e}")
@@ -160,23 +219,7 @@ async def publish_data(request: GatewayPublishRequest):
         
         # Parse encrypted data to extract key metrics for LoCrypt format
         try:
-            import json
-            data = json.loads(request.encrypted_data)
-            
-            # Format for LoCrypt display (matching their UI expectations)
-            locrypt_formatted_data = {
-                'radarId': data.get('radarId', 'UNKNOWN'),
-                'detections': data.get('detections', 0),
-                'range': data.get('range', 'N/A'),
-                'bearing': data.get('bearing', 'N/A'),
-                'altitude': data.get('altitude', 'N/A'),
-                'speed': data.get('speed', 'N/A'),
-                'signalStrength': data.get('signalStrength', 0),
-                'confidence': data.get('confidence', 'UNKNOWN'),
-                'threatLevel': 'HIGH' if data.get('detections', 0) > 2 else 'MEDIUM' if data.get('detections', 0) > 0 else 'LOW',
-                'timestamp': data.get('timestamp', datetime.utcnow().isoformat())
-            }
-            
+            locrypt_formatted_data = format_locrypt_data(json.loads(request.encrypted_data))
         except:
             locrypt_formatted_data = {}
         
@@ -184,14 +227,7 @@ async def publish_data(request: GatewayPublishRequest):
         logging.info(f"Received radar data: {request.encrypted_data[:100]}...")
         
         # Store in MongoDB
-        doc = {
-            'id': str(uuid.uuid4()),
-            'gateway_token': request.gateway_token[:10] + "...",  # Masked
-            'data': request.encrypted_data,
-            'formatted_data': locrypt_formatted_data,
-            'data_type': request.data_type,
-            'timestamp': datetime.utcnow().isoformat()
-        }
+        doc = published_data_doc(request.gateway_token, request.encrypted_data, locrypt_formatted_data, request.data_type)
         await db.published_data.insert_one(doc)
         
         return {"message": "Sensor data published successfully", "formatted_data": locrypt_formatted_data}
@@ -201,6 +237,47 @@ async def publish_data(request: GatewayPublishRequest):
         logging.error(f"Error publishing data: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.post("/gateway/publish-batch")
+async def publish_batch(request: GatewayBatchPublishRequest):
+    """
+    Darcy gateway endpoint for publishing several sensor readings at once
+    Valid items are stored with a single bulk insert; malformed items are rejected
+    """
+    try:
+        if not request.gateway_token:
+            raise HTTPException(status_code=401, detail="Invalid gateway token")
+        if len(request.items) > MAX_BATCH_ITEMS:
+            raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_ITEMS} items")
+        
+        docs = []
+        rejected = []
+        for index, item in enumerate(request.items):
+            try:
+                data = json.loads(item.encrypted_data)
+                if not isinstance(data, dict):
+                    raise ValueError("payload is not an object")
+                formatted = format_locrypt_data(data)
+            except Exception as e:
+                rejected.append({'index': index, 'error': str(e)})
+                continue
+            docs.append(published_data_doc(request.gateway_token, item.encrypted_data, formatted, item.data_type))
+        
+        if docs:
+            await db.published_data.insert_many(docs, ordered=False)
+        
+        logging.info(f"Received radar batch: {len(docs)} stored, {len(rejected)} rejected")
+        
+        return {
+            "message": "Sensor data batch published successfully",
+            "accepted": len(docs),
+            "rejected": rejected
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Error publishing batch: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @api_router.get("/gateway/key-metrics")
 async def get_key_metrics():
     """
@@ -208,32 +285,21 @@ async def get_key_metrics():
     Matches the format shown in LoCrypt app
     """
     try:
-        status = gateway_manager.get_status()
-        data = status.get('last_published_data')
-        
-        # Find closest/most threatening target
-        closest_range = 999
-        primary_target = None
+        detection = gateway_manager.last_published_data
         
-        if data and data.get('targets'):
-            for target in data['targets']:
-                range_match = target.get('range', '999km').replace('km', '')
-                try:
-                    range_val = float(range_match)
-                    if range_val < closest_range:
-                        closest_range = range_val
-                        primary_target = target
-                except:
-                    pass
+        # Find closest/most threatening target (numeric ranges, formatted only below)
+        primary = detection.closest_target() if detection else None
+        data = detection.to_dict() if detection else None
+        primary_target = primary.to_dict() if primary else None
         
         # Return LoCrypt-compatible format
         key_metrics = {
             'radarId': data.get('radarId', 'RADAR-ALPHA-001') if data else 'RADAR-ALPHA-001',
             'detections': data.get('detections', 0) if data else 0,
-            'range': f"{closest_range}km" if primary_target else (data.get('range', 'N/A') if data else 'N/A'),
-            'bearing': primary_target.get('bearing', data.get('bearing', 'N/A')) if primary_target else (data.get('bearing', 'N/A') if data else 'N/A'),
-            'altitude': primary_target.get('altitude', data.get('altitude', 'N/A')) if primary_target else (data.get('altitude', 'N/A') if data else 'N/A'),
-            'speed': primary_target.get('speed', data.get('speed', 'N/A')) if primary_target else (data.get('speed', 'N/A') if data else 'N/A'),
+            'range': primary_target['range'] if primary_target else (data.get('range', 'N/A') if data else 'N/A'),
+            'bearing': primary_target['bearing'] if primary_target else (data.get('bearing', 'N/A') if data else 'N/A'),
+            'altitude': primary_target['altitude'] if primary_target else (data.get('altitude', 'N/A') if data else 'N/A'),
+            'speed': primary_target['speed'] if primary_target else (data.get('speed', 'N/A') if data else 'N/A'),
             'signalStrength': data.get('signalStrength', 0) if data else 0,
             'confidence': data.get('confidence', 'LOW') if data else 'LOW',
             'threatLevel': 'HIGH' if (data and data.get('detections', 0) > 2) else 'MEDIUM' if (data and data.get('detections', 0) > 0) else 'LOW',
@@ -256,6 +322,15 @@ async def get_active_predictions():
         logging.error(f"Error getting predictions: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.get("/predictions/tracks")
+async def get_prediction_tracks():
+    """Get confirmed target tracks with ETA / CPA to base"""
+    try:
+        return {"tracks": prediction_engine.get_tracks()}
+    except Exception as e:
+        logging.error(f"Error getting tracks: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @api_router.get("/predictions/history")
 async def get_prediction_history(limit: int = 10):
     """Get prediction history with results"""
@@ -315,19 +390,8 @@ async def get_current_data():
 async def calculate_danger_zones(timeline_minutes: int = 5):
     """Calculate danger zones for next N minutes"""
     try:
-        status = gateway_manager.get_status()
-        current_data = status.get('last_published_data')
-        
-        pred_list = []
-        for pred_id, pred in prediction_engine.predictions.items():
-            pred_list.append({
-                'id': pred_id,
-                'type': pred['type'],
-                'message': pred['message'],
-                'confidence': pred['confidence'],
-                'seconds_remaining': int((pred['expected_time'] - datetime.utcnow()).total_seconds()),
-                'sector': pred.get('sector', 'N')
-            })
+        current_data = gateway_manager.last_published_data
+        pred_list = prediction_summaries()
         
         zones = danger_zone_predictor.calculate_danger_zones(pred_list, current_data, timeline_minutes)
         return {"zones": zones, "count": len(zones), "base_location": danger_zone_predictor.base_location}
@@ -345,19 +409,8 @@ class LocryptShareRequest(BaseModel):
 async def share_to_locrypt(request: LocryptShareRequest):
     """Share danger zone alert to LoCrypt group"""
     try:
-        status = gateway_manager.get_status()
-        current_data = status.get('last_published_data')
-        
-        pred_list = []
-        for pred_id, pred in prediction_engine.predictions.items():
-            pred_list.append({
-                'id': pred_id,
-                'type': pred['type'],
-                'message': pred['message'],
-                'confidence': pred['confidence'],
-                'seconds_remaining': int((pred['expected_time'] - datetime.utcnow()).total_seconds()),
-                'sector': pred.get('sector', 'N')
-            })
+        current_data = gateway_manager.last_published_data
+        pred_list = prediction_summaries()
         
         zones = danger_zone_predictor.calculate_danger_zones(pred_list, current_data, 5)
         formatted_data = danger_zone_predictor.format_for_locrypt(zones, request.sos, request.group_name)
@@ -420,6 +473,138 @@ async def toggle_mock_mode(enable: bool = True):
         logging.error(f"Error toggling mock mode: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# ============= Live Push Endpoints =============
+
+def parse_topics(topics: Optional[str]) -> List[str]:
+    if not topics:
+        return list(TOPICS)
+    return [t.strip() for t in topics.split(',') if t.strip() in TOPICS]
+
+def build_snapshot(topic: str) -> Dict[str, Any]:
+    """Compute the payload of a snapshot topic (same shape as the polling endpoint)"""
+    if topic == 'status':
+        return gateway_manager.get_status()
+    if topic == 'predictions':
+        return {
+            "predictions": prediction_engine.get_active_predictions(),
+            "history": prediction_engine.get_recent_results(5),
+            "stats": prediction_engine.get_stats()
+        }
+    if topic == 'zones':
+        zones = danger_zone_predictor.calculate_danger_zones(
+            prediction_summaries(), gateway_manager.last_published_data, 5
+        )
+        return {"zones": zones, "count": len(zones), "base_location": danger_zone_predictor.base_location}
+    raise ValueError(f"Not a snapshot topic: {topic}")
+
+# Fields that change on every read; a snapshot differing only in these is not pushed
+SNAPSHOT_VOLATILE = {
+    'status': (
+        'uptime',
+        'darcy_circuit.next_probe_in_seconds',
+        'darcy_stats.queue_oldest_age_seconds',
+        'darcy_stats.spool.oldest_age_seconds',
+        'darcy_stats.circuit.next_probe_in_seconds'
+    ),
+    # Counts down every second; dashboards tick it locally between pushes.
+    # Zones need no entry: their ETA is the prediction's absolute expected time.
+    'predictions': ('predictions.seconds_remaining',)
+}
+
+async def push_snapshots():
+    """Recompute snapshot topics once per interval and push them to subscribers
+
+    A snapshot is only computed while someone subscribes to it and only sent
+    when it changed, however many dashboards are connected.
+    """
+    interval = gateway_manager.config.get('stream', {}).get('snapshot_interval', 1.0)
+    while True:
+        await asyncio.sleep(interval)
+        for topic in ('status', 'predictions', 'zones'):
+            if not event_hub.has_subscribers(topic):
+                continue
+            try:
+                event_hub.publish(topic, build_snapshot(topic), snapshot=True, volatile=SNAPSHOT_VOLATILE.get(topic, ()))
+            except Exception as e:
+                logging.error(f"Error pushing {topic} snapshot: {e}")
+
+async def expire_predictions():
+    """Validate predictions when they fall due, whether or not radar frames arrive"""
+    while True:
+        try:
+            delay = prediction_engine.expire_predictions()
+        except Exception as e:
+            logging.error(f"Error expiring predictions: {e}")
+            delay = None
+        interval = prediction_engine.expiry_interval
+        await asyncio.sleep(interval if delay is None else min(delay, interval))
+
+@api_router.websocket("/ws")
+async def websocket_feed(websocket: WebSocket, topics: Optional[str] = None):
+    """Live feed over WebSocket
+
+    Subscribe with ?topics=detections,status,predictions,zones or by sending
+    {"subscribe": [...]} at any time.
+    """
+    await websocket.accept()
+    subscription = event_hub.subscribe(parse_topics(topics))
+    
+    async def receive_commands():
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except ValueError:
+                await websocket.send_json({'error': 'Messages must be JSON'})
+                continue
+            if not isinstance(message, dict) or 'subscribe' not in message:
+                await websocket.send_json({'error': 'Expected {"subscribe": [topics]}'})
+                continue
+            topics = message['subscribe']
+            if not isinstance(topics, list) or not all(isinstance(t, str) for t in topics):
+                await websocket.send_json({'error': 'subscribe must be a list of topic names'})
+                continue
+            unknown = [t for t in topics if t not in TOPICS]
+            if unknown:
+                await websocket.send_json({'error': f"Unknown topics: {', '.join(unknown)}", 'topics': list(TOPICS)})
+                continue
+            event_hub.set_topics(subscription, topics)
+                
+    receiver = asyncio.create_task(receive_commands())
+    try:
+        while not receiver.done():
+            for _, message in await subscription.next_messages(timeout=1.0):
+                await websocket.send_text(message)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logging.error(f"WebSocket feed error: {e}")
+    finally:
+        receiver.cancel()
+        event_hub.unsubscribe(subscription)
+
+@api_router.get("/stream")
+async def event_stream(request: Request, topics: Optional[str] = None):
+    """Live feed as Server-Sent Events (one event type per topic)"""
+    subscription = event_hub.subscribe(parse_topics(topics))
+    
+    async def events():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                messages = await subscription.next_messages(timeout=15.0)
+                if not messages:
+                    yield ": keepalive\n\n"
+                    continue
+                yield ''.join(f"event: {topic}\ndata: {message}\n\n" for topic, message in messages)
+        finally:
+            event_hub.unsubscribe(subscription)
+            
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # ============= Legacy Endpoints =============
 
 @api_router.post("/status", response_model=StatusCheck)
@@ -461,6 +646,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def start_background_tasks():
+    app.state.push_task = asyncio.create_task(push_snapshots())
+    app.state.expiry_task = asyncio.create_task(expire_predictions())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    app.state.push_task.cancel()
+    app.state.expiry_task.cancel()
+    if gateway_manager.darcy_client:
+        await gateway_manager.darcy_client.close()
+        gateway_manager.darcy_client.close_spool()
     client.close()
\ No newline at end of file
@@ -0,0 +1,239 @@
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+import numpy as np
+from geodesy import base_frame
+from radar_models import KNOT
+
+logger = logging.getLogger(__name__)
+
+# Roughly the realistic mock's patterns: east every 20 s, north every 30 s, west every 60 s, plus strays
+DEFAULT_PATTERNS = [
+    {'name': 'east', 'bearing': [85, 95], 'range_km': [42, 48], 'rate': 1 / 20},
+    {'name': 'north', 'bearing': [-10, 10], 'range_km': [40, 47], 'rate': 1 / 30},
+    {'name': 'west', 'bearing': [265, 275], 'range_km': [38, 46], 'rate': 1 / 60},
+    {'name': 'random', 'bearing': [0, 360], 'range_km': [35, 48], 'rate': 1 / 50}
+]
+
+class SwarmSimulator:
+    """Deterministic NumPy simulation of many inbound targets, one radar frame per scan
+
+    Target state (east/north position and velocity in metres, altitude, spawn
+    time) lives in arrays, so moving, pruning and measuring thousands of
+    targets is a handful of vector operations per scan. Every random draw
+    comes from one seeded generator and time advances by exactly one scan
+    period per frame, so the same config always produces the same frames.
+
+    Spawn patterns are Poisson sources: `rate` targets per second appear at a
+    bearing and range drawn uniformly from the given intervals and fly toward
+    the base (within `heading_spread_deg`) at a speed drawn from `speed_kts`.
+    """
+
+    def __init__(self, seed: Optional[int] = 0, scan_rate: float = 10.0, max_targets: int = 5000,
+                 initial_targets: int = 0, patterns: Optional[List[Dict[str, Any]]] = None,
+                 clutter_rate: float = 0.0, range_noise_m: float = 0.0, bearing_noise_deg: float = 0.0,
+                 turn_noise_deg: float = 0.0, min_range_km: float = 0.5, max_range_km: float = 50.0,
+                 max_age_seconds: float = 300.0, start_time: Optional[datetime] = None):
+        self.seed = seed
+        self.scan_rate = scan_rate
+        self.period = 1.0 / scan_rate if scan_rate > 0 else 0.1  # Simulated time per scan
+        self.max_targets = max_targets
+        self.patterns = [self._pattern(p) for p in (patterns or DEFAULT_PATTERNS)]
+        self.clutter_rate = clutter_rate
+        self.range_noise_m = range_noise_m
+        self.bearing_noise_deg = bearing_noise_deg
+        self.turn_noise = np.radians(turn_noise_deg)
+        self.min_range_m = min_range_km * 1000
+        self.max_range_m = max_range_km * 1000
+        self.max_age_seconds = max_age_seconds
+        self.start_time = start_time
+
+        self.rng = np.random.default_rng(seed)
+        self.time = 0.0
+        self.scans = 0
+        self.target_counter = 0
+        self.clutter_counter = 0
+        self.ids = np.empty(0, dtype=np.int64)
+        self.state = np.empty((0, 4))  # x, y, vx, vy
+        self.altitude = np.empty(0)
+        self.born = np.empty(0)
+        self.stats = {'spawned': 0, 'removed': 0, 'false_alarms': 0}
+        if initial_targets:
+            self._spawn_initial(initial_targets)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'SwarmSimulator':
+        start_time = config.get('start_time')
+        return cls(
+            seed=config.get('seed', 0),
+            scan_rate=config.get('scan_rate', 10.0),
+            max_targets=config.get('max_targets', 5000),
+            initial_targets=config.get('initial_targets', 0),
+            patterns=config.get('patterns'),
+            clutter_rate=config.get('clutter_rate', 0.0),
+            range_noise_m=config.get('range_noise_m', 0.0),
+            bearing_noise_deg=config.get('bearing_noise_deg', 0.0),
+            turn_noise_deg=config.get('turn_noise_deg', 0.0),
+            min_range_km=config.get('min_range_km', 0.5),
+            max_range_km=config.get('max_range_km', 50.0),
+            max_age_seconds=config.get('max_age_seconds', 300.0),
+            start_time=datetime.fromisoformat(start_time) if start_time else None
+        )
+
+    @staticmethod
+    def _pattern(config: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'name': config.get('name', 'pattern'),
+            'bearing': config.get('bearing', [0, 360]),
+            'range_km': config.get('range_km', [35, 48]),
+            'rate': config.get('rate', 0.0),
+            'speed_kts': config.get('speed_kts', [60, 140]),
+            'altitude_m': config.get('altitude_m', [100, 600]),
+            'heading_spread_deg': config.get('heading_spread_deg', 0.0)
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _spawn_initial(self, count: int):
+        """Start with `count` targets split across the patterns in proportion to their rates"""
+        rates = np.array([p['rate'] for p in self.patterns], dtype=np.float64)
+        weights = rates / rates.sum() if rates.sum() > 0 else np.full(len(rates), 1 / len(rates))
+        for pattern, n in zip(self.patterns, self.rng.multinomial(count, weights).tolist()):
+            self._spawn(pattern, n)
+
+    def _spawn(self, pattern: Dict[str, Any], count: int):
+        count = min(count, self.max_targets - len(self.ids))
+        if count <= 0:
+            return
+        bearing = np.radians(self.rng.uniform(*pattern['bearing'], size=count))
+        range_m = self.rng.uniform(*pattern['range_km'], size=count) * 1000
+        speed = self.rng.uniform(*pattern['speed_kts'], size=count) * KNOT
+        heading = bearing + np.pi + np.radians(self.rng.uniform(-1, 1, size=count) * pattern['heading_spread_deg'])
+
+        state = np.column_stack((
+            range_m * np.sin(bearing), range_m * np.cos(bearing),
+            speed * np.sin(heading), speed * np.cos(heading)
+        ))
+        self.ids = np.concatenate((self.ids, np.arange(self.target_counter + 1, self.target_counter + count + 1)))
+        self.target_counter += count
+        self.state = np.vstack((self.state, state))
+        self.altitude = np.concatenate((self.altitude, self.rng.uniform(*pattern['altitude_m'], size=count)))
+        self.born = np.concatenate((self.born, np.full(count, self.time)))
+        self.stats['spawned'] += count
+
+    def step(self):
+        """Advance the simulation by one scan period: spawn, move, prune"""
+        dt = self.period
+        self.time += dt
+        for pattern, count in zip(self.patterns, self.rng.poisson([p['rate'] * dt for p in self.patterns]).tolist()):
+            if count:
+                self._spawn(pattern, count)
+
+        if self.turn_noise and len(self.ids):
+            turn = self.rng.normal(0.0, self.turn_noise * np.sqrt(dt), size=len(self.ids))
+            cos_t, sin_t = np.cos(turn), np.sin(turn)
+            vx, vy = self.state[:, 2].copy(), self.state[:, 3].copy()
+            self.state[:, 2] = vx * cos_t + vy * sin_t
+            self.state[:, 3] = vy * cos_t - vx * sin_t
+        self.state[:, :2] += self.state[:, 2:] * dt
+
+        range_m = np.hypot(self.state[:, 0], self.state[:, 1])
+        keep = (range_m >= self.min_range_m) & (range_m <= self.max_range_m) & (self.time - self.born <= self.max_age_seconds)
+        if not keep.all():
+            self.stats['removed'] += len(keep) - int(np.count_nonzero(keep))
+            self.ids = self.ids[keep]
+            self.state = self.state[keep]
+            self.altitude = self.altitude[keep]
+            self.born = self.born[keep]
+
+    def measure(self) -> Dict[str, np.ndarray]:
+        """Noisy range/bearing of every target plus this scan's false alarms"""
+        count = len(self.ids)
+        range_m = np.hypot(self.state[:, 0], self.state[:, 1])
+        bearing = np.degrees(np.arctan2(self.state[:, 0], self.state[:, 1]))
+        if self.range_noise_m:
+            range_m = np.maximum(range_m + self.rng.normal(0.0, self.range_noise_m, size=count), 0.0)
+        if self.bearing_noise_deg:
+            bearing = bearing + self.rng.normal(0.0, self.bearing_noise_deg, size=count)
+        speed = np.hypot(self.state[:, 2], self.state[:, 3])
+        altitude = self.altitude
+        labels = [f"TGT-{i:04d}" for i in self.ids.tolist()]
+
+        false_alarms = int(self.rng.poisson(self.clutter_rate)) if self.clutter_rate else 0
+        if false_alarms:
+            # Uniform over the covered disc
+            clutter_range = self.max_range_m * np.sqrt(self.rng.uniform(0, 1, size=false_alarms))
+            range_m = np.concatenate((range_m, clutter_range))
+            bearing = np.concatenate((bearing, self.rng.uniform(0, 360, size=false_alarms)))
+            speed = np.concatenate((speed, self.rng.uniform(0, 20, size=false_alarms)))
+            altitude = np.concatenate((altitude, self.rng.uniform(0, 300, size=false_alarms)))
+            labels += [f"FA-{self.clutter_counter + i + 1:05d}" for i in range(false_alarms)]
+            self.clutter_counter += false_alarms
+            self.stats['false_alarms'] += false_alarms
+
+        lat, lon = base_frame.destination(range_m, bearing)
+        return {
+            'labels': labels,
+            'range_m': range_m,
+            'bearing_deg': bearing % 360,
+            'altitude_m': altitude,
+            'speed_ms': speed,
+            'latitude': lat,
+            'longitude': lon
+        }
+
+    def next_frame(self, anchor: datetime) -> Dict[str, Any]:
+        """Step once and return the scan as one raw frame (the realistic mock's JSON layout)"""
+        self.step()
+        self.scans += 1
+        scan = self.measure()
+
+        targets = [
+            {
+                'id': label,
+                'type': 'DRONE',
+                'range': f"{r / 1000:.3f}km",
+                'bearing': f"{b:05.1f}°",
+                'altitude': f"{int(a)}m",
+                'speed': f"{int(s / KNOT)}kts",
+                'latitude': round(la, 6),
+                'longitude': round(lo, 6)
+            }
+            for label, r, b, a, s, la, lo in zip(
+                scan['labels'], scan['range_m'].tolist(), scan['bearing_deg'].tolist(),
+                scan['altitude_m'].tolist(), scan['speed_ms'].tolist(),
+                scan['latitude'].tolist(), scan['longitude'].tolist()
+            )
+        ]
+        main = targets[int(np.argmin(scan['range_m']))] if targets else None
+        signal_strength = int(self.rng.integers(70, 96)) if targets else int(self.rng.integers(30, 51))
+        confidence = 'HIGH' if signal_strength > 80 else 'MEDIUM' if signal_strength > 60 else 'LOW'
+        timestamp = (self.start_time or anchor) + timedelta(seconds=self.time)
+
+        return {
+            'raw_data': json.dumps({
+                'detections': len(targets),
+                'range': main['range'] if main else '0km',
+                'bearing': main['bearing'] if main else '000°',
+                'altitude': main['altitude'] if main else '0m',
+                'speed': main['speed'] if main else '0kts',
+                'confidence': confidence,
+                'signalStrength': signal_strength,
+                'latitude': main['latitude'] if main else base_frame.lat,
+                'longitude': main['longitude'] if main else base_frame.lon,
+                'targets': targets
+            }),
+            'source': 'mock_swarm',
+            'timestamp': timestamp.isoformat(),
+            'detection_count': self.scans
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'scans': self.scans,
+            'simulated_seconds': round(self.time, 1),
+            'active_targets': len(self.ids),
+            **self.stats
+        }
@@ -0,0 +1,284 @@
+import logging
+import math
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from radar_models import Detection, format_range, format_bearing, format_speed
+
+logger = logging.getLogger(__name__)
+
+MIN_VELOCITY_DT = 0.1  # seconds
+
+class MultiTargetTracker:
+    """Alpha-beta tracker with gated global-nearest-neighbour association
+
+    Tracks live in a local east/north plane (metres) centred on the base, and
+    their state is held in NumPy arrays (one row per track), so prediction,
+    gating and the filter update are vector operations over every track in a
+    scan. Association builds one tracks x measurements distance matrix, drops
+    pairs outside the gate and assigns the remaining pairs greedily, closest
+    first.
+
+    A measurement nobody claims starts a tentative track; a track is confirmed
+    after `confirm_hits` updates and dropped after `coast_seconds` without
+    one (time based, so frames from several radars do not count as misses
+    against each other's tracks).
+    """
+
+    def __init__(self, alpha: float = 0.5, beta: float = 0.1, gate_m: float = 1500.0,
+                 max_speed_ms: float = 100.0, confirm_hits: int = 3, coast_seconds: float = 15.0,
+                 max_tracks: int = 2000):
+        self.alpha = alpha
+        self.beta = beta
+        self.gate_m = gate_m
+        self.max_speed_ms = max_speed_ms
+        self.confirm_hits = confirm_hits
+        self.coast_seconds = coast_seconds
+        self.max_tracks = max_tracks
+
+        self.ids: List[str] = []
+        self.labels: List[str] = []  # Target id reported by the radar, for display
+        self.state = np.empty((0, 4))  # x, y, vx, vy
+        self.altitude = np.empty(0)
+        self.hits = np.empty(0, dtype=np.int64)
+        self.updated_at = np.empty(0)
+        self.track_counter = 0
+
+        self.stats = {
+            'scans': 0,
+            'measurements': 0,
+            'associated': 0,
+            'tracks_started': 0,
+            'tracks_confirmed': 0,
+            'tracks_dropped': 0
+        }
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'MultiTargetTracker':
+        return cls(
+            alpha=config.get('alpha', 0.5),
+            beta=config.get('beta', 0.1),
+            gate_m=config.get('gate_m', 1500.0),
+            max_speed_ms=config.get('max_speed_ms', 100.0),
+            confirm_hits=config.get('confirm_hits', 3),
+            coast_seconds=config.get('coast_seconds', 15.0),
+            max_tracks=config.get('max_tracks', 2000)
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @staticmethod
+    def measurements(detection: Detection) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Targets with range and bearing -> (labels, east/north positions, altitudes)
+
+        Frames without a target list (e.g. the custom format) contribute their
+        frame-level range/bearing as one measurement.
+        """
+        labels, ranges, bearings, altitudes = [], [], [], []
+        for target in detection.targets:
+            if target.range_m is None or target.bearing_deg is None:
+                continue
+            labels.append(target.id)
+            ranges.append(target.range_m)
+            bearings.append(target.bearing_deg)
+            altitudes.append(np.nan if target.altitude_m is None else target.altitude_m)
+
+        if not labels and detection.detections > 0 and detection.range_m is not None and detection.bearing_deg is not None:
+            labels.append('')
+            ranges.append(detection.range_m)
+            bearings.append(detection.bearing_deg)
+            altitudes.append(np.nan if detection.altitude_m is None else detection.altitude_m)
+
+        theta = np.radians(np.asarray(bearings, dtype=np.float64))
+        rng = np.asarray(ranges, dtype=np.float64)
+        positions = np.column_stack((rng * np.sin(theta), rng * np.cos(theta)))
+        return labels, positions, np.asarray(altitudes, dtype=np.float64)
+
+    def update(self, detection: Detection, now: float) -> int:
+        """Run one scan (predict, associate, update, birth/death); returns the number of live tracks"""
+        labels, positions, altitudes = self.measurements(detection)
+        self.stats['scans'] += 1
+        self.stats['measurements'] += len(labels)
+
+        track_rows, meas_cols = self._associate(positions, now)
+        self._update_tracks(track_rows, meas_cols, positions, altitudes, labels, now)
+
+        claimed = np.zeros(len(labels), dtype=bool)
+        claimed[meas_cols] = True
+        unmatched = np.flatnonzero(~claimed)
+        if len(unmatched):
+            self._start_tracks(unmatched, positions, altitudes, labels, now)
+
+        self._drop_stale(now)
+        return len(self.ids)
+
+    def _associate(self, positions: np.ndarray, now: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Gated greedy global-nearest-neighbour assignment of measurements to tracks"""
+        empty = np.empty(0, dtype=np.int64)
+        if not len(self.ids) or not len(positions):
+            return empty, empty
+
+        dt = np.maximum(now - self.updated_at, 0.0)
+        predicted = self.state[:, :2] + self.state[:, 2:] * dt[:, None]
+        distance = np.hypot(
+            predicted[:, 0, None] - positions[None, :, 0],
+            predicted[:, 1, None] - positions[None, :, 1]
+        )
+
+        # Single-hit tracks have no velocity yet: widen their gate by how far a target can fly
+        gate = self.gate_m + np.where(self.hits == 1, self.max_speed_ms * dt, 0.0)
+        rows, cols = np.nonzero(distance <= gate[:, None])
+        if not len(rows):
+            return empty, empty
+
+        order = np.argsort(distance[rows, cols], kind='stable')
+        track_used = np.zeros(len(self.ids), dtype=bool)
+        meas_used = np.zeros(len(positions), dtype=bool)
+        track_rows, meas_cols = [], []
+        for row, col in zip(rows[order].tolist(), cols[order].tolist()):
+            if track_used[row] or meas_used[col]:
+                continue
+            track_used[row] = True
+            meas_used[col] = True
+            track_rows.append(row)
+            meas_cols.append(col)
+        return np.asarray(track_rows, dtype=np.int64), np.asarray(meas_cols, dtype=np.int64)
+
+    def _update_tracks(self, rows: np.ndarray, cols: np.ndarray, positions: np.ndarray,
+                       altitudes: np.ndarray, labels: List[str], now: float):
+        """Alpha-beta update of every associated track at once"""
+        if not len(rows):
+            return
+        self.stats['associated'] += len(rows)
+
+        dt = np.maximum(now - self.updated_at[rows], 1e-3)
+        position = self.state[rows, :2] + self.state[rows, 2:] * dt[:, None]
+        velocity = self.state[rows, 2:]
+        residual = positions[cols] - position
+
+        # Second hit: initialise velocity from the two points instead of easing in with beta
+        second = self.hits[rows] == 1
+        gain = np.where(second, 1.0, self.alpha)
+        rate = np.where(second, 1.0, self.beta) / dt
+        rate[dt < MIN_VELOCITY_DT] = 0.0  # Same-instant frames carry no velocity information
+
+        self.state[rows, :2] = position + gain[:, None] * residual
+        self.state[rows, 2:] = velocity + rate[:, None] * residual
+        measured_altitude = altitudes[cols]
+        self.altitude[rows] = np.where(np.isnan(measured_altitude), self.altitude[rows], measured_altitude)
+        self.hits[rows] += 1
+        self.updated_at[rows] = now
+
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            if labels[col]:
+                self.labels[row] = labels[col]
+        self.stats['tracks_confirmed'] += int(np.count_nonzero(self.hits[rows] == self.confirm_hits))
+
+    def _start_tracks(self, cols: np.ndarray, positions: np.ndarray, altitudes: np.ndarray,
+                      labels: List[str], now: float):
+        room = self.max_tracks - len(self.ids)
+        if room <= 0:
+            return
+        cols = cols[:room]
+        count = len(cols)
+
+        for col in cols.tolist():
+            self.track_counter += 1
+            self.ids.append(f"TRK-{self.track_counter:04d}")
+            self.labels.append(labels[col])
+        self.state = np.vstack((self.state, np.column_stack((positions[cols], np.zeros((count, 2))))))
+        self.altitude = np.concatenate((self.altitude, altitudes[cols]))
+        self.hits = np.concatenate((self.hits, np.ones(count, dtype=np.int64)))
+        self.updated_at = np.concatenate((self.updated_at, np.full(count, now)))
+        self.stats['tracks_started'] += count
+
+    def _drop_stale(self, now: float):
+        keep = (now - self.updated_at) <= self.coast_seconds
+        if keep.all():
+            return
+        dropped = len(keep) - int(np.count_nonzero(keep))
+        self.stats['tracks_dropped'] += dropped
+        indices = np.flatnonzero(keep).tolist()
+        self.ids = [self.ids[i] for i in indices]
+        self.labels = [self.labels[i] for i in indices]
+        self.state = self.state[keep]
+        self.altitude = self.altitude[keep]
+        self.hits = self.hits[keep]
+        self.updated_at = self.updated_at[keep]
+        logger.debug(f"Dropped {dropped} stale tracks, {len(self.ids)} live")
+
+    def confirmed(self) -> np.ndarray:
+        return self.hits >= self.confirm_hits
+
+    def extrapolate(self, horizon: float, now: float) -> np.ndarray:
+        """Positions (east, north in metres) of every track `horizon` seconds after now"""
+        dt = (now - self.updated_at) + horizon
+        return self.state[:, :2] + self.state[:, 2:] * dt[:, None]
+
+    def threat_geometry(self, now: float) -> Dict[str, np.ndarray]:
+        """Range, closing speed, ETA and closest point of approach to the base for every track
+
+        ETA is range / closing speed (inf when opening); CPA assumes the track
+        keeps its current velocity.
+        """
+        position = self.extrapolate(0.0, now)
+        velocity = self.state[:, 2:]
+        range_m = np.hypot(position[:, 0], position[:, 1])
+        radial = np.einsum('ij,ij->i', position, velocity)
+        speed_sq = np.einsum('ij,ij->i', velocity, velocity)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            closing = np.where(range_m > 0, -radial / range_m, 0.0)
+            eta = np.where(closing > 0, range_m / closing, np.inf)
+            tcpa = np.where(speed_sq > 0, np.maximum(-radial / speed_sq, 0.0), 0.0)
+        cpa = np.hypot(position[:, 0] + velocity[:, 0] * tcpa, position[:, 1] + velocity[:, 1] * tcpa)
+        return {
+            'range_m': range_m,
+            'bearing_deg': np.degrees(np.arctan2(position[:, 0], position[:, 1])) % 360,
+            'speed_ms': np.sqrt(speed_sq),
+            'heading_deg': np.degrees(np.arctan2(velocity[:, 0], velocity[:, 1])) % 360,
+            'closing_ms': closing,
+            'eta_s': eta,
+            'cpa_m': cpa,
+            'tcpa_s': tcpa
+        }
+
+    def track_state(self, track_id: str, now: float) -> Optional[Tuple[np.ndarray, float]]:
+        """(extrapolated position, time of last update) of a live track; None once it was dropped"""
+        try:
+            row = self.ids.index(track_id)
+        except ValueError:
+            return None
+        updated_at = float(self.updated_at[row])
+        return self.state[row, :2] + self.state[row, 2:] * (now - updated_at), updated_at
+
+    def get_tracks(self, now: float, confirmed_only: bool = True) -> List[Dict[str, Any]]:
+        """Track table for the API (display units like the rest of the payloads)"""
+        geometry = self.threat_geometry(now)
+        mask = self.confirmed() if confirmed_only else np.ones(len(self.ids), dtype=bool)
+        tracks = []
+        for i in np.flatnonzero(mask).tolist():
+            eta = float(geometry['eta_s'][i])
+            altitude = float(self.altitude[i])
+            tracks.append({
+                'id': self.ids[i],
+                'target_id': self.labels[i],
+                'range': format_range(float(geometry['range_m'][i])),
+                'bearing': format_bearing(float(geometry['bearing_deg'][i])),
+                'altitude': None if math.isnan(altitude) else round(altitude),
+                'speed': format_speed(float(geometry['speed_ms'][i])),
+                'heading': round(float(geometry['heading_deg'][i])),
+                'eta_seconds': round(eta) if math.isfinite(eta) else None,
+                'cpa_km': round(float(geometry['cpa_m'][i]) / 1000, 2),
+                'tcpa_seconds': round(float(geometry['tcpa_s'][i])),
+                'hits': int(self.hits[i]),
+                'age_seconds': round(now - float(self.updated_at[i]), 1)
+            })
+        return tracks
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'live_tracks': len(self.ids),
+            'confirmed_tracks': int(np.count_nonzero(self.confirmed())),
+            **self.stats
+        }
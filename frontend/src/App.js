@@ -10,6 +10,7 @@ import { AIPredictionWidget } from './components/AIPrediction';
 import { DangerZoneMap, LocryptShareModal } from './components/LocryptShare';
 import { TargetDetailModal } from './components/TargetDetailModal';
 import { PredictionModal } from './components/PredictionModal';
+import { useEventStream, useCountdown } from './hooks/use-event-stream';
 import '@/App.css';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8001';
@@ -46,17 +47,29 @@ function App() {
   const [radarZoom, setRadarZoom] = useState(50); // 50km, 20km, or 5km
   const [showMapBackground, setShowMapBackground] = useState(false); // 'standard' or 'easy'
 
+  const [predictions, setPredictions] = useState([]);
+
+  // Live push feed; while it is up, polling below skips what the stream delivers
+  const streaming = useEventStream(API, ['status', 'detections', 'predictions'], (topic, payload) => {
+    if (topic === 'status') setStatus(payload);
+    else if (topic === 'detections') setStatus(s => s ? { ...s, last_published_data: payload } : s);
+    else if (topic === 'predictions') setPredictions(payload.predictions || []);
+  });
+  const livePredictions = useCountdown(predictions);
+
   useEffect(() => {
-    fetchData();
-    const interval = setInterval(() => fetchData(), 2000);
+    fetchData(!streaming);
+    const interval = setInterval(() => fetchData(!streaming), 2000);
     return () => clearInterval(interval);
-  }, []);
+  }, [streaming]);
 
-  const fetchData = async () => {
-    try {
-      const r = await axios.get(`${API}/gateway/status`);
-      setStatus(r.data);
-    } catch (e) {}
+  const fetchData = async (includeStatus = true) => {
+    if (includeStatus) {
+      try {
+        const r = await axios.get(`${API}/gateway/status`);
+        setStatus(r.data);
+      } catch (e) {}
+    }
     
     try {
       const r = await axios.get(`${API}/gateway/config`);
@@ -138,8 +151,6 @@ function App() {
   const targets = data?.targets || [];
   const hasGateway = config?.darcy?.gateway_token && config?.darcy?.gateway_token.length > 10;
 
-  const [predictions, setPredictions] = useState([]);
-
   useEffect(() => {
     const fetchPredictions = async () => {
       try {
@@ -147,12 +158,12 @@ function App() {
         setPredictions(response.data.predictions || []);
       } catch (e) {}
     };
-    if (status?.is_running) {
+    if (status?.is_running && !streaming) {
       fetchPredictions();
       const interval = setInterval(fetchPredictions, 3000);
       return () => clearInterval(interval);
     }
-  }, [status?.is_running]);
+  }, [status?.is_running, streaming]);
 
   useEffect(() => {
     if (targets.length > 0) {
@@ -254,7 +265,7 @@ function App() {
                 hasGateway={hasGateway}
                 setSelectedTarget={setSelectedTarget}
                 setSelectedPrediction={setSelectedPrediction}
-                predictions={predictions}
+                predictions={livePredictions}
                 showPredictions={showPredictions}
                 radarZoom={radarZoom}
                 setRadarZoom={setRadarZoom}
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import { Brain, Clock } from 'lucide-react';
+import { useEventStream, useCountdown } from '../hooks/use-event-stream';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8001';
 const API = `${BACKEND_URL}/api`;
@@ -11,11 +12,19 @@ export function AIPredictionWidget({ colors }) {
   const [stats, setStats] = useState(null);
   const [timeline, setTimeline] = useState(30);
 
+  const streaming = useEventStream(API, ['predictions'], (topic, payload) => {
+    setPredictions(payload.predictions || []);
+    setHistory(payload.history || []);
+    setStats(payload.stats);
+  });
+  const livePredictions = useCountdown(predictions);
+
   useEffect(() => {
+    if (streaming) return;
     fetchPredictions();
     const interval = setInterval(() => fetchPredictions(), 3000);
     return () => clearInterval(interval);
-  }, []);
+  }, [streaming]);
 
   const fetchPredictions = async () => {
     try {
@@ -63,11 +72,11 @@ export function AIPredictionWidget({ colors }) {
       </div>
       <div style={{ marginBottom: 6 }}>
         <div style={{ fontSize: 7, fontWeight: 'bold', color: colors.textMuted, marginBottom: 2 }}>ACTIVE:</div>
-        {predictions.length === 0 ? (
+        {livePredictions.length === 0 ? (
           <div style={{ color: colors.textMuted, fontSize: 7 }}>No predictions</div>
         ) : (
           <div style={{ maxHeight: 80, overflowY: 'auto', overflowX: 'hidden' }}>
-            {predictions.map((p, i) => (
+            {livePredictions.map((p, i) => (
               <div key={i} style={{ 
                 marginBottom: 3, 
                 padding: 3, 
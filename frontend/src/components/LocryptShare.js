@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useRef } from 'react';
 import axios from 'axios';
 import { MapPin, Share2, AlertTriangle, Users } from 'lucide-react';
+import { useEventStream } from '../hooks/use-event-stream';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8001';
 const API = `${BACKEND_URL}/api`;
@@ -9,11 +10,14 @@ export function DangerZoneMap({ colors, data, targets }) {
   const [zones, setZones] = useState([]);
   const canvasRef = useRef(null);
 
+  const streaming = useEventStream(API, ['zones'], (topic, payload) => setZones(payload.zones || []));
+
   useEffect(() => {
+    if (streaming) return;
     fetchZones();
     const interval = setInterval(() => fetchZones(), 5000);
     return () => clearInterval(interval);
-  }, []);
+  }, [streaming]);
 
   const fetchZones = async () => {
     try {
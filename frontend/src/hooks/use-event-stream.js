@@ -0,0 +1,106 @@
+import { useEffect, useMemo, useRef, useState } from 'react';
+
+// One server-sent event connection (/api/stream) shared by every component
+// on the page. It carries the union of the topics currently subscribed and
+// is reopened only when that set changes.
+const handlers = new Map(); // topic -> Set of callbacks
+const lastPayloads = new Map(); // topic -> latest payload, for late subscribers
+const connectionListeners = new Set();
+let source = null;
+let sourceTopics = '';
+let sourceApi = '';
+let open = false;
+let syncScheduled = false;
+
+function setOpen(value) {
+  open = value;
+  connectionListeners.forEach(listener => listener(value));
+}
+
+function wantedTopics() {
+  return [...handlers.keys()].filter(topic => handlers.get(topic).size > 0).sort().join(',');
+}
+
+function sync(api) {
+  syncScheduled = false;
+  const topics = wantedTopics();
+  if (source && topics === sourceTopics && api === sourceApi) return;
+  if (source) {
+    source.close();
+    source = null;
+    setOpen(false);
+  }
+  sourceTopics = topics;
+  sourceApi = api;
+  if (!topics) return;
+  source = new EventSource(`${api}/stream?topics=${topics}`);
+  source.onopen = () => setOpen(true);
+  source.onerror = () => setOpen(false); // EventSource reconnects by itself
+  topics.split(',').forEach(topic => {
+    source.addEventListener(topic, (e) => {
+      let payload;
+      try {
+        payload = JSON.parse(e.data).data;
+      } catch (err) {
+        return;
+      }
+      lastPayloads.set(topic, payload);
+      (handlers.get(topic) || []).forEach(handler => handler(topic, payload));
+    });
+  });
+}
+
+// Components mount in one commit; coalesce their subscriptions into one (re)connect
+function scheduleSync(api) {
+  if (syncScheduled) return;
+  syncScheduled = true;
+  setTimeout(() => sync(api), 0);
+}
+
+// Subscribes to topics on the shared feed.
+// Returns true while the stream is open so callers can fall back to polling.
+export function useEventStream(api, topics, onEvent) {
+  const [connected, setConnected] = useState(open);
+  const handlerRef = useRef(onEvent);
+  handlerRef.current = onEvent;
+  const topicList = topics.join(',');
+
+  useEffect(() => {
+    if (typeof EventSource === 'undefined') return;
+    const handler = (topic, payload) => handlerRef.current(topic, payload);
+    const names = topicList.split(',');
+    names.forEach(topic => {
+      if (!handlers.has(topic)) handlers.set(topic, new Set());
+      handlers.get(topic).add(handler);
+      if (lastPayloads.has(topic)) handler(topic, lastPayloads.get(topic));
+    });
+    connectionListeners.add(setConnected);
+    setConnected(open && names.every(topic => sourceTopics.split(',').includes(topic)));
+    scheduleSync(api);
+    return () => {
+      names.forEach(topic => handlers.get(topic).delete(handler));
+      connectionListeners.delete(setConnected);
+      scheduleSync(api);
+    };
+  }, [api, topicList]);
+
+  return connected;
+}
+
+// Ticks `seconds_remaining` down locally; the server only pushes a
+// predictions snapshot when something other than the countdown changed.
+export function useCountdown(items) {
+  const [now, setNow] = useState(() => Date.now());
+  const receivedAt = useMemo(() => Date.now(), [items]);
+
+  useEffect(() => {
+    const interval = setInterval(() => setNow(Date.now()), 1000);
+    return () => clearInterval(interval);
+  }, []);
+
+  const elapsed = Math.max(0, Math.floor((now - receivedAt) / 1000));
+  return useMemo(
+    () => elapsed === 0 ? items : items.map(item => ({ ...item, seconds_remaining: Math.max(0, item.seconds_remaining - elapsed) })),
+    [items, elapsed]
+  );
+}
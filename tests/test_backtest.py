@@ -0,0 +1,43 @@
+import json
+import random
+from datetime import datetime, timedelta
+
+import backtest
+
+TIMING = ('latency_us_mean', 'latency_us_p95', 'replay_seconds')
+
+
+def write_capture(path, frames=400):
+    rng = random.Random(3)
+    start = datetime(2026, 1, 1, 12)
+    with open(path, 'w') as f:
+        for i in range(frames):
+            moment = start + timedelta(seconds=i * 2)
+            if rng.random() < 0.2:
+                record = {'detections': 0}
+            else:
+                # One drone closing in from the east plus scattered returns
+                range_km = max(1.0, 30.0 - i * 0.1) if i % 3 else rng.uniform(2, 45)
+                bearing = 90.0 + rng.gauss(0, 1) if i % 3 else rng.uniform(0, 360)
+                record = {'detections': rng.randint(1, 4), 'range': f"{range_km:.2f}km", 'bearing': round(bearing, 1)}
+            f.write(json.dumps({'timestamp': moment.isoformat() + 'Z', 'data': json.dumps(record)}) + '\n')
+
+
+def without_timing(results):
+    return [{k: v for k, v in r.items() if k not in TIMING} for r in results]
+
+
+def test_same_capture_and_seed_give_identical_results(tmp_path):
+    path = str(tmp_path / 'capture.jsonl')
+    write_capture(path)
+
+    def run():
+        detections = backtest.load_detections(backtest.read_records(path))
+        shadow = backtest.replay_shadow(detections, [5, 30], {}, seed=4)
+        separate = [backtest.replay(detections, t, {}, seed=4) for t in (5, 30)]
+        return without_timing(shadow), without_timing(separate)
+
+    first = run()
+    assert first == run()
+    shadow, separate = first
+    assert all(r['predictions'] > 0 for r in shadow + separate)
@@ -0,0 +1,108 @@
+import asyncio
+import gzip
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from capture_file import CaptureIndex, open_capture, parse_line, seek_capture
+from radar_connector import FileRadarConnector
+
+START = datetime(2026, 1, 1)
+FRAMES = 600  # 10 Hz for 60 s
+
+def capture_lines():
+    lines = ['# recorded capture']
+    for i in range(FRAMES):
+        stamp = (START + timedelta(seconds=i / 10)).isoformat() + 'Z'
+        if i % 2:
+            lines.append(json.dumps({'raw_data': f'DET:1 RNG:{i % 40}km BRG:{i % 360:03d}', 'timestamp': stamp, 'source': 'tcp'}))
+        else:
+            lines.append(f"{stamp}\tDET:1 RNG:3.5km BRG:{i % 360:03d}")
+    return '\n'.join(lines) + '\n'
+
+def write_capture(tmp_path, suffix):
+    data = capture_lines().encode()
+    path = str(tmp_path / f"capture.txt{suffix}")
+    if suffix == '.gz':
+        with gzip.open(path, 'wb') as f:
+            f.write(data)
+    elif suffix == '.zst':
+        zstandard = pytest.importorskip('zstandard')
+        with open(path, 'wb') as f:
+            f.write(zstandard.ZstdCompressor().compress(data))
+    else:
+        with open(path, 'wb') as f:
+            f.write(data)
+    return path
+
+def replay(config, frames):
+    async def run():
+        connector = FileRadarConnector(config)
+        assert await connector.connect()
+        out = []
+        while len(out) < frames:
+            out += await connector.read_batch()
+        await connector.disconnect()
+        return out[:frames]
+    return asyncio.run(run())
+
+@pytest.fixture(params=['', '.gz', '.zst'])
+def capture(request, tmp_path):
+    return write_capture(tmp_path, request.param)
+
+def test_parse_line_layouts():
+    recorded, frame = parse_line('2026-01-01T00:00:01Z\t$GPGGA,1')
+    assert recorded == START.replace(tzinfo=timezone.utc).timestamp() + 1
+    assert frame['raw_data'] == '$GPGGA,1'
+
+    recorded, frame = parse_line('{"raw_data": "DET:1", "timestamp": "2026-01-01T00:00:00Z", "sensor": "north"}')
+    assert recorded is not None and frame['sensor'] == 'north'
+
+    recorded, frame = parse_line('DET:1 RNG:3.5km')
+    assert recorded is None and frame == {'raw_data': 'DET:1 RNG:3.5km'}
+
+def test_open_capture_reads_lines(capture):
+    with open_capture(capture) as f:
+        lines = list(f)
+    assert len(lines) == FRAMES + 1
+    with open_capture(capture) as f:
+        assert f.readline().startswith(b'# recorded')
+
+def test_index_round_trip_and_seek(capture):
+    index = CaptureIndex.load_or_build(capture, interval=10.0)
+    assert index.times == [0.0, 10.0, 20.0, 30.0, 40.0, 50.0]
+    assert os.path.exists(capture + '.idx')
+
+    cached = CaptureIndex.load(capture)
+    assert cached.offsets == index.offsets
+
+    with open_capture(capture) as f:
+        seek_capture(f, index.offset_for(25.0))
+        recorded, _ = parse_line(f.readline().decode().strip())
+    assert recorded - index.start_time == pytest.approx(20.0)
+
+def test_index_is_rebuilt_when_capture_changes(tmp_path):
+    path = write_capture(tmp_path, '')
+    CaptureIndex.load_or_build(path)
+    with open(path, 'a') as f:
+        f.write('2026-01-01T01:00:00Z\tDET:0\n')
+    assert CaptureIndex.load(path) is None
+
+def test_replay_at_max_speed_keeps_order(capture):
+    frames = replay({'path': capture, 'speed': 'max', 'loop': False}, FRAMES)
+    times = [parse_line(json.dumps(f))[0] for f in frames]
+    assert times == [START.replace(tzinfo=timezone.utc).timestamp() + i / 10 for i in range(FRAMES)]
+    assert frames[0]['raw_data'].startswith('DET:1 RNG:3.5km BRG:000')
+    assert frames[1]['source'] == 'tcp'
+
+def test_replay_seeks_to_start_offset(capture):
+    frames = replay({'path': capture, 'speed': 'max', 'start_offset': 42.0}, 3)
+    assert frames[0]['timestamp'].startswith('2026-01-01T00:00:42')
+
+def test_replay_without_timestamps_loops(tmp_path):
+    path = tmp_path / 'plain.txt'
+    path.write_text('# comment\n\nDET:1 RNG:1km\nDET:2 RNG:2km\n')
+    frames = replay({'path': str(path), 'speed': 'max'}, 5)
+    assert [f['raw_data'] for f in frames] == ['DET:1 RNG:1km', 'DET:2 RNG:2km'] * 2 + ['DET:1 RNG:1km']
@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+from circuit_breaker import CircuitBreaker
+from locrypt_client import DarcyClient
+
+
+def half_open(**kwargs) -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.0, **kwargs)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow_request() is False  # Poll without a probe -> half-open
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    return breaker
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60.0)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow_request() is False
+    assert breaker.stats['times_opened'] == 1
+    assert breaker.stats['rejected'] == 1
+
+
+def test_half_open_lets_one_trial_through():
+    breaker = half_open()
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request() is True
+
+
+def test_failed_trial_reopens_with_longer_timeout():
+    breaker = half_open(max_reset_timeout=10.0)
+    breaker.reset_timeout = 4.0
+    assert breaker.allow_request() is True
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.reset_timeout == 8.0
+    assert breaker.trial_in_flight is False
+
+
+def test_probe_result_decides_half_open():
+    async def run(healthy):
+        async def probe():
+            return healthy
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0, probe=probe)
+        breaker.record_failure()
+        breaker.allow_request()
+        await breaker.probe_task
+        return breaker
+
+    assert asyncio.run(run(True)).state == CircuitBreaker.HALF_OPEN
+    unhealthy = asyncio.run(run(False))
+    assert unhealthy.state == CircuitBreaker.OPEN
+    assert unhealthy.stats['probes'] == 1
+
+
+def test_unreported_trial_frees_its_slot_after_timeout():
+    breaker = half_open(trial_timeout=5.0)
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+    breaker.trial_started_at = time.monotonic() - 6.0
+    assert breaker.allow_request() is True
+
+
+class HangingResponse:
+    async def __aenter__(self):
+        await asyncio.sleep(3600)
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class HangingSession:
+    closed = False
+
+    def post(self, endpoint, json=None):
+        return HangingResponse()
+
+
+def test_cancelled_half_open_call_releases_the_trial():
+    async def run():
+        client = DarcyClient('http://darcy.test', 'token', {'spool': {'path': ':memory:'}})
+        client.session = HangingSession()
+        client.circuit = half_open()
+
+        task = asyncio.create_task(client.publish_data({'id': 1}))
+        await asyncio.sleep(0.01)
+        assert client.circuit.trial_in_flight
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return client.circuit
+
+    breaker = asyncio.run(run())
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.trial_in_flight is False
+    assert breaker.allow_request() is True
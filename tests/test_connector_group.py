@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from connector_group import ConnectorGroup
+
+
+def test_sources_are_tagged_with_name_station_and_format():
+    group = ConnectorGroup([
+        {'name': 'north', 'type': 'mock', 'station_id': 'ST-N', 'format': 'nmea'},
+        {'type': 'mock'}
+    ])
+    received = []
+
+    async def collect(data):
+        received.append(data)
+
+    group.set_data_callback(collect)
+
+    async def run():
+        await group.connectors['north'].on_data_callback({'raw_data': '$PRDET,1*00'})
+        await group.connectors['radar-2'].on_data_callback({'raw_data': 'DET:1'})
+
+    asyncio.run(run())
+    assert received[0] == {'raw_data': '$PRDET,1*00', 'sensor': 'north', 'station_id': 'ST-N', 'format': 'nmea'}
+    assert received[1] == {'raw_data': 'DET:1', 'sensor': 'radar-2'}
+
+
+def test_unknown_source_format_is_rejected_at_configuration():
+    with pytest.raises(ValueError, match="north: unknown format 'nmae'"):
+        ConnectorGroup([{'name': 'north', 'type': 'mock', 'format': 'nmae'}])
+
+
+def test_duplicate_names_and_empty_groups_are_rejected():
+    with pytest.raises(ValueError, match='Duplicate'):
+        ConnectorGroup([{'name': 'a', 'type': 'mock'}, {'name': 'a', 'type': 'mock'}])
+    with pytest.raises(ValueError, match='at least one source'):
+        ConnectorGroup([])
@@ -0,0 +1,46 @@
+import pytest
+
+from data_processor import CustomFormatScanner, RadarDataProcessor
+from radar_models import KNOT, FT
+
+
+def test_scans_default_keys_into_si_units():
+    result = CustomFormatScanner().scan("DET:2 RNG:3.5km BRG:045 ALT:150m SPD:85kts")
+    assert result == {
+        'detections': 2,
+        'range_m': pytest.approx(3500.0),
+        'bearing_deg': 45.0,
+        'altitude_m': 150.0,
+        'speed_ms': pytest.approx(85 * KNOT)
+    }
+
+
+def test_units_default_and_convert():
+    result = CustomFormatScanner().scan("RNG: 2 ALT:500ft SPD:10m/s BRG:270°")
+    assert result['range_m'] == pytest.approx(2000.0)  # No unit: km
+    assert result['altitude_m'] == pytest.approx(500 * FT)
+    assert result['speed_ms'] == pytest.approx(10.0)
+    assert result['bearing_deg'] == 270.0
+
+
+def test_first_occurrence_wins_and_unknown_keys_are_ignored():
+    result = CustomFormatScanner().scan("det:1 FOO:99 RNG:1km RNG:9km")
+    assert result == {'detections': 1, 'range_m': pytest.approx(1000.0)}
+    assert CustomFormatScanner().scan("no fields here") is None
+
+
+def test_field_map_adds_vendor_keys():
+    scanner = CustomFormatScanner({'dist': 'range', 'az': 'bearing', 'snr': 'snr_db'})
+    result = scanner.scan("DIST:4.2nm AZ:12.5 SNR:17.5 DET:1")
+    assert result['range_m'] == pytest.approx(4.2 * 1852)
+    assert result['bearing_deg'] == 12.5
+    assert result['snr_db'] == 17.5
+
+
+def test_processor_fills_defaults_for_custom_frames():
+    processor = RadarDataProcessor({'format': 'custom'})
+    detection = processor.process_raw_data({'raw_data': 'RNG:3.5km BRG:045', 'source': 'test'})
+    assert detection.detections == 1
+    assert detection.range_m == pytest.approx(3500.0)
+    assert detection.confidence == 'MEDIUM'
+    assert processor.stats['parsed']['custom'] == 1
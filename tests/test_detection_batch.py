@@ -0,0 +1,72 @@
+import math
+
+import numpy as np
+import pytest
+
+from data_processor import RadarDataProcessor
+from radar_models import DetectionBatch, Detection, KNOT
+
+
+def batch_of(rows):
+    return DetectionBatch(rows, [{} for _ in rows])
+
+
+def test_columns_mix_si_values_display_strings_and_missing_fields():
+    batch = batch_of([
+        {'detections': 2, 'range_m': 3500.0, 'bearing_deg': 45.0, 'speed_ms': 10.0},
+        {'detections': 1, 'range': '2nm', 'bearing': '090°', 'altitude': '500ft', 'speed': 85},
+        {'detections': 0, 'range': 'N/A', 'bearing': None}
+    ])
+    assert batch.detections.tolist() == [2, 1, 0]
+    assert batch.range_m[:2] == pytest.approx([3500.0, 3704.0])
+    assert batch.bearing_deg[:2].tolist() == [45.0, 90.0]
+    assert batch.altitude_m[1] == pytest.approx(152.4)
+    assert batch.speed_ms[:2] == pytest.approx([10.0, 85 * KNOT])
+    assert math.isnan(batch.range_m[2]) and math.isnan(batch.bearing_deg[2])
+    assert math.isnan(batch.altitude_m[0])
+
+
+def test_columns_match_per_frame_conversion():
+    rows = [
+        {'detections': 1, 'range': '3.5km', 'bearing': '045°', 'altitude': '150m', 'speed': '20m/s'},
+        {'detections': 3, 'range_m': 1200.0, 'bearing': 300, 'altitude': 2.5, 'speed': '50kmh'},
+        {'detections': 0}
+    ]
+    assert batch_of(rows).build_records() == [Detection.from_fields(row) for row in rows]
+
+
+@pytest.mark.parametrize('row,valid', [
+    ({'detections': 1, 'range_m': 50000.0, 'bearing_deg': 360.0}, True),
+    ({'detections': 1, 'range_m': 50000.1}, False),
+    ({'detections': 1, 'range_m': -1.0}, False),
+    ({'detections': 1, 'bearing_deg': 0.0}, True),
+    ({'detections': 1, 'bearing_deg': 360.5}, False),
+    ({'detections': 1, 'bearing_deg': -0.5}, False),
+    ({'detections': 5}, True),
+    ({'detections': 6}, False),
+    ({'detections': -1}, False),
+    ({'detections': 1, 'range': 'N/A', 'bearing': 'N/A'}, True)  # NaN: not checked
+])
+def test_validation_mask(row, valid):
+    processor = RadarDataProcessor({'max_detections': 5})
+    batch = batch_of([row])
+    mask = processor._validation_mask(batch)
+    assert mask.tolist() == [valid]
+    # The vector mask agrees with the per-frame check
+    assert processor._validate_detection(Detection.from_fields(row)) == valid
+
+
+def test_process_batch_keeps_only_valid_frames_in_order():
+    processor = RadarDataProcessor({'format': 'custom'})
+    frames = [
+        {'raw_data': 'DET:1 RNG:3km BRG:045', 'source': 'a'},
+        {'raw_data': 'DET:1 RNG:60km BRG:045', 'source': 'a'},
+        {'raw_data': 'nothing to see', 'source': 'a'},
+        {'raw_data': 'DET:2 BRG:350', 'source': 'b', 'timestamp': '2026-01-01T00:00:00'}
+    ]
+    batch = processor.process_batch(frames)
+    assert batch.valid.tolist() == [True, False, True]
+    assert [r.detections for r in batch.records] == [1, 2]
+    assert batch.records[1].range_m is None
+    assert batch.records[1].timestamp == '2026-01-01T00:00:00'
+    assert np.isnan(batch.range_m[2])
@@ -0,0 +1,54 @@
+from event_hub import EventHub, without_paths
+
+
+def status(uptime, published, age):
+    return {
+        'uptime': uptime,
+        'stats': {'published_total': published},
+        'darcy_stats': {'queue_size': 3, 'spool': {'count': 3, 'oldest_age_seconds': age}}
+    }
+
+
+VOLATILE = ('uptime', 'darcy_stats.spool.oldest_age_seconds')
+
+
+def test_without_paths_drops_nested_keys_without_touching_the_original():
+    data = status('0:00:01', 5, 12.5)
+    stripped = without_paths(data, VOLATILE)
+    assert stripped == {'stats': {'published_total': 5}, 'darcy_stats': {'queue_size': 3, 'spool': {'count': 3}}}
+    assert data['darcy_stats']['spool']['oldest_age_seconds'] == 12.5
+    assert without_paths(data, ()) == data
+
+
+def test_snapshot_changing_only_volatile_fields_is_skipped():
+    hub = EventHub()
+    subscription = hub.subscribe(['status'])
+    assert hub.publish('status', status('0:00:01', 5, 1.0), snapshot=True, volatile=VOLATILE)
+    assert not hub.publish('status', status('0:00:02', 5, 2.0), snapshot=True, volatile=VOLATILE)
+    assert hub.stats['unchanged_skipped'] == 1
+
+    assert hub.publish('status', status('0:00:03', 6, 3.0), snapshot=True, volatile=VOLATILE)
+    messages = [message for _, message in subscription.messages]
+    assert len(messages) == 2
+    assert '"uptime": "0:00:03"' in messages[-1]  # Volatile fields are still delivered when something changed
+
+
+def test_snapshot_without_volatile_fields_compares_everything():
+    hub = EventHub()
+    hub.subscribe(['status'])
+    assert hub.publish('status', status('0:00:01', 5, 1.0), snapshot=True)
+    assert hub.publish('status', status('0:00:02', 5, 1.0), snapshot=True)
+    assert not hub.publish('status', status('0:00:02', 5, 1.0), snapshot=True)
+
+
+def test_volatile_path_through_a_list_applies_to_every_item():
+    def predictions(*remaining):
+        return {'predictions': [{'id': i, 'seconds_remaining': s} for i, s in enumerate(remaining)], 'stats': {'total': 2}}
+
+    volatile = ('predictions.seconds_remaining',)
+    assert without_paths(predictions(30, 12), volatile) == {'predictions': [{'id': 0}, {'id': 1}], 'stats': {'total': 2}}
+    hub = EventHub()
+    hub.subscribe(['predictions'])
+    assert hub.publish('predictions', predictions(30, 12), snapshot=True, volatile=volatile)
+    assert not hub.publish('predictions', predictions(29, 11), snapshot=True, volatile=volatile)
+    assert hub.publish('predictions', predictions(28), snapshot=True, volatile=volatile)
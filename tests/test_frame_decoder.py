@@ -0,0 +1,60 @@
+import pytest
+
+from radar_connector import FrameDecoder
+
+
+def test_newline_frames_survive_arbitrary_chunking():
+    stream = b'DET:1 RNG:3km\r\nDET:2\n\nDET:3'
+    decoder = FrameDecoder()
+    frames = []
+    for i in range(len(stream)):
+        frames += decoder.feed(stream[i:i + 1])
+    assert frames == [b'DET:1 RNG:3km', b'DET:2']
+    assert bytes(decoder.buffer) == b'DET:3'
+    assert decoder.feed(b'\n') == [b'DET:3']
+
+
+def test_multi_byte_delimiter_from_config():
+    decoder = FrameDecoder.from_config({'framing': 'delimiter', 'delimiter': '\\r\\n\\x03'})
+    assert decoder.delimiter == b'\r\n\x03'
+    assert decoder.feed(b'one\r\n\x03tw') == [b'one']
+    assert decoder.feed(b'o\r\n') == []
+    assert decoder.feed(b'\x03') == [b'two']
+
+
+@pytest.mark.parametrize('length_bytes,byteorder', [(1, 'big'), (2, 'big'), (4, 'little')])
+def test_length_prefixed_frames(length_bytes, byteorder):
+    payloads = [b'{"detections": 1}', b'x' * 200, b'$PRDET,0']
+    stream = b''.join(len(p).to_bytes(length_bytes, byteorder) + p for p in payloads)
+    decoder = FrameDecoder('length_prefix', length_bytes=length_bytes, byteorder=byteorder)
+    assert decoder.feed(stream[:5]) == []
+    assert decoder.feed(stream[5:]) == payloads
+    assert not decoder.buffer
+
+
+def test_delimited_buffer_is_bounded():
+    decoder = FrameDecoder(max_frame_size=16)
+    assert decoder.feed(b'x' * 10) == []
+    assert decoder.feed(b'y' * 10) == []
+    assert not decoder.buffer
+    assert decoder.dropped_bytes == 20
+    assert decoder.feed(b'ok\n') == [b'ok']
+
+
+def test_oversized_length_prefix_resets_the_stream():
+    decoder = FrameDecoder('length_prefix', length_bytes=2, max_frame_size=100)
+    frames = decoder.feed(b'\x00\x02ok' + b'\xff\xff' + b'garbage')
+    assert frames == [b'ok']
+    assert not decoder.buffer
+    assert decoder.dropped_bytes == 9
+    assert decoder.feed(b'\x00\x03abc') == [b'abc']
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'framing': 'cobs'},
+    {'framing': 'length_prefix', 'length_bytes': 3},
+    {'framing': 'delimiter', 'delimiter': b''}
+])
+def test_invalid_settings_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        FrameDecoder(**kwargs)
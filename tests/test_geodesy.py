@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from geodesy import BaseFrame, base_frame, SECTOR_BEARINGS, DEFAULT_SECTOR_RANGE_M
+from danger_zone_predictor import danger_zone_predictor
+
+
+def test_known_point_one_degree_of_latitude_north():
+    frame = BaseFrame(0.0, 0.0)
+    lat, lon = frame.position(111194.93, 0.0)  # One degree of arc on the 6371 km sphere
+    assert lat == pytest.approx(1.0, abs=1e-6)
+    assert lon == pytest.approx(0.0, abs=1e-9)
+    range_m, bearing = frame.range_bearing(0.0, 1.0)
+    assert float(range_m) == pytest.approx(111194.93, abs=0.01)
+    assert float(bearing) == pytest.approx(90.0)
+
+
+def test_scalar_position_matches_vector_destination():
+    ranges = np.array([0.0, 500.0, 12345.0, 50000.0, 250000.0])
+    bearings = np.array([0.0, 45.0, 181.5, 270.0, 359.9])
+    lats, lons = base_frame.destination(ranges, bearings)
+    for i, (range_m, bearing) in enumerate(zip(ranges, bearings)):
+        assert base_frame.position(float(range_m), float(bearing)) == pytest.approx((lats[i], lons[i]), abs=1e-12)
+        # A scalar call to destination gives the same point as the array call
+        lat, lon = base_frame.destination(range_m, bearing)
+        assert (float(lat), float(lon)) == pytest.approx((lats[i], lons[i]), abs=1e-12)
+
+
+def test_range_bearing_inverts_destination():
+    ranges = np.array([100.0, 5000.0, 49000.0])
+    bearings = np.array([10.0, 135.0, 300.0])
+    back_ranges, back_bearings = base_frame.range_bearing(*base_frame.destination(ranges, bearings))
+    assert back_ranges == pytest.approx(ranges, abs=1e-3)
+    assert back_bearings == pytest.approx(bearings, abs=1e-6)
+
+
+def test_sector_centres_come_from_the_lookup_table():
+    for sector, bearing in SECTOR_BEARINGS.items():
+        assert base_frame.sector_centres[(sector, DEFAULT_SECTOR_RANGE_M)] == base_frame.position(DEFAULT_SECTOR_RANGE_M, bearing)
+    zone = danger_zone_predictor._create_predicted_zone({'id': 'P1', 'message': 'm', 'sector': 'SE'}, 5)
+    assert (zone['center']['lat'], zone['center']['lon']) == base_frame.sector_centre('SE')
+    assert zone['bearing_from_base'] == 135
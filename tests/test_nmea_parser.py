@@ -0,0 +1,113 @@
+import pytest
+
+from data_processor import RadarDataProcessor
+from nmea_parser import (NMEA_SENTENCES, NmeaChecksumError, register_nmea_sentence, sentence_id,
+                         split_sentence, nmea_checksum)
+from radar_models import Detection, KNOT, NM
+
+
+def sentence(body: str) -> str:
+    return f"${body}*{nmea_checksum(body):02X}"
+
+
+def extract(line: str):
+    fields = split_sentence(line)
+    return NMEA_SENTENCES[sentence_id(fields[0])](fields)
+
+
+def test_checksum_matches_the_reference_sentence():
+    line = '$GPGGA,123519,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*47'
+    assert nmea_checksum(line[1:-3]) == 0x47
+    assert split_sentence(line)[:3] == ['GPGGA', '123519', '4807.038']
+
+
+def test_bad_checksum_raises_and_missing_checksum_is_optional():
+    with pytest.raises(NmeaChecksumError):
+        split_sentence('$GPGGA,123519,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*48')
+    assert split_sentence('$PRDET,1,3.0,45,100,50') == ['PRDET', '1', '3.0', '45', '100', '50']
+    assert split_sentence('$PRDET,1,3.0,45,100,50', require_checksum=True) is None
+    assert split_sentence('$PRDET,1*ZZ') is None
+    assert split_sentence('GPGGA,1,2,3') is None
+
+
+def test_processor_counts_checksum_errors_and_falls_back_for_unknown_sentences():
+    processor = RadarDataProcessor({'format': 'nmea'})
+    assert processor.process_raw_data({'raw_data': sentence('PRDET,1,3.0,45,100,50')[:-2] + '00'}) is None
+    assert processor.stats['nmea_checksum_errors'] == 1
+
+    strict = RadarDataProcessor({'format': 'nmea', 'nmea_require_checksum': True})
+    assert strict.process_raw_data({'raw_data': '$PRDET,1,3.0,45,100,50'}) is None
+
+    processor.process_raw_data({'raw_data': sentence('GPGLL,4916.45,N,12311.12,W,225444,A')})
+    assert processor.stats['nmea_fallback'] == 1
+
+
+def test_sentence_ids_and_registry():
+    assert sentence_id('GPGGA') == 'GGA'
+    assert sentence_id('RATTM') == 'TTM'
+    assert sentence_id('PRDET') == 'PRDET'
+    assert {'GGA', 'RMC', 'TTM', 'PRDET'} <= set(NMEA_SENTENCES)
+
+    @register_nmea_sentence('PXYZ')
+    def extract_xyz(fields):
+        return {'detections': int(fields[1]), 'range_m': float(fields[2])}
+
+    try:
+        processor = RadarDataProcessor({'format': 'nmea'})
+        detection = processor.process_raw_data({'raw_data': sentence('PXYZ,3,1200')})
+        assert detection.detections == 3
+        assert detection.range_m == 1200.0
+    finally:
+        del NMEA_SENTENCES['PXYZ']
+
+
+def test_prdet_fields_are_si_floats():
+    result = extract(sentence('PRDET,2,3.456,45.7,150.5,85.5,UAV-7'))
+    assert result['range_m'] == pytest.approx(3456.0)
+    assert result['bearing_deg'] == 45.7
+    assert result['altitude_m'] == 150.5
+    assert result['speed_ms'] == pytest.approx(85.5 * KNOT)
+    assert not any(isinstance(v, str) for k, v in result.items() if k != 'confidence')
+
+    target = Detection.from_fields(result).targets[0]
+    assert target.id == 'UAV-7'
+    assert target.range_m == pytest.approx(3456.0)
+    assert target.bearing_deg == 45.7
+    assert target.speed_ms == pytest.approx(85.5 * KNOT)
+
+
+def test_ttm_converts_distance_and_speed_units():
+    nautical = extract(sentence('RATTM,07,2.5,120.4,T,30.0,270.0,T,0.5,3.0,N,BOGEY,T,'))
+    assert nautical['range_m'] == pytest.approx(2.5 * NM)
+    assert nautical['bearing_deg'] == 120.4
+    assert nautical['speed_ms'] == pytest.approx(30.0 * KNOT)
+    assert nautical['targets'][0]['id'] == 'BOGEY'
+
+    metric = extract(sentence('RATTM,07,4.0,10.0,T,36.0,270.0,T,0.5,3.0,K,,T,'))
+    assert metric['range_m'] == pytest.approx(4000.0)
+    assert metric['speed_ms'] == pytest.approx(10.0)
+    assert metric['targets'][0]['id'] == 'TTM-07'
+
+    lost = extract(sentence('RATTM,07,2.5,120.4,T,30.0,270.0,T,0.5,3.0,N,BOGEY,L,'))
+    assert lost['detections'] == 0 and lost['targets'] == []
+
+
+def test_gga_and_rmc_fields():
+    gga = extract(sentence('GPGGA,123519,045.00,N,3.2,E,1,08,150,85.0,M,46.9,M,,'))
+    assert gga['bearing_deg'] == pytest.approx(0.75)
+    assert gga['range_m'] == pytest.approx(3.2 / 60 * 1000)
+    assert gga['altitude_m'] == 85.0
+
+    rmc = extract(sentence('GPRMC,123519,A,045.00,N,3.2,E,22.4,084.4,230394,003.1,W'))
+    assert rmc['speed_ms'] == pytest.approx(22.4 * KNOT)
+
+
+def test_out_of_range_bearing_is_rejected_not_wrapped():
+    processor = RadarDataProcessor({'format': 'nmea'})
+    frame = {'raw_data': sentence('PRDET,1,3.0,400.0,100,50'), 'source': 'test'}
+    assert extract(frame['raw_data'])['bearing_deg'] == 400.0
+    assert processor.process_raw_data(dict(frame)) is None
+    assert not processor.process_batch([frame]).records
+
+    kept = processor.process_raw_data({'raw_data': sentence('PRDET,1,3.0,359.6,100,50'), 'source': 'test'})
+    assert kept.bearing_deg == 359.6
@@ -0,0 +1,76 @@
+import json
+
+from outbound_spool import OutboundSpool
+
+
+def ids(spool):
+    return [data['i'] for _, data in spool.peek(1000)]
+
+
+def test_items_come_back_in_order_until_acked():
+    spool = OutboundSpool(':memory:')
+    seq = [spool.append({'i': i}) for i in range(5)]
+    assert ids(spool) == [0, 1, 2, 3, 4]
+    assert [data['i'] for _, data in spool.peek(2, after_id=seq[1])] == [2, 3]
+    spool.ack([seq[0], seq[2]])
+    assert ids(spool) == [1, 3, 4]
+    assert len(spool) == 3
+    assert spool.stats['acked'] == 2
+
+
+def test_item_bound_evicts_the_oldest():
+    spool = OutboundSpool(':memory:', max_items=3)
+    for i in range(5):
+        spool.append({'i': i})
+    assert ids(spool) == [2, 3, 4]
+    assert spool.stats['evicted'] == 2
+
+
+def test_byte_bound_evicts_until_back_within_size():
+    item_size = len(json.dumps({'i': 0, 'pad': 'x' * 90}))
+    spool = OutboundSpool(':memory:', max_bytes=item_size * 3 + 10)
+    for i in range(6):
+        spool.append({'i': i, 'pad': 'x' * 90})
+        assert spool.bytes <= spool.max_bytes
+    assert ids(spool) == [3, 4, 5]
+    assert spool.bytes == item_size * 3
+
+
+def test_old_items_expire(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr('outbound_spool.time.time', lambda: clock[0])
+    spool = OutboundSpool(':memory:', max_age_seconds=60)
+    spool.append({'i': 0})
+    clock[0] += 30
+    spool.append({'i': 1})
+    assert spool.oldest_age() == 30.0
+    clock[0] += 45
+    assert ids(spool) == [1]
+    assert spool.stats['expired'] == 1
+
+
+def test_queue_survives_reopening(tmp_path):
+    path = str(tmp_path / 'spool' / 'outbound.db')
+    spool = OutboundSpool(path)
+    first = spool.append({'i': 0})
+    spool.append({'i': 1})
+    spool.ack([first])
+    spool.close()
+
+    reopened = OutboundSpool(path)
+    assert ids(reopened) == [1]
+    assert len(reopened) == 1
+    assert reopened.bytes == len(json.dumps({'i': 1}))
+
+
+def test_append_many_is_one_commit_and_keeps_order_and_bounds():
+    spool = OutboundSpool(':memory:', max_items=4)
+    spool.append({'i': 0})
+    commits = []
+    spool.db.set_trace_callback(lambda sql: commits.append(sql) if sql == 'COMMIT' else None)
+    assert spool.append_many([{'i': i} for i in range(1, 6)]) == 5
+    assert commits == ['COMMIT']
+    assert ids(spool) == [2, 3, 4, 5]
+    assert spool.stats['appended'] == 6 and spool.stats['evicted'] == 2
+    assert spool.bytes == sum(len(json.dumps({'i': i})) for i in range(2, 6))
+    assert spool.append_many([]) == 0
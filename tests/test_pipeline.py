@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from pipeline import StageQueue
+
+
+def drain(queue):
+    return [queue._pop() for _ in range(len(queue))]
+
+
+def test_drop_oldest_evicts_the_head():
+    async def run():
+        queue = StageQueue('q', maxsize=3)
+        for i in range(5):
+            await queue.put(i)
+        return queue
+
+    queue = asyncio.run(run())
+    assert drain(queue) == [2, 3, 4]
+    assert queue.stats['dropped'] == 2
+    assert queue.stats['max_depth'] == 3
+
+
+def test_latest_per_source_replaces_pending_items_in_place():
+    async def run():
+        queue = StageQueue('q', maxsize=3, policy='latest_per_source')
+        await queue.put('a1', key='a')
+        await queue.put('b1', key='b')
+        await queue.put('a2', key='a')  # Keeps a's place in line
+        await queue.put('x')  # No source: never merged
+        await queue.put('y')  # Full: evicts the oldest (a2)
+        return queue
+
+    queue = asyncio.run(run())
+    assert drain(queue) == ['b1', 'x', 'y']
+    assert queue.stats['dropped'] == 2
+    assert queue.stats['enqueued'] == 5
+
+
+def test_block_waits_for_the_consumer():
+    async def run():
+        queue = StageQueue('q', maxsize=2, policy='block')
+        await queue.put(1)
+        await queue.put(2)
+        producer = asyncio.create_task(queue.put(3))
+        await asyncio.sleep(0.01)
+        blocked = not producer.done() and len(queue) == 2
+        first = await queue.get()
+        await asyncio.wait_for(producer, 1)
+        return blocked, first, await queue.get_batch(10), queue.stats['dropped']
+
+    assert asyncio.run(run()) == (True, 1, [2, 3], 0)
+
+
+def test_get_batch_waits_for_the_first_item_only():
+    async def run():
+        queue = StageQueue('q', maxsize=10)
+        consumer = asyncio.create_task(queue.get_batch(3))
+        await asyncio.sleep(0.01)
+        for i in range(5):
+            await queue.put(i)
+        batch = await asyncio.wait_for(consumer, 1)
+        return batch, len(queue)
+
+    assert asyncio.run(run()) == ([0, 1, 2], 2)
+
+
+def test_clear_reports_and_unblocks():
+    async def run():
+        queue = StageQueue('q', maxsize=1, policy='block')
+        await queue.put(1)
+        producer = asyncio.create_task(queue.put(2))
+        await asyncio.sleep(0.01)
+        dropped = queue.clear()
+        await asyncio.wait_for(producer, 1)
+        return dropped, drain(queue)
+
+    assert asyncio.run(run()) == (1, [2])
+
+
+@pytest.mark.parametrize('kwargs', [{'policy': 'drop_newest'}, {'maxsize': 0}])
+def test_invalid_settings_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        StageQueue('q', **kwargs)
@@ -0,0 +1,120 @@
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+from prediction_engine import PredictionEngine
+from radar_models import Detection
+
+
+class Clock:
+    def __init__(self):
+        self.now = datetime(2026, 1, 1, 12)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += timedelta(seconds=seconds)
+
+
+def random_frame(rng):
+    if rng.random() < 0.3:
+        return Detection(detections=0)
+    return Detection(detections=rng.randint(1, 8), range_m=rng.uniform(500, 45000), bearing_deg=rng.uniform(0, 360))
+
+
+def assert_aggregates_match_recount(engine):
+    history = list(engine.detection_history)
+    hours = Counter(entry['timestamp'].hour for entry in history)
+    assert engine.hour_counts == [hours[h] for h in range(24)]
+
+    recent = history[-engine.recent_sectors.maxlen:]
+    sectors = [engine._get_sector_from_bearing(e['bearing']) if e['detections'] > 0 else None for e in recent]
+    assert list(engine.recent_sectors) == sectors
+    assert engine.sector_counts == Counter(s for s in sectors if s is not None)
+    assert engine.recent_active == sum(1 for s in sectors if s is not None)
+    assert list(engine.recent_counts) == [e['detections'] for e in history[-engine.recent_counts.maxlen:]]
+
+    assert engine.correct_predictions == sum(1 for p in engine.prediction_history if p.get('result', False))
+
+
+def test_incremental_aggregates_match_a_full_recount_through_evictions():
+    clock = Clock()
+    engine = PredictionEngine(clock=clock, rng=random.Random(7))
+    engine.configure({
+        'evaluation_interval': 0, 'shadow_horizons': [],
+        'history_size': 12, 'direction_window': 4, 'wave_window': 3, 'results_size': 5
+    })
+    engine.prediction_timeline = 5
+    rng = random.Random(11)
+    for _ in range(300):
+        clock.advance(rng.choice([1, 3, 240]))  # Frames cross hour boundaries, predictions fall due
+        engine.add_detection(random_frame(rng))
+        engine.expire_predictions()
+        assert_aggregates_match_recount(engine)
+
+    # Both windows wrapped many times and some results were correct, some not
+    assert engine.prediction_history.maxlen == len(engine.prediction_history)
+    assert 0 < engine.correct_predictions < len(engine.prediction_history)
+    assert len(set(e['timestamp'].hour for e in engine.detection_history)) > 1
+
+
+def sector_pattern(sector, confidence):
+    return {'type': 'sector_activity', 'sector': sector, 'message': f"Activity {sector} ({confidence})", 'confidence': confidence}
+
+
+def test_pattern_seen_again_refreshes_its_prediction_instead_of_adding_one():
+    clock = Clock()
+    engine = PredictionEngine(clock=clock)
+    engine.configure({'shadow_horizons': []})
+    add = engine._add_prediction
+    assert engine._apply_patterns([sector_pattern('E', 60)], engine.prediction_keys, 30, add) == 0
+    expected_time = engine.predictions['D-001']['expected_time']
+
+    clock.advance(10)
+    refreshed = engine._apply_patterns([sector_pattern('E', 75), sector_pattern('W', 50)], engine.prediction_keys, 30, add)
+    assert refreshed == 1
+    assert sorted(engine.predictions) == ['D-001', 'D-002']
+    assert len(engine.prediction_keys) == 2 and len(engine.expiry_heap) == 2
+    east = engine.predictions['D-001']
+    assert east['confidence'] == 75 and east['message'] == 'Activity E (75)'
+    assert east['refresh_count'] == 1 and east['refreshed_at'] == clock.now
+    assert east['expected_time'] == expected_time  # Still validated against the original claim
+
+
+def test_patterns_are_evaluated_only_once_per_evaluation_interval():
+    clock = Clock()
+    engine = PredictionEngine(clock=clock)
+    engine.configure({'evaluation_interval': 5.0, 'shadow_horizons': []})
+    evaluated = []
+    engine._generate_predictions = lambda: evaluated.append(clock.now)
+    start = clock.now
+    for _ in range(12):
+        engine.add_detection(Detection(detections=1, range_m=5000.0, bearing_deg=90.0))
+        clock.advance(1)
+    assert evaluated == [start + timedelta(seconds=s) for s in (0, 5, 10)]
+    assert len(engine.detection_history) == 12  # Every frame is still recorded
+
+
+def test_shadow_lanes_do_not_change_main_lane_results():
+    def run(shadow_horizons):
+        clock = Clock()
+        engine = PredictionEngine(clock=clock, rng=random.Random(5))
+        engine.configure({'evaluation_interval': 0, 'shadow_horizons': shadow_horizons})
+        engine.prediction_timeline = 10
+        results = []
+        engine.set_result_callback(lambda p: results.append((p['id'], p['result'], p['spatial_accuracy'])))
+        rng = random.Random(9)
+        for _ in range(400):
+            clock.advance(2)
+            engine.add_detection(random_frame(rng))
+            engine.expire_predictions()
+        return results, engine
+
+    alone, _ = run([])
+    shadowed, engine = run([5, 10, 60])
+    assert alone == shadowed
+    assert len(alone) > 50
+    assert all(lane.validated_total > 0 for lane in engine.shadow_lanes)
+    # Lanes draw from their own streams, seeded from the main one
+    assert len({lane.rng.random() for lane in engine.shadow_lanes}) == 3
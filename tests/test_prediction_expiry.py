@@ -0,0 +1,111 @@
+import heapq
+from datetime import datetime, timedelta
+
+from prediction_engine import PredictionEngine
+from radar_models import Detection
+
+
+class Clock:
+    def __init__(self):
+        self.now = datetime(2026, 1, 1, 12)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += timedelta(seconds=seconds)
+
+
+def engine_with(*sectors_and_timelines, shadow_horizons=()):
+    clock = Clock()
+    engine = PredictionEngine(clock=clock)
+    engine.configure({'evaluation_interval': 0, 'shadow_horizons': list(shadow_horizons)})
+    for sector, timeline in sectors_and_timelines:
+        pattern = {'type': 'sector_activity', 'sector': sector, 'message': f"Activity {sector}", 'confidence': 70}
+        engine._add_prediction(engine._new_prediction(pattern, engine._prediction_key(pattern), timeline))
+    return engine, clock
+
+
+def test_only_due_predictions_are_validated_in_expiry_order():
+    engine, clock = engine_with(('N', 30), ('E', 10), ('W', 20))
+    assert engine.next_expiry() == clock.now + timedelta(seconds=10)
+    assert engine.expire_predictions() == 10.0
+    assert len(engine.predictions) == 3
+
+    clock.advance(25)
+    assert engine.expire_predictions() == 5.0
+    assert [p['message'] for p in engine.prediction_history] == ['Activity E', 'Activity W']
+    assert list(engine.predictions) == ['D-001']
+
+    clock.advance(5)
+    assert engine.expire_predictions() is None
+    assert not engine.predictions and not engine.expiry_heap
+    assert not engine.prediction_keys
+
+
+def test_superseded_heap_entries_are_skipped():
+    engine, clock = engine_with(('N', 10), ('E', 20))
+    # Reschedule D-001: its original heap entry no longer matches and must be ignored
+    prediction = engine.predictions['D-001']
+    prediction['expected_time'] = clock.now + timedelta(seconds=40)
+    heapq.heappush(engine.expiry_heap, (prediction['expected_time'], 'D-001'))
+    del engine.predictions['D-002']
+
+    clock.advance(30)
+    assert engine.expire_predictions() == 10.0
+    assert list(engine.predictions) == ['D-001']
+    assert len(engine.prediction_history) == 0
+
+    clock.advance(10)
+    assert engine.expire_predictions() is None
+    assert len(engine.prediction_history) == 1
+
+
+def test_next_expiry_includes_shadow_lanes():
+    engine, clock = engine_with(('N', 60), shadow_horizons=[15])
+    lane = engine.shadow_lanes[0]
+    lane.add({'type': 'sector_activity', 'sector': 'N', 'key': ('sector_activity', 'N'),
+              'expected_time': clock.now + timedelta(seconds=15)})
+    assert engine.next_expiry() == clock.now + timedelta(seconds=15)
+
+    clock.advance(20)
+    assert engine.expire_predictions() == 40.0
+    assert lane.validated_total == 1 and not lane.predictions
+    assert len(engine.predictions) == 1
+
+
+def add_wave(engine, timeline=5):
+    pattern = {'type': 'wave_incoming', 'message': 'Wave', 'confidence': 80, 'min_detections': 2}
+    engine._add_prediction(engine._new_prediction(pattern, engine._prediction_key(pattern), timeline))
+
+
+def test_prediction_expiring_without_new_frames_is_not_scored_on_its_own_frame():
+    engine, clock = engine_with()
+    # The frame that led to the prediction arrives at the moment it is made
+    engine.last_detection, engine.last_detection_at = Detection(detections=3), clock.now
+    add_wave(engine)
+    clock.advance(5)
+    engine.expire_predictions()
+    assert engine.prediction_history[-1]['result'] is False
+
+
+def test_timer_uses_a_fresh_frame_that_arrived_after_the_prediction():
+    engine, clock = engine_with()
+    add_wave(engine)
+    clock.advance(4)
+    engine.last_detection, engine.last_detection_at = Detection(detections=3), clock.now
+    clock.advance(1)
+    engine.expire_predictions()
+    assert engine.prediction_history[-1]['result'] is True
+
+
+def test_timer_ignores_a_frame_older_than_evidence_max_age():
+    engine, clock = engine_with()
+    engine.evidence_max_age = 5.0
+    add_wave(engine, timeline=30)
+    clock.advance(1)
+    engine.last_detection, engine.last_detection_at = Detection(detections=3), clock.now
+    clock.advance(29)
+    engine.rng.random = lambda: 1.0  # No random timeline failure
+    engine.expire_predictions()
+    assert engine.prediction_history[-1]['result'] is False
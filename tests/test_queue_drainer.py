@@ -0,0 +1,172 @@
+import asyncio
+
+from locrypt_client import DarcyClient, PublishRejected, MAX_BATCH_ITEMS
+from queue_drainer import QueueDrainer
+
+
+class FakeClient(DarcyClient):
+    """Darcy client whose queued sends answer from a script: True, False or an exception per payload id"""
+
+    def __init__(self, outcomes, batch=False):
+        super().__init__('http://darcy.test', 'token', {
+            'spool': {'path': ':memory:', 'replay_batch_size': 2},
+            'batch': {'enabled': batch}
+        })
+        self.outcomes = outcomes
+        self.sent = []
+
+    async def send_queued(self, items):
+        self.sent.append([item['id'] for item in items])
+        outcome = self.outcomes.get(items[0]['id'], True)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def drainer_for(client, **config):
+    for i in range(6):
+        client.spool.append({'id': i})
+    return QueueDrainer(client, {'max_concurrency': 4, 'target_latency_ms': 10000, **config})
+
+
+def queued_ids(client):
+    return [data['id'] for _, data in client.spool.peek(100)]
+
+
+def test_clean_round_acks_and_grows_concurrency():
+    client = FakeClient({})
+    drainer = drainer_for(client)
+    asyncio.run(drainer._drain_round(1))
+    assert queued_ids(client) == [1, 2, 3, 4, 5]
+    assert drainer.concurrency == 2
+
+    asyncio.run(drainer._drain_round(2))
+    assert queued_ids(client) == [3, 4, 5]
+    assert drainer.stats['sent'] == 3
+    assert drainer.concurrency == 3
+
+
+def test_failed_requests_stay_queued_and_halve_concurrency():
+    client = FakeClient({1: False})
+    drainer = drainer_for(client)
+    drainer.concurrency = 4
+    asyncio.run(drainer._drain_round(4))
+    assert queued_ids(client) == [1, 4, 5]
+    assert drainer.stats['failed_requests'] == 1
+    assert drainer.concurrency == 2
+    assert drainer.backoff == 0.0
+
+
+def test_nothing_through_backs_off_exponentially():
+    client = FakeClient({0: False, 1: ConnectionError('down')})
+    drainer = drainer_for(client, max_backoff=3.0)
+    drainer.concurrency = 2
+    for expected in (1.0, 2.0, 3.0):
+        asyncio.run(drainer._drain_round(2))
+        assert drainer.concurrency == 1
+        assert drainer.backoff == expected
+    assert len(client.spool) == 6
+
+
+def test_rejected_items_are_dropped_without_backing_off():
+    client = FakeClient({0: PublishRejected(422, 'bad payload')})
+    drainer = drainer_for(client)
+    asyncio.run(drainer._drain_round(1))
+    assert queued_ids(client) == [1, 2, 3, 4, 5]
+    assert drainer.stats['rejected'] == 1
+    assert drainer.stats['failed_requests'] == 0
+    assert drainer.backoff == 0.0
+    assert drainer.concurrency == 2
+
+    # The rest of the backlog goes through on the next round
+    asyncio.run(drainer._drain_round(2))
+    assert queued_ids(client) == [3, 4, 5]
+
+
+def test_batches_are_acked_and_rejected_as_a_whole():
+    client = FakeClient({2: PublishRejected(400, 'bad batch'), 4: False}, batch=True)
+    drainer = drainer_for(client)
+    asyncio.run(drainer._drain_round(3))
+    assert client.sent == [[0, 1], [2, 3], [4, 5]]
+    assert queued_ids(client) == [4, 5]
+    assert drainer.stats['sent'] == 2
+    assert drainer.stats['rejected'] == 2
+    assert drainer.stats['failed_requests'] == 1
+
+
+class StatusResponse:
+    def __init__(self, status):
+        self.status = status
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def text(self):
+        return 'nope'
+
+
+class StatusSession:
+    closed = False
+
+    def __init__(self, status):
+        self.status = status
+        self.posts = 0
+
+    def post(self, endpoint, json=None):
+        self.posts += 1
+        return StatusResponse(self.status)
+
+
+def test_client_raises_rejected_for_non_retryable_client_errors():
+    async def run(status):
+        client = DarcyClient('http://darcy.test', 'token', {'spool': {'path': ':memory:'}})
+        client.session = StatusSession(status)
+        try:
+            await client.send_queued([{'id': 0}])
+        except PublishRejected as e:
+            return e.status, client.session.posts
+        return None, client.session.posts
+
+    assert asyncio.run(run(422)) == (422, 1)
+    assert asyncio.run(run(503)) == (None, 1)
+    assert asyncio.run(run(429)) == (None, 1)
+
+
+def test_live_batches_are_spooled_on_failure_but_dropped_on_rejection():
+    async def run(status):
+        client = DarcyClient('http://darcy.test', 'token', {
+            'spool': {'path': ':memory:'}, 'batch': {'enabled': True}, 'retry_attempts': 1
+        })
+        client.session = StatusSession(status)
+        outcomes = []
+        client.set_batch_callback(lambda items, success: outcomes.append(success))
+        client.pending_batch = [{'id': 0}, {'id': 1}]
+        await client.flush_batch()
+        return len(client.spool), client.stats['rejected'], outcomes
+
+    assert asyncio.run(run(503)) == (2, 0, [False])
+    assert asyncio.run(run(422)) == (0, 2, [False])
+
+
+def test_live_publish_raises_rejected_instead_of_failing():
+    async def run():
+        client = DarcyClient('http://darcy.test', 'token', {'spool': {'path': ':memory:'}, 'retry_attempts': 3})
+        client.session = StatusSession(400)
+        try:
+            await client.publish_data({'id': 0})
+        except PublishRejected:
+            return client.session.posts, client.stats['rejected'], client.stats['failed_today']
+
+    assert asyncio.run(run()) == (1, 1, 1)
+
+
+def test_batch_sizes_are_capped_at_the_server_limit():
+    client = DarcyClient('http://darcy.test', 'token', {
+        'spool': {'path': ':memory:', 'replay_batch_size': 2000}, 'batch': {'enabled': True, 'max_size': 1000}
+    })
+    assert client.batch_max_size == MAX_BATCH_ITEMS
+    assert client.replay_batch_size == MAX_BATCH_ITEMS
+    assert DarcyClient('http://darcy.test', 'token', {'spool': {'path': ':memory:'}, 'batch': {'max_size': 80}}).batch_max_size == 80
@@ -0,0 +1,72 @@
+import pytest
+
+from radar_models import (
+    Detection, Target, parse_quantity, parse_bearing, si_field,
+    RANGE_UNITS, ALTITUDE_UNITS, SPEED_UNITS, KNOT
+)
+
+
+@pytest.mark.parametrize('value,units,default,expected', [
+    ('3.5km', RANGE_UNITS, 'km', 3500.0),
+    ('2nm', RANGE_UNITS, 'km', 3704.0),
+    ('2 NM', RANGE_UNITS, 'km', 3704.0),
+    ('800m', RANGE_UNITS, 'km', 800.0),
+    (12, RANGE_UNITS, 'km', 12000.0),  # Bare numbers are in the default unit
+    ('12', RANGE_UNITS, 'km', 12000.0),
+    ('150ft', ALTITUDE_UNITS, 'm', 45.72),
+    (150, ALTITUDE_UNITS, 'm', 150.0),
+    ('85kts', SPEED_UNITS, 'kts', 85 * KNOT),
+    ('85', SPEED_UNITS, 'kts', 85 * KNOT),
+    ('36km/h', SPEED_UNITS, 'kts', 10.0),
+    ('36kmh', SPEED_UNITS, 'kts', 10.0),
+    ('10 m/s', SPEED_UNITS, 'kts', 10.0),
+    ('5furlongs', RANGE_UNITS, 'km', 5000.0),  # Unknown unit falls back to the default
+    ('-20m', ALTITUDE_UNITS, 'm', -20.0)
+])
+def test_parse_quantity_converts_to_si(value, units, default, expected):
+    assert parse_quantity(value, units, default) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('value', [None, True, 'N/A', '', 'km'])
+def test_parse_quantity_returns_none_without_a_number(value):
+    assert parse_quantity(value, RANGE_UNITS, 'km') is None
+
+
+def test_parse_bearing_and_si_field_precedence():
+    assert parse_bearing('045°') == 45.0
+    assert parse_bearing(270) == 270.0
+    assert parse_bearing('N/A') is None
+    # A value a parser already produced in SI wins over the display field
+    assert si_field({'range_m': 1200, 'range': '5km'}, 'range_m', 'range', RANGE_UNITS, 'km') == 1200.0
+    assert si_field({'range': '5km'}, 'range_m', 'range', RANGE_UNITS, 'km') == 5000.0
+    assert si_field({'bearing': '090°'}, 'bearing_deg', 'bearing', None, '') == 90.0
+
+
+def test_target_display_round_trip():
+    target = Target('T-7', range_m=3456.0, bearing_deg=123.4, altitude_m=152.4, speed_ms=25.0,
+                    latitude=46.77, longitude=23.6, kind='drone')
+    shown = target.to_dict()
+    assert shown == {'id': 'T-7', 'type': 'drone', 'range': '3.46km', 'bearing': '123°', 'altitude': '152m',
+                     'speed': '49kts', 'latitude': 46.77, 'longitude': 23.6}
+    parsed = Target.from_fields(shown)
+    assert parsed.range_m == pytest.approx(3460.0)
+    assert parsed.bearing_deg == 123.0
+    assert parsed.altitude_m == 152.0
+    assert parsed.speed_ms == pytest.approx(49 * KNOT)
+    assert parsed.kind == 'drone' and parsed.latitude == 46.77
+    assert parsed.to_dict() == shown  # The display form is stable once rounded
+
+
+def test_detection_display_round_trip():
+    detection = Detection(detections=2, range_m=12345.0, bearing_deg=359.7, altitude_m=None, speed_ms=10.0,
+                          confidence='HIGH', signal_strength=-70,
+                          targets=[Target('T-1', range_m=500.0, bearing_deg=5.0)])
+    shown = detection.to_dict()
+    assert (shown['range'], shown['bearing'], shown['altitude'], shown['speed']) == ('12.35km', '359°', 'N/A', '19kts')
+    parsed = Detection.from_fields(shown)
+    assert parsed.detections == 2 and parsed.confidence == 'HIGH' and parsed.signal_strength == -70
+    assert parsed.range_m == pytest.approx(12350.0)
+    assert parsed.altitude_m is None
+    assert [t.id for t in parsed.targets] == ['T-1']
+    assert parsed.targets[0].range_m == pytest.approx(500.0)
+    assert parsed.to_dict() == shown
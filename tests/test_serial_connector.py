@@ -0,0 +1,71 @@
+import asyncio
+import threading
+
+import radar_connector
+from radar_connector import SerialRadarConnector
+
+
+class FakeSerial:
+    """Stands in for serial.Serial: one port per instance, readable until it is told to fail"""
+
+    opened = []
+
+    def __init__(self, port, **kwargs):
+        self.port = port
+        self.is_open = True
+        self.in_waiting = 0
+        self.fail = threading.Event()
+        self.data = [b'DET:1\nDET:2\n']
+        FakeSerial.opened.append(self)
+
+    def read(self, size):
+        if self.fail.wait(0.01):
+            raise OSError('device reports readiness to read but returned no data')
+        return self.data.pop() if self.data else b''
+
+    def close(self):
+        self.is_open = False
+
+
+def test_reader_failure_closes_the_port_and_reconnect_opens_a_fresh_one(monkeypatch):
+    FakeSerial.opened = []
+    monkeypatch.setattr(radar_connector.serial, 'Serial', FakeSerial)
+
+    async def run():
+        connector = SerialRadarConnector({'port': '/dev/ttyFAKE0'})
+        assert await connector.connect()
+        frames = await asyncio.wait_for(connector.read_batch(), 1)
+
+        first = FakeSerial.opened[0]
+        first.fail.set()
+        for _ in range(100):
+            if not connector.is_connected:
+                break
+            await asyncio.sleep(0.01)
+        closed_on_error = not first.is_open
+
+        assert await connector.connect()
+        second = FakeSerial.opened[1]
+        await connector.disconnect()
+        return [f['raw_data'] for f in frames], closed_on_error, second.is_open, len(FakeSerial.opened)
+
+    frames, closed_on_error, second_open, opened = asyncio.run(run())
+    assert frames == ['DET:1', 'DET:2']
+    assert closed_on_error
+    assert not second_open
+    assert opened == 2
+
+
+def test_connect_closes_a_port_that_is_still_open(monkeypatch):
+    FakeSerial.opened = []
+    monkeypatch.setattr(radar_connector.serial, 'Serial', FakeSerial)
+
+    async def run():
+        connector = SerialRadarConnector({'port': '/dev/ttyFAKE0'})
+        await connector.connect()
+        await connector.connect()
+        states = [port.is_open for port in FakeSerial.opened]
+        await connector.disconnect()
+        return states
+
+    assert asyncio.run(run()) == [False, True]
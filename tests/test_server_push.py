@@ -0,0 +1,42 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost')
+os.environ.setdefault('DB_NAME', 'darcy_test')
+
+from fastapi.testclient import TestClient
+
+# The gateway creates its encryption key in the working directory on import
+_cwd = os.getcwd()
+os.chdir(tempfile.mkdtemp())
+try:
+    import server
+finally:
+    os.chdir(_cwd)
+from danger_zone_predictor import danger_zone_predictor
+
+
+def test_ws_replies_to_malformed_commands_and_keeps_listening():
+    client = TestClient(server.app)
+    with client.websocket_connect('/api/ws?topics=status') as ws:
+        ws.send_text('not json')
+        assert 'error' in ws.receive_json()
+        ws.send_json({'subscribe': 'zones'})
+        assert 'error' in ws.receive_json()
+        ws.send_json({'subscribe': ['zones', 'bogus']})
+        assert ws.receive_json()['error'] == 'Unknown topics: bogus'
+        ws.send_json({'subscribe': ['zones']})
+        ws.send_json({'unsubscribe': True})
+        assert 'error' in ws.receive_json()  # Still answering after the valid command
+        assert server.event_hub.subscribers[-1].topics == {'zones'}
+
+
+def test_predicted_zone_eta_does_not_move_with_the_countdown():
+    expected = datetime.utcnow() + timedelta(seconds=42)
+    prediction = {'id': 'P1', 'message': 'm', 'sector': 'E', 'expected_time': expected}
+    etas = {
+        danger_zone_predictor._create_predicted_zone({**prediction, 'seconds_remaining': s}, 5)['estimated_time']
+        for s in (42, 41, 40)
+    }
+    assert etas == {expected.strftime('%H:%M:%S')}
@@ -0,0 +1,76 @@
+import asyncio
+import json
+import logging
+from datetime import datetime
+
+import numpy as np
+
+from radar_connector import MockRadarConnector
+from swarm_simulator import SwarmSimulator
+
+ANCHOR = datetime(2026, 1, 1)
+INBOUND = [{'name': 'east', 'bearing': [85, 95], 'range_km': [20, 30], 'rate': 2.0}]
+
+
+def frames(simulator, count):
+    return [simulator.next_frame(ANCHOR) for _ in range(count)]
+
+
+def test_same_seed_gives_identical_frames():
+    config = {'seed': 42, 'initial_targets': 50, 'clutter_rate': 2, 'range_noise_m': 10,
+              'bearing_noise_deg': 0.5, 'turn_noise_deg': 3, 'patterns': INBOUND}
+    first = frames(SwarmSimulator.from_config(config), 30)
+    assert first == frames(SwarmSimulator.from_config(config), 30)
+    assert first != frames(SwarmSimulator.from_config({**config, 'seed': 43}), 30)
+
+
+def test_clutter_adds_false_alarms_to_each_frame():
+    simulator = SwarmSimulator(seed=1, initial_targets=20, patterns=INBOUND, clutter_rate=5.0)
+    false_alarms = 0
+    for _ in range(200):
+        data = json.loads(simulator.next_frame(ANCHOR)['raw_data'])
+        labels = [t['id'] for t in data['targets']]
+        assert data['detections'] == len(labels)
+        assert labels[:len(simulator)] == [f"TGT-{i:04d}" for i in simulator.ids.tolist()]
+        false_alarms += sum(1 for label in labels if label.startswith('FA-'))
+    assert false_alarms == simulator.stats['false_alarms']
+    assert 900 < false_alarms < 1100  # Poisson mean of 5 per scan
+
+
+def test_targets_leaving_the_range_window_or_too_old_are_pruned():
+    patterns = [{'bearing': [0, 0], 'range_km': [10, 10], 'speed_kts': [100, 100], 'rate': 0.0}]
+    simulator = SwarmSimulator(seed=0, scan_rate=1.0, initial_targets=5, patterns=patterns, min_range_km=5.0)
+    while len(simulator):
+        simulator.step()
+        assert (np.hypot(simulator.state[:, 0], simulator.state[:, 1]) >= 5000).all()
+    # 5 km at 100 kts takes about 97 s
+    assert 95 <= simulator.time <= 99
+    assert simulator.stats['removed'] == 5
+
+    simulator = SwarmSimulator(seed=0, scan_rate=1.0, initial_targets=5, patterns=patterns, max_age_seconds=30)
+    for _ in range(30):
+        simulator.step()
+    assert len(simulator) == 5
+    simulator.step()
+    assert len(simulator) == 0
+
+
+def test_connect_warns_when_the_swarm_can_exceed_the_processor_limit(caplog):
+    connector = MockRadarConnector({'swarm': {'enabled': True, 'max_targets': 500}})
+    connector.frame_limit = 100
+    with caplog.at_level(logging.WARNING, logger='radar_connector'):
+        asyncio.run(connector.connect())
+    assert 'radar_data.max_detections is 100' in caplog.text
+
+    caplog.clear()
+    connector.frame_limit = 1000
+    with caplog.at_level(logging.WARNING, logger='radar_connector'):
+        asyncio.run(connector.connect())
+    assert not caplog.records
+
+
+def test_swarm_mode_runs_even_before_any_target_exists():
+    connector = MockRadarConnector({'swarm': {'enabled': True, 'scan_rate': 0, 'patterns': INBOUND}})
+    frame = asyncio.run(connector.read_data())
+    assert frame['source'] == 'mock_swarm'
+    assert connector.swarm.scans == 1
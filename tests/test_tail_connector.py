@@ -0,0 +1,133 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from radar_connector import TailRadarConnector
+
+
+@pytest.fixture(params=[True, False], ids=['inotify', 'polling'])
+def inotify(request):
+    return request.param
+
+
+async def consume(connector, count, timeout=3.0):
+    frames = []
+    deadline = time.monotonic() + timeout
+    while len(frames) < count and time.monotonic() < deadline:
+        frames += await connector.read_batch()
+    return [frame['raw_data'] for frame in frames]
+
+
+def append(path, text):
+    with open(path, 'a') as f:
+        f.write(text)
+
+
+def tail(path, inotify, **config):
+    return TailRadarConnector({'path': str(path), 'inotify': inotify, 'timeout': 0.5, **config})
+
+
+def test_follows_appends_from_the_end(tmp_path, inotify):
+    path = tmp_path / 'radar.log'
+    path.write_text('old-1\nold-2\n')
+
+    async def run():
+        connector = tail(path, inotify)
+        assert await connector.connect()
+        append(path, 'new-1\nnew-')
+        first = await consume(connector, 1)
+        append(path, '2\n')
+        second = await consume(connector, 1)
+        await connector.disconnect()
+        return first, second
+
+    assert asyncio.run(run()) == (['new-1'], ['new-2'])
+
+
+def test_rotation_by_rename_finishes_the_old_file_first(tmp_path, inotify):
+    path = tmp_path / 'radar.log'
+    path.write_text('')
+
+    async def run():
+        connector = tail(path, inotify)
+        await connector.connect()
+        append(path, 'before-rotation\nlast-line')
+        os.rename(path, f"{path}.1")
+        path.write_text('after-rotation\n')
+        frames = await consume(connector, 3)
+        stats = connector.tail_stats['rotations']
+        await connector.disconnect()
+        return frames, stats
+
+    frames, rotations = asyncio.run(run())
+    assert frames == ['before-rotation', 'last-line', 'after-rotation']
+    assert rotations == 1
+
+
+def test_truncation_restarts_from_the_top(tmp_path, inotify):
+    path = tmp_path / 'radar.log'
+    path.write_text('a-fairly-long-existing-line\n')
+
+    async def run():
+        connector = tail(path, inotify)
+        await connector.connect()
+        path.write_text('short\n')
+        frames = await consume(connector, 1)
+        stats = connector.tail_stats['truncations']
+        await connector.disconnect()
+        return frames, stats
+
+    assert asyncio.run(run()) == (['short'], 1)
+
+
+def test_restart_resumes_from_the_saved_offset(tmp_path, inotify):
+    path = tmp_path / 'radar.log'
+    path.write_text('seen-before\n')
+
+    async def run():
+        connector = tail(path, inotify)
+        await connector.connect()
+        append(path, 'one\n')
+        await consume(connector, 1)
+        await connector.disconnect()
+
+        append(path, 'while-down-1\nwhile-down-2\n')
+        connector = tail(path, inotify)
+        await connector.connect()
+        frames = await consume(connector, 2)
+
+        # Rotated while stopped: the rest of the old file, then the new one
+        await connector.disconnect()
+        append(path, 'tail-of-old\n')
+        os.rename(path, f"{path}.2")
+        path.write_text('fresh\n')
+        connector = tail(path, inotify)
+        await connector.connect()
+        frames += await consume(connector, 2)
+        await connector.disconnect()
+        return frames
+
+    assert asyncio.run(run()) == ['while-down-1', 'while-down-2', 'tail-of-old', 'fresh']
+
+
+def test_glob_moves_on_to_the_next_file(tmp_path, inotify):
+    first = tmp_path / 'det-001.log'
+    first.write_text('a1\n')
+
+    async def run():
+        connector = tail(tmp_path / 'det-*.log', inotify, from_beginning=True)
+        await connector.connect()
+        frames = await consume(connector, 1)
+        append(first, 'a2\n')
+        await asyncio.sleep(0.02)
+        (tmp_path / 'det-002.log').write_text('b1\n')
+        frames += await consume(connector, 2)
+        current = connector.file_path
+        await connector.disconnect()
+        return frames, current
+
+    frames, current = asyncio.run(run())
+    assert frames == ['a1', 'a2', 'b1']
+    assert current.endswith('det-002.log')
@@ -0,0 +1,98 @@
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from prediction_engine import PredictionEngine
+from radar_models import Detection, Target
+from tracker import MultiTargetTracker
+
+def frame(*targets, timestamp=''):
+    """Detection with (id, range_m, bearing_deg) targets"""
+    return Detection(
+        detections=len(targets),
+        targets=[Target(id=i, range_m=r, bearing_deg=b) for i, r, b in targets],
+        timestamp=timestamp
+    )
+
+def inbound(t, start_m=20000.0, speed=50.0, bearing=90.0):
+    return start_m - speed * t, bearing
+
+def test_measurements_convert_to_east_north():
+    labels, positions, altitudes = MultiTargetTracker.measurements(frame(('a', 1000.0, 90.0), ('b', 2000.0, 0.0)))
+    assert labels == ['a', 'b']
+    np.testing.assert_allclose(positions, [[1000.0, 0.0], [0.0, 2000.0]], atol=1e-9)
+    assert np.isnan(altitudes).all()
+
+def test_frame_level_fallback_without_targets():
+    detection = Detection(detections=1, range_m=3000.0, bearing_deg=180.0)
+    labels, positions, _ = MultiTargetTracker.measurements(detection)
+    assert labels == ['']
+    np.testing.assert_allclose(positions, [[0.0, -3000.0]], atol=1e-9)
+
+def test_track_is_confirmed_and_velocity_estimated():
+    tracker = MultiTargetTracker(confirm_hits=3)
+    for t in range(6):
+        tracker.update(frame(('a', *inbound(t))), float(t))
+    assert len(tracker) == 1
+    assert tracker.confirmed().all()
+    np.testing.assert_allclose(tracker.state[0, 2:], [-50.0, 0.0], atol=1.0)
+
+    geometry = tracker.threat_geometry(5.0)
+    assert geometry['closing_ms'][0] == pytest.approx(50.0, abs=1.0)
+    assert geometry['eta_s'][0] == pytest.approx((20000 - 250) / 50, rel=0.02)
+
+def test_association_keeps_crossing_targets_apart():
+    tracker = MultiTargetTracker(gate_m=500)
+    for t in range(5):
+        tracker.update(frame(('a', *inbound(t, bearing=10.0)), ('b', *inbound(t, bearing=80.0))), float(t))
+    assert len(tracker) == 2
+    assert sorted(tracker.labels) == ['a', 'b']
+    assert tracker.stats['tracks_started'] == 2
+
+def test_measurement_outside_gate_starts_new_track():
+    tracker = MultiTargetTracker(gate_m=500, max_speed_ms=10)
+    tracker.update(frame(('a', 10000.0, 0.0)), 0.0)
+    tracker.update(frame(('a', 10000.0, 90.0)), 1.0)
+    assert len(tracker) == 2
+
+def test_greedy_assignment_prefers_closest_pair():
+    tracker = MultiTargetTracker(gate_m=1000)
+    tracker.update(frame(('a', 5000.0, 0.0), ('b', 5600.0, 0.0)), 0.0)
+    tracker.update(frame(('x', 5100.0, 0.0)), 0.2)
+    assert tracker.labels[0] == 'x'  # Nearest track took the only measurement
+    assert tracker.hits.tolist() == [2, 1]
+
+def test_stale_tracks_are_dropped():
+    tracker = MultiTargetTracker(coast_seconds=5)
+    tracker.update(frame(('a', 1000.0, 0.0)), 0.0)
+    tracker.update(frame(), 4.0)
+    assert len(tracker) == 1
+    tracker.update(frame(), 6.0)
+    assert len(tracker) == 0
+    assert tracker.stats['tracks_dropped'] == 1
+
+def test_max_tracks_caps_births():
+    tracker = MultiTargetTracker(max_tracks=3)
+    tracker.update(frame(*[(str(i), 1000.0 + 5000 * i, 0.0) for i in range(5)]), 0.0)
+    assert len(tracker) == 3
+
+def test_engine_uses_one_time_base_for_recorded_timestamps():
+    """Frames stamped hours in the past must not make tracks look stale to the engine"""
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    clock = {'now': now}
+    engine = PredictionEngine(clock=lambda: clock['now'], rng=random.Random(0))
+    engine.configure({'evaluation_interval': 0, 'shadow_horizons': []})
+    recorded = now - timedelta(hours=2)
+    for t in range(12):
+        clock['now'] = now + timedelta(seconds=t)
+        stamp = (recorded + timedelta(seconds=t)).isoformat()
+        engine.add_detection(frame(('a', *inbound(t)), timestamp=stamp))
+
+    tracks = engine.get_tracks()
+    assert len(tracks) == 1
+    assert tracks[0]['age_seconds'] < 1
+    assert tracks[0]['eta_seconds'] is not None
+    assert float(tracks[0]['range'].rstrip('km')) == pytest.approx((20000 - 50 * 11) / 1000, abs=0.1)
+    assert any(p.get('track_id') for p in engine.get_active_predictions())